@@ -26,7 +26,7 @@ pip install --upgrade pip --quiet
 # Install dependencies
 echo ""
 echo "3. Installing dependencies (this takes 2-3 minutes)..."
-pip install streamlit tensorflow numpy scikit-learn pandas
+pip install streamlit tensorflow numpy scikit-learn pandas openpyxl
 
 if [ $? -eq 0 ]; then
     echo ""
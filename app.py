@@ -1,9 +1,27 @@
+import os
+
 import streamlit as st
-import tensorflow as tf
-import pickle
-import re
 import numpy as np
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+import pandas as pd
+
+from batching import BatcherClosedError, MicroBatcher
+from inference import (
+    ARTIFACT_WATCH_SECONDS,
+    artifact_signature,
+    clean_texts,
+    decode_predictions,
+    encode_cleaned,
+    fingerprint_artifacts,
+    load_artifacts,
+    predict_proba_batch,
+    validate_artifacts,
+    warm_up,
+)
+from inference_daemon import DaemonClient
+from model_loader import ModelLoader
+from prediction_cache import PredictionCache
+from prediction_store import PredictionStore
+from translations import TRANSLATIONS, translate_sentiment
 
 # Page configuration
 st.set_page_config(
@@ -13,125 +31,22 @@ st.set_page_config(
 )
 
 # Constants
-MAX_LEN = 128
-MODEL_PATH = "kaggle/working/model_outputs/CNN + BiLSTM_best.h5"
-TOKENIZER_PATH = "kaggle/working/model_outputs/tokenizer.pkl"
-LABEL_ENCODER_PATH = "kaggle/working/model_outputs/label_encoder.pkl"
+BULK_CHUNK_SIZE = 1000
+WORKER_MAX_BATCH_SIZE = 32
+WORKER_MAX_WAIT_MS = 10
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Optional SQLite file shared by all processes on the host, e.g. /var/cache/sentiment.db
+PREDICTION_STORE_PATH = os.environ.get("PREDICTION_STORE_PATH")
+PREDICTION_STORE_MAX_ENTRIES = 1_000_000
+# Unix socket of a shared inference daemon (inference_daemon.py); when set,
+# this process holds no model and only tokenizes and decodes
+INFERENCE_SOCKET = os.environ.get("INFERENCE_SOCKET")
 
 # Initialize session state for language
 if "language" not in st.session_state:
     st.session_state.language = "en"  # Default to English
 
-# Translations dictionary
-TRANSLATIONS = {
-    "en": {
-        # Navigation
-        "about": "About",
-        "settings": "Settings",
-        "language": "Language",
-        # Hero section
-        "title": "Sentiment Analysis",
-        "subtitle": "🇮🇩 Indonesian Business Review Analyzer",
-        "description": "Powered by CNN + BiLSTM with Attention • Real-time AI predictions with 74.97% accuracy",
-        # Sidebar
-        "about_title": "About This Tool",
-        "about_text": "This AI-powered sentiment analysis model classifies Indonesian business reviews into three categories:",
-        "model_info": "Model Information",
-        "architecture": "Architecture",
-        "accuracy": "Accuracy",
-        "dataset_size": "Dataset Size",
-        "samples": "samples",
-        "try_examples": "Try Examples",
-        # Sentiments
-        "positive": "Positive",
-        "neutral": "Neutral",
-        "negative": "Negative",
-        # Input section
-        "input_title": "Enter Your Review Text",
-        "input_subtitle": "Type or paste a business review below and click analyze to see the sentiment prediction.",
-        "input_placeholder": "Example: Masukkan teks ulasan bisnis Indonesia Anda di sini... ⚡",
-        "input_label": "Type or paste your Indonesian business review here:",
-        "analyze_button": "🔍 Analyze Sentiment",
-        # Results
-        "results_title": "Analysis Results",
-        "sentiment_label": "Sentiment",
-        "confidence_label": "Confidence",
-        "distribution_title": "Sentiment Distribution",
-        "statistics_title": "Text Statistics",
-        "word_count": "Word Count",
-        "characters": "Characters",
-        "cleaned_words": "Cleaned Words",
-        "view_preprocessed": "🔍 View Preprocessed Text",
-        # Messages
-        "loading_model": "Loading model...",
-        "analyzing": "Analyzing sentiment...",
-        "empty_warning": "⚠️ Please enter some text to analyze.",
-        "error_loading": "Failed to load model. Please check the model files.",
-        "error_prediction": "Error loading model artifacts:",
-        # Footer
-        "powered_by": "Powered by",
-        "model_description": "CNN + BiLSTM with Attention Mechanism",
-        "copyright": "© 2024",
-        # Example texts
-        "example_positive": "kloningan daihatsu masuk pasar indonesia epmb menerima hak ekslusif dalam merakit mendistribusi kendaraan merek lingbox pasar malaysia indonesia lingbox mini ev masuk tanah air https co ow ag https co ihkzxaj",
-        "example_neutral": "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
-        "example_negative": "Mobil listrik sangat mengecewakan dan tidak layak dibeli. Saya sangat kecewa dengan kualitasnya yang buruk dan harganya terlalu mahal.",
-    },
-    "id": {
-        # Navigation
-        "about": "Tentang",
-        "settings": "Pengaturan",
-        "language": "Bahasa",
-        # Hero section
-        "title": "Analisis Sentimen",
-        "subtitle": "🇮🇩 Penganalisis Ulasan Bisnis Indonesia",
-        "description": "Didukung oleh CNN + BiLSTM dengan Attention • Prediksi AI real-time dengan akurasi 74.97%",
-        # Sidebar
-        "about_title": "Tentang Alat Ini",
-        "about_text": "Model analisis sentimen bertenaga AI ini mengklasifikasikan ulasan bisnis Indonesia ke dalam tiga kategori:",
-        "model_info": "Informasi Model",
-        "architecture": "Arsitektur",
-        "accuracy": "Akurasi",
-        "dataset_size": "Ukuran Dataset",
-        "samples": "sampel",
-        "try_examples": "Coba Contoh",
-        # Sentiments
-        "positive": "Positif",
-        "neutral": "Netral",
-        "negative": "Negatif",
-        # Input section
-        "input_title": "Masukkan Teks Ulasan Anda",
-        "input_subtitle": "Ketik atau tempel ulasan bisnis di bawah ini dan klik analisis untuk melihat prediksi sentimen.",
-        "input_placeholder": "Contoh: Masukkan teks ulasan bisnis Indonesia Anda di sini... ⚡",
-        "input_label": "Ketik atau tempel ulasan bisnis Indonesia Anda di sini:",
-        "analyze_button": "🔍 Analisis Sentimen",
-        # Results
-        "results_title": "Hasil Analisis",
-        "sentiment_label": "Sentimen",
-        "confidence_label": "Kepercayaan",
-        "distribution_title": "Distribusi Sentimen",
-        "statistics_title": "Statistik Teks",
-        "word_count": "Jumlah Kata",
-        "characters": "Karakter",
-        "cleaned_words": "Kata Bersih",
-        "view_preprocessed": "🔍 Lihat Teks Terproses",
-        # Messages
-        "loading_model": "Memuat model...",
-        "analyzing": "Menganalisis sentimen...",
-        "empty_warning": "⚠️ Silakan masukkan teks untuk dianalisis.",
-        "error_loading": "Gagal memuat model. Silakan periksa file model.",
-        "error_prediction": "Kesalahan memuat artefak model:",
-        # Footer
-        "powered_by": "Didukung oleh",
-        "model_description": "CNN + BiLSTM dengan Mekanisme Attention",
-        "copyright": "© 2024",
-        # Example texts
-        "example_positive": "kloningan daihatsu masuk pasar indonesia epmb menerima hak ekslusif dalam merakit mendistribusi kendaraan merek lingbox pasar malaysia indonesia lingbox mini ev masuk tanah air https co ow ag https co ihkzxaj",
-        "example_neutral": "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
-        "example_negative": "Mobil listrik sangat mengecewakan dan tidak layak dibeli. Saya sangat kecewa dengan kualitasnya yang buruk dan harganya terlalu mahal.",
-    },
-}
-
 
 def get_text(key):
     """Get translated text based on current language"""
@@ -831,138 +746,167 @@ st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 
 @st.cache_resource
-def load_model_and_artifacts():
-    """Load the trained model, tokenizer, and label encoder"""
-    try:
-        # Load model
-        model = tf.keras.models.load_model(
-            MODEL_PATH, custom_objects={"AttentionLayer": AttentionLayer}
-        )
+def get_model_loader():
+    """Start loading and warming up the artifacts in the background, once
+
+    The loader also swaps in new artifact versions when the files change.
+    With INFERENCE_SOCKET set it connects to the daemon instead, and swaps
+    in the daemon's tokenizer and labels whenever the daemon reloads.
+    """
+    if INFERENCE_SOCKET:
+        # The daemon validates and warms the model before serving it
+        client = DaemonClient(INFERENCE_SOCKET)
+        loader = ModelLoader(client.load_artifacts).start()
+        if ARTIFACT_WATCH_SECONDS > 0:
+            loader.watch(client.current_fingerprint, interval=ARTIFACT_WATCH_SECONDS)
+        return loader
+
+    loader = ModelLoader(
+        load_artifacts,
+        warm_up_fn=lambda model, tokenizer, _: warm_up(
+            model, tokenizer, batch_sizes=(1, WORKER_MAX_BATCH_SIZE, 256)
+        ),
+        validate_fn=validate_artifacts,
+        fingerprint_fn=fingerprint_artifacts,
+    ).start()
+    if ARTIFACT_WATCH_SECONDS > 0:
+        loader.watch(artifact_signature, interval=ARTIFACT_WATCH_SECONDS)
+    return loader
 
-        # Load tokenizer
-        with open(TOKENIZER_PATH, "rb") as f:
-            tokenizer = pickle.load(f)
 
-        # Load label encoder
-        with open(LABEL_ENCODER_PATH, "rb") as f:
-            label_encoder = pickle.load(f)
+def load_model_and_artifacts():
+    """Return the hot (model, tokenizer, label encoder) and their fingerprint
 
-        return model, tokenizer, label_encoder
-    except Exception as e:
+    Both come from one snapshot of the loader, so a hot reload between
+    reads cannot pair a model with another version's fingerprint. Returns
+    ``((None, None, None), None)`` while loading is still in progress or
+    after it failed; this never blocks the page.
+    """
+    loader = get_model_loader()
+    if loader.failed:
         # Get translation if available, otherwise use default English
         error_msg = TRANSLATIONS.get(
             st.session_state.get("language", "en"), TRANSLATIONS["en"]
         ).get("error_prediction", "Error loading model artifacts:")
-        st.error(f"{error_msg} {str(e)}")
-        return None, None, None
+        st.error(f"{error_msg} {loader.error}")
+    artifacts, fingerprint = loader.snapshot()
+    return artifacts or (None, None, None), fingerprint
 
 
-# Define Attention Layer (same as in training)
-class AttentionLayer(tf.keras.layers.Layer):
-    def __init__(self, **kwargs):
-        super(AttentionLayer, self).__init__(**kwargs)
+@st.fragment(run_every=1)
+def render_model_status():
+    """Loading notice that reruns the whole page once the model is hot"""
+    loader = get_model_loader()
+    if loader.ready:
+        st.rerun()
+    elif not loader.failed:
+        key = "warming_model" if loader.state == "warming" else "loading_model"
+        st.info(f"⏳ {get_text(key)}")
 
-    def build(self, input_shape):
-        self.W = self.add_weight(
-            name="att_weight",
-            shape=(input_shape[-1],),
-            initializer="random_normal",
-            trainable=True,
-        )
-        super(AttentionLayer, self).build(input_shape)
-
-    def call(self, inputs, mask=None):
-        e = tf.keras.backend.tanh(inputs)
-        e = tf.keras.backend.dot(e, tf.keras.backend.expand_dims(self.W, -1))
-        e = tf.keras.backend.squeeze(e, -1)
-
-        if mask is not None:
-            mask = tf.keras.backend.cast(mask, tf.keras.backend.floatx())
-            e = e * mask + ((1 - mask) * -1e9)
-
-        alpha = tf.keras.backend.softmax(e)
-        alpha_exp = tf.keras.backend.expand_dims(alpha, axis=-1)
-        context = tf.keras.backend.sum(inputs * alpha_exp, axis=1)
-        return context
-
-    def compute_output_shape(self, input_shape):
-        return (input_shape[0], input_shape[-1])
-
-    def get_config(self):
-        config = super().get_config()
-        return config
-
-
-def clean_text(text):
-    """Clean and preprocess text (same as training pipeline)"""
-    text = str(text)
-    text = text.lower()
-    # Remove URLs
-    text = re.sub(r"http\S+|www\S+|https\S+", " ", text)
-    # Remove mentions
-    text = re.sub(r"@\w+", " ", text)
-    # Remove hashtags
-    text = re.sub(r"#", " ", text)
-    # Remove non-alphanumeric characters
-    text = re.sub(r"[^0-9a-z\s]", " ", text)
-    # Collapse spaces
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def preprocess_text(text, tokenizer):
-    """Preprocess text for model prediction"""
-    # Clean text
-    cleaned = clean_text(text)
-
-    # Tokenize
-    sequence = tokenizer.texts_to_sequences([cleaned])
-
-    # Pad sequence
-    padded = pad_sequences(sequence, maxlen=MAX_LEN, padding="post", truncating="post")
-
-    return padded, cleaned
-
-
-def translate_sentiment(indonesian_label):
-    """Translate Indonesian sentiment labels based on current language"""
-    if st.session_state.language == "en":
-        translation = {
-            "Positif": "Positive",
-            "Netral": "Neutral",
-            "Negatif": "Negative",
-        }
-        return translation.get(indonesian_label, indonesian_label)
-    else:
-        # Keep Indonesian labels as-is for Indonesian language
-        return indonesian_label
 
+def close_inference_worker(worker):
+    worker.close()
 
-def predict_sentiment(text, model, tokenizer, label_encoder):
-    """Predict sentiment for given text"""
-    # Preprocess
-    processed_text, cleaned_text = preprocess_text(text, tokenizer)
 
-    # Predict
-    prediction = model.predict(processed_text, verbose=0)
+# Two entries: requests already holding the previous version finish on it
+# while new ones go to the reloaded model. A run that still holds an evicted
+# worker falls back to its model in predict_sentiment_batch.
+@st.cache_resource(max_entries=2, on_release=close_inference_worker)
+def get_inference_worker(_model, fingerprint):
+    """Background worker that batches predictions across all sessions
 
-    # Get predicted class and confidence
-    predicted_class_idx = np.argmax(prediction[0])
-    confidence = prediction[0][predicted_class_idx]
+    One worker per artifact version; ``fingerprint`` is the cache key.
+    """
+    return MicroBatcher(
+        lambda batch: _model.predict(batch, batch_size=WORKER_MAX_BATCH_SIZE),
+        max_batch_size=WORKER_MAX_BATCH_SIZE,
+        max_wait_ms=WORKER_MAX_WAIT_MS,
+    )
 
-    # Decode label (Indonesian)
-    sentiment_indonesian = label_encoder.classes_[predicted_class_idx]
 
-    # Translate to English
-    sentiment = translate_sentiment(sentiment_indonesian)
+@st.cache_resource
+def get_prediction_store():
+    """Persistent prediction store, if PREDICTION_STORE_PATH is configured"""
+    if not PREDICTION_STORE_PATH:
+        return None
+    return PredictionStore(
+        PREDICTION_STORE_PATH, max_entries=PREDICTION_STORE_MAX_ENTRIES
+    )
 
-    # Get all class probabilities (translated to English)
-    all_probabilities = {
-        translate_sentiment(label_encoder.classes_[i]): float(prediction[0][i])
-        for i in range(len(label_encoder.classes_))
-    }
 
-    return sentiment, confidence, all_probabilities, cleaned_text
+@st.cache_resource(max_entries=2)
+def get_prediction_cache(fingerprint):
+    """Prediction cache shared by all sessions, one per artifact fingerprint"""
+    return PredictionCache(
+        fingerprint,
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl_seconds=PREDICTION_CACHE_TTL_SECONDS,
+        store=get_prediction_store(),
+    )
+
+
+def predict_sentiment(text, model, tokenizer, label_encoder, worker=None, cache=None):
+    """Predict sentiment for given text"""
+    return predict_sentiment_batch(
+        [text], model, tokenizer, label_encoder, worker=worker, cache=cache
+    )[0]
+
+
+def predict_sentiment_batch(
+    texts, model, tokenizer, label_encoder, batch_size=256, worker=None, cache=None
+):
+    """Predict sentiment for a list of texts, one forward pass per batch
+
+    When a worker is given the forward pass is queued on it, so requests
+    from concurrent sessions share batches. When a cache is given, texts
+    whose cleaned form was already scored skip the forward pass.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    cleaned_texts = clean_texts(texts)
+
+    # Look up cached outputs first; only misses go to the model
+    rows = [None] * len(texts)
+    if cache is not None:
+        keys = [cache.key(cleaned) for cleaned in cleaned_texts]
+        rows = [cache.get(key) for key in keys]
+    missing = [i for i, row in enumerate(rows) if row is None]
+
+    if missing:
+        processed_texts = encode_cleaned(
+            [cleaned_texts[i] for i in missing], tokenizer
+        )
+        if worker is not None:
+            try:
+                outputs = worker.predict(processed_texts)
+            except BatcherClosedError:
+                # A later reload evicted this version's worker; its model is
+                # still loaded, so finish the request on it in-process
+                worker = None
+        if worker is None:
+            outputs = model.predict(processed_texts, batch_size=batch_size)
+
+        for i, row in zip(missing, outputs):
+            rows[i] = row
+            if cache is not None:
+                cache.put(keys[i], row.copy())
+
+    predictions = np.stack(rows)
+
+    # Decode labels and confidences for the whole matrix
+    sentiments, confidences, class_names = decode_predictions(
+        predictions, label_encoder, st.session_state.language
+    )
+
+    results = []
+    for i, cleaned_text in enumerate(cleaned_texts):
+        # Get all class probabilities (translated to English)
+        all_probabilities = dict(zip(class_names, predictions[i].tolist()))
+        results.append((sentiments[i], confidences[i], all_probabilities, cleaned_text))
+
+    return results
 
 
 def display_metric_card(label, value, unit=""):
@@ -996,14 +940,186 @@ def display_confidence_gauge(label, value, color):
     )
 
 
-def main():
-    # Load model and artifacts
-    with st.spinner(get_text("loading_model")):
-        model, tokenizer, label_encoder = load_model_and_artifacts()
+def read_uploaded_table(uploaded_file):
+    """Read an uploaded CSV, Excel or Parquet file into a DataFrame"""
+    name = uploaded_file.name.lower()
+    if name.endswith((".xlsx", ".xls")):
+        return pd.read_excel(uploaded_file)
+    if name.endswith((".parquet", ".pq")):
+        return pd.read_parquet(uploaded_file)
+    return pd.read_csv(uploaded_file)
 
-    if model is None:
-        st.error(get_text("error_loading"))
+
+def score_chunk(texts, model, tokenizer):
+    """Score one chunk of texts into a compact, typed DataFrame"""
+    predictions, _ = predict_proba_batch(texts, model, tokenizer)
+    predictions = np.asarray(predictions, dtype=np.float32)
+    predicted_idx = np.argmax(predictions, axis=1)
+
+    chunk = pd.DataFrame(
+        {
+            "label_idx": predicted_idx.astype(np.int8),
+            "confidence": predictions[np.arange(len(predictions)), predicted_idx],
+        }
+    )
+    for i in range(predictions.shape[1]):
+        chunk[f"prob_{i}"] = predictions[:, i]
+    return chunk
+
+
+def format_bulk_results(source, results, label_encoder):
+    """Join scored rows back onto the source table with translated labels"""
+    class_names = [
+        translate_sentiment(label, st.session_state.language)
+        for label in label_encoder.classes_
+    ]
+
+    decoded = pd.DataFrame(
+        {
+            # Categorical: int8 codes, stored dictionary-encoded in Parquet
+            get_text("sentiment_label"): pd.Categorical.from_codes(
+                results["label_idx"], class_names
+            ),
+            get_text("confidence_label"): results["confidence"],
+        }
+    )
+    for i, name in enumerate(class_names):
+        decoded[name] = results[f"prob_{i}"]
+
+    scored = source.iloc[: len(results)].reset_index(drop=True)
+    return pd.concat([scored, decoded], axis=1)
+
+
+def render_bulk_tab(model, tokenizer, label_encoder):
+    """Render the bulk CSV/Excel upload mode with chunked scoring"""
+    st.markdown(
+        f"""
+        <h3 style="margin-top: 0; font-size: 1.5rem; margin-bottom: 0.5rem;">
+            {get_text('bulk_title')}
+        </h3>
+        <p style="font-size: 0.95rem; opacity: 0.7; margin-bottom: 1rem;">
+            {get_text('bulk_subtitle')}
+        </p>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    uploaded_file = st.file_uploader(
+        get_text("upload_label"), type=["csv", "xlsx", "xls", "parquet", "pq"]
+    )
+    if uploaded_file is None:
+        return
+
+    # Parse the upload once and keep it across reruns
+    table = st.session_state.get("bulk_table")
+    if table is None or table["file_id"] != uploaded_file.file_id:
+        try:
+            source = read_uploaded_table(uploaded_file)
+        except Exception as e:
+            st.error(f"{get_text('error_reading_file')} {str(e)}")
+            return
+        st.session_state.bulk_table = {"file_id": uploaded_file.file_id, "df": source}
+        st.session_state.pop("bulk_job", None)
+    source = st.session_state.bulk_table["df"]
+
+    if source.empty:
+        st.warning(get_text("empty_warning"))
+        return
+
+    st.caption(f"{len(source):,} {get_text('rows_loaded')}")
+
+    # Default to the first text-like column
+    columns = list(source.columns)
+    text_columns = [c for c in columns if pd.api.types.is_string_dtype(source[c])]
+    default_index = columns.index(text_columns[0]) if text_columns else 0
+    column = st.selectbox(get_text("text_column"), columns, index=default_index)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_button = st.button(
+            get_text("bulk_start"), use_container_width=True, type="primary"
+        )
+    with col2:
+        # Clicking cancel interrupts the running loop; the rerun records it
+        cancel_button = st.button(get_text("bulk_cancel"), use_container_width=True)
+
+    if start_button:
+        st.session_state.bulk_job = {
+            "column": column,
+            "offset": 0,
+            "chunks": [],
+            "cancelled": False,
+            # A job finishes on the model version it started with
+            "artifacts": (model, tokenizer, label_encoder),
+        }
+
+    job = st.session_state.get("bulk_job")
+    if job is None:
         return
+    if cancel_button:
+        job["cancelled"] = True
+    model, tokenizer, label_encoder = job["artifacts"]
+
+    # Score in fixed-size chunks, resuming where an interrupted run stopped
+    total = len(source)
+    if job["offset"] < total and not job["cancelled"]:
+        texts = source[job["column"]].fillna("").astype(str)
+        progress = st.progress(
+            job["offset"] / total,
+            text=get_text("bulk_progress").format(done=job["offset"], total=total),
+        )
+        while job["offset"] < total:
+            end = min(job["offset"] + BULK_CHUNK_SIZE, total)
+            job["chunks"].append(
+                score_chunk(texts.iloc[job["offset"] : end].tolist(), model, tokenizer)
+            )
+            job["offset"] = end
+            progress.progress(
+                end / total,
+                text=get_text("bulk_progress").format(done=end, total=total),
+            )
+
+    if job["offset"] < total:
+        st.warning(get_text("bulk_cancelled").format(done=job["offset"], total=total))
+    else:
+        st.success(get_text("bulk_done").format(total=total))
+
+    if not job["chunks"]:
+        return
+
+    results = pd.concat(job["chunks"], ignore_index=True)
+    output = format_bulk_results(source, results, label_encoder)
+
+    # st.dataframe is virtualized, so large result tables stay responsive
+    st.dataframe(output, use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            get_text("download_csv"),
+            data=output.to_csv(index=False).encode("utf-8"),
+            file_name="sentiment_results.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
+    with col2:
+        # Typed columns (int8 / float32) survive the round trip, unlike CSV
+        st.download_button(
+            get_text("download_parquet"),
+            data=output.to_parquet(index=False),
+            file_name="sentiment_results.parquet",
+            mime="application/vnd.apache.parquet",
+            use_container_width=True,
+        )
+
+
+def main():
+    # Model artifacts load in the background; the page renders meanwhile
+    (model, tokenizer, label_encoder), fingerprint = load_model_and_artifacts()
+    ready = model is not None
+
+    if ready:
+        worker = get_inference_worker(model, fingerprint)
+        cache = get_prediction_cache(fingerprint)
 
     # Get theme colors
     colors = get_theme_colors()
@@ -1156,6 +1272,15 @@ def main():
                 st.session_state.example_text = get_text("example_negative")
                 st.rerun()
 
+        # Shared inference worker stats
+        if ready:
+            with st.expander(get_text("worker_stats")):
+                st.json(worker.stats())
+            with st.expander(get_text("cache_stats")):
+                st.json(cache.stats())
+            with st.expander(get_text("model_status")):
+                st.json(get_model_loader().status())
+
     # Main content area
     st.markdown(
         f"""
@@ -1183,208 +1308,231 @@ def main():
         unsafe_allow_html=True,
     )
 
-    # Main container
-    with st.container():
-        # Use example text if available
-        default_text = st.session_state.get("example_text", "")
-
-        # Input area with modern styling
-        st.markdown(
-            f"""
-            <h3 style="margin-top: 0; font-size: 1.5rem; margin-bottom: 0.5rem; display: flex; align-items: center; gap: 0.5rem;">
-                <span>{get_text('input_title')}</span>
-            </h3>
-            <p style="font-size: 0.95rem; opacity: 0.7; margin-bottom: 1rem;">
-                {get_text('input_subtitle')}
-            </p>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        user_input = st.text_area(
-            get_text("input_label"),
-            value=default_text,
-            height=200,
-            placeholder=get_text("input_placeholder"),
-            label_visibility="collapsed",
-        )
+    if get_model_loader().failed:
+        st.error(get_text("error_loading"))
+    elif not ready:
+        render_model_status()
 
-        # Analyze button with modern styling
-        st.markdown("<br>", unsafe_allow_html=True)
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            analyze_button = st.button(
-                get_text("analyze_button"), use_container_width=True, type="primary"
-            )
+    # Single review and bulk upload modes
+    single_tab, bulk_tab = st.tabs([get_text("tab_single"), get_text("tab_bulk")])
 
-    # Perform analysis
-    if analyze_button:
-        # Clear example text from session state after button click
-        if "example_text" in st.session_state:
-            del st.session_state.example_text
+    with single_tab:
+        # Main container
+        with st.container():
+            # Use example text if available
+            default_text = st.session_state.get("example_text", "")
 
-        if not user_input.strip():
-            st.warning(get_text("empty_warning"))
-        else:
-            with st.spinner(get_text("analyzing")):
-                sentiment, confidence, all_probs, cleaned_text = predict_sentiment(
-                    user_input, model, tokenizer, label_encoder
-                )
-
-            # Display results with modern design
+            # Input area with modern styling
             st.markdown(
                 f"""
-                <h2 style="margin-top: 2rem; font-size: 2rem; margin-bottom: 1.5rem;">
-                    {get_text('results_title')}
-                </h2>
+                <h3 style="margin-top: 0; font-size: 1.5rem; margin-bottom: 0.5rem; display: flex; align-items: center; gap: 0.5rem;">
+                    <span>{get_text('input_title')}</span>
+                </h3>
+                <p style="font-size: 0.95rem; opacity: 0.7; margin-bottom: 1rem;">
+                    {get_text('input_subtitle')}
+                </p>
                 """,
                 unsafe_allow_html=True,
             )
 
-            # Get translated sentiment for comparison
-            translated_positive = get_text("positive")
-            translated_negative = get_text("negative")
-            translated_neutral = get_text("neutral")
-
-            # Sentiment box with color and better icons
-            sentiment_class = (
-                "sentiment-positive"
-                if sentiment == translated_positive
-                else (
-                    "sentiment-negative"
-                    if sentiment == translated_negative
-                    else "sentiment-neutral"
-                )
-            )
-
-            sentiment_icon = (
-                "🎉"
-                if sentiment == translated_positive
-                else "😔" if sentiment == translated_negative else "🤔"
-            )
-
-            st.markdown(
-                f"""
-                <div class="{sentiment_class}" style="position: relative;">
-                    <div style="display: flex; justify-content: space-between; align-items: center; position: relative; z-index: 1;">
-                        <div style="display: flex; align-items: center; gap: 1rem;">
-                            <span style="font-size: 3.5rem; line-height: 1;">{sentiment_icon}</span>
-                            <div>
-                                <div style="font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; 
-                                            opacity: 0.8; margin-bottom: 0.25rem;">{get_text('sentiment_label')}</div>
-                                <h2 style="margin: 0; font-size: 2.5rem; font-weight: 800;">{sentiment}</h2>
-                            </div>
-                        </div>
-                        <div style="text-align: right;">
-                            <div style="font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; 
-                                        opacity: 0.8; margin-bottom: 0.25rem;">{get_text('confidence_label')}</div>
-                            <div style="font-size: 2.5rem; font-weight: 800;">
-                                {confidence*100:.1f}<span style="font-size: 1.5rem; opacity: 0.8;">%</span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True,
+            user_input = st.text_area(
+                get_text("input_label"),
+                value=default_text,
+                height=200,
+                placeholder=get_text("input_placeholder"),
+                label_visibility="collapsed",
             )
 
-            # Confidence breakdown with modern design
-            st.markdown(
-                f"""
-                <h3 style="font-size: 1.5rem; margin-top: 2rem; margin-bottom: 1.25rem; display: flex; align-items: center; gap: 0.5rem;">
-                    <span style="font-size: 1.5rem;">📈</span>
-                    <span>{get_text('distribution_title')}</span>
-                </h3>
-                """,
-                unsafe_allow_html=True,
-            )
+            # Analyze button with modern styling
+            st.markdown("<br>", unsafe_allow_html=True)
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                analyze_button = st.button(
+                    get_text("analyze_button"),
+                    use_container_width=True,
+                    type="primary",
+                    disabled=not ready,
+                )
 
-            # Sort probabilities
-            sorted_probs = sorted(all_probs.items(), key=lambda x: x[1], reverse=True)
+        # Perform analysis
+        if analyze_button:
+            # Clear example text from session state after button click
+            if "example_text" in st.session_state:
+                del st.session_state.example_text
+
+            if not user_input.strip():
+                st.warning(get_text("empty_warning"))
+            else:
+                with st.spinner(get_text("analyzing")):
+                    sentiment, confidence, all_probs, cleaned_text = predict_sentiment(
+                        user_input,
+                        model,
+                        tokenizer,
+                        label_encoder,
+                        worker=worker,
+                        cache=cache,
+                    )
+
+                # Display results with modern design
+                st.markdown(
+                    f"""
+                    <h2 style="margin-top: 2rem; font-size: 2rem; margin-bottom: 1.5rem;">
+                        {get_text('results_title')}
+                    </h2>
+                    """,
+                    unsafe_allow_html=True,
+                )
 
-            # Set colors and emojis for each sentiment (supporting both languages)
-            sentiment_colors = {
-                translated_positive: colors["positive_border"],
-                translated_neutral: colors["neutral_border"],
-                translated_negative: colors["negative_border"],
-            }
+                # Get translated sentiment for comparison
+                translated_positive = get_text("positive")
+                translated_negative = get_text("negative")
+                translated_neutral = get_text("neutral")
+
+                # Sentiment box with color and better icons
+                sentiment_class = (
+                    "sentiment-positive"
+                    if sentiment == translated_positive
+                    else (
+                        "sentiment-negative"
+                        if sentiment == translated_negative
+                        else "sentiment-neutral"
+                    )
+                )
 
-            sentiment_emojis = {
-                translated_positive: "😊",
-                translated_neutral: "😐",
-                translated_negative: "😞",
-            }
+                sentiment_icon = (
+                    "🎉"
+                    if sentiment == translated_positive
+                    else "😔" if sentiment == translated_negative else "🤔"
+                )
 
-            # Display confidence gauges with emojis
-            for label, prob in sorted_probs:
                 st.markdown(
                     f"""
-                    <div style="margin-bottom: 1.25rem;">
-                        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                            <div style="display: flex; align-items: center; gap: 0.5rem;">
-                                <span style="font-size: 1.25rem;">{sentiment_emojis[label]}</span>
-                                <span style="font-weight: 600; font-size: 1rem;">{label}</span>
+                    <div class="{sentiment_class}" style="position: relative;">
+                        <div style="display: flex; justify-content: space-between; align-items: center; position: relative; z-index: 1;">
+                            <div style="display: flex; align-items: center; gap: 1rem;">
+                                <span style="font-size: 3.5rem; line-height: 1;">{sentiment_icon}</span>
+                                <div>
+                                    <div style="font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; 
+                                                opacity: 0.8; margin-bottom: 0.25rem;">{get_text('sentiment_label')}</div>
+                                    <h2 style="margin: 0; font-size: 2.5rem; font-weight: 800;">{sentiment}</h2>
+                                </div>
+                            </div>
+                            <div style="text-align: right;">
+                                <div style="font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; 
+                                            opacity: 0.8; margin-bottom: 0.25rem;">{get_text('confidence_label')}</div>
+                                <div style="font-size: 2.5rem; font-weight: 800;">
+                                    {confidence*100:.1f}<span style="font-size: 1.5rem; opacity: 0.8;">%</span>
+                                </div>
                             </div>
-                            <span style="font-weight: 700; font-size: 1.125rem; color: {sentiment_colors[label]};">
-                                {prob*100:.1f}%
-                            </span>
-                        </div>
-                        <div class="confidence-gauge">
-                            <div class="confidence-fill" style="width: {prob*100}%; background: linear-gradient(90deg, {sentiment_colors[label]}, {sentiment_colors[label]}dd);"></div>
                         </div>
                     </div>
                     """,
                     unsafe_allow_html=True,
                 )
 
-            # Text statistics - Simplified design
-            st.markdown(
-                f"""
-                <h3 style="font-size: 1.5rem; margin-top: 2.5rem; margin-bottom: 1rem;">
-                    📝 {get_text('statistics_title')}
-                </h3>
-                """,
-                unsafe_allow_html=True,
-            )
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
+                # Confidence breakdown with modern design
                 st.markdown(
                     f"""
-                    <div class="metric-card">
-                        <div class="metric-value">{len(user_input.split())}</div>
-                        <div class="metric-label">{get_text('word_count')}</div>
-                    </div>
+                    <h3 style="font-size: 1.5rem; margin-top: 2rem; margin-bottom: 1.25rem; display: flex; align-items: center; gap: 0.5rem;">
+                        <span style="font-size: 1.5rem;">📈</span>
+                        <span>{get_text('distribution_title')}</span>
+                    </h3>
                     """,
                     unsafe_allow_html=True,
                 )
-            with col2:
+
+                # Sort probabilities
+                sorted_probs = sorted(all_probs.items(), key=lambda x: x[1], reverse=True)
+
+                # Set colors and emojis for each sentiment (supporting both languages)
+                sentiment_colors = {
+                    translated_positive: colors["positive_border"],
+                    translated_neutral: colors["neutral_border"],
+                    translated_negative: colors["negative_border"],
+                }
+
+                sentiment_emojis = {
+                    translated_positive: "😊",
+                    translated_neutral: "😐",
+                    translated_negative: "😞",
+                }
+
+                # Display confidence gauges with emojis
+                for label, prob in sorted_probs:
+                    st.markdown(
+                        f"""
+                        <div style="margin-bottom: 1.25rem;">
+                            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+                                <div style="display: flex; align-items: center; gap: 0.5rem;">
+                                    <span style="font-size: 1.25rem;">{sentiment_emojis[label]}</span>
+                                    <span style="font-weight: 600; font-size: 1rem;">{label}</span>
+                                </div>
+                                <span style="font-weight: 700; font-size: 1.125rem; color: {sentiment_colors[label]};">
+                                    {prob*100:.1f}%
+                                </span>
+                            </div>
+                            <div class="confidence-gauge">
+                                <div class="confidence-fill" style="width: {prob*100}%; background: linear-gradient(90deg, {sentiment_colors[label]}, {sentiment_colors[label]}dd);"></div>
+                            </div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True,
+                    )
+
+                # Text statistics - Simplified design
                 st.markdown(
                     f"""
-                    <div class="metric-card">
-                        <div class="metric-value">{len(user_input)}</div>
-                        <div class="metric-label">{get_text('characters')}</div>
-                    </div>
+                    <h3 style="font-size: 1.5rem; margin-top: 2.5rem; margin-bottom: 1rem;">
+                        📝 {get_text('statistics_title')}
+                    </h3>
                     """,
                     unsafe_allow_html=True,
                 )
-            with col3:
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.markdown(
+                        f"""
+                        <div class="metric-card">
+                            <div class="metric-value">{len(user_input.split())}</div>
+                            <div class="metric-label">{get_text('word_count')}</div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True,
+                    )
+                with col2:
+                    st.markdown(
+                        f"""
+                        <div class="metric-card">
+                            <div class="metric-value">{len(user_input)}</div>
+                            <div class="metric-label">{get_text('characters')}</div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True,
+                    )
+                with col3:
+                    st.markdown(
+                        f"""
+                        <div class="metric-card">
+                            <div class="metric-value">{len(cleaned_text.split())}</div>
+                            <div class="metric-label">{get_text('cleaned_words')}</div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True,
+                    )
+
+                # Show cleaned text with better styling
                 st.markdown(
-                    f"""
-                    <div class="metric-card">
-                        <div class="metric-value">{len(cleaned_text.split())}</div>
-                        <div class="metric-label">{get_text('cleaned_words')}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
+                    "<div style='margin-top: 1.5rem;'></div>", unsafe_allow_html=True
                 )
+                with st.expander(get_text("view_preprocessed")):
+                    st.code(cleaned_text, language=None)
 
-            # Show cleaned text with better styling
-            st.markdown(
-                "<div style='margin-top: 1.5rem;'></div>", unsafe_allow_html=True
-            )
-            with st.expander(get_text("view_preprocessed")):
-                st.code(cleaned_text, language=None)
+    with bulk_tab:
+        if ready:
+            render_bulk_tab(model, tokenizer, label_encoder)
+        else:
+            st.info(get_text("model_not_ready"))
 
     # Footer with modern design
     st.markdown(
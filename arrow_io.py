@@ -0,0 +1,221 @@
+"""
+Arrow and Parquet I/O for bulk scoring: the text column is read in record
+batches straight from a memory-mapped file, and predictions are written
+back as typed columns next to the input columns, never as Python dicts.
+
+Prediction columns:
+    sentiment      predicted label (dictionary-encoded string)
+    sentiment_idx  predicted label index (int8)
+    confidence     probability of the predicted label (float32)
+    prob_<label>   probability of each label class (float32)
+    windows        windows scored per row, in long-document mode (int32)
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Rows per Parquet row group; batches are buffered up to this size
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _slices(batch, batch_size):
+    """Zero-copy slices of at most batch_size rows"""
+    for offset in range(0, batch.num_rows, batch_size):
+        yield batch.slice(offset, batch_size)
+
+
+def read_record_batches(source, input_format, batch_size):
+    """Yield RecordBatches of up to batch_size rows from a Parquet or Arrow file
+
+    Files are memory-mapped, so only the pages that are read are loaded.
+    Arrow input may be an IPC file (Feather v2) or an IPC stream; a stream
+    can also come from a binary file object such as stdin.
+    """
+    if input_format == "parquet":
+        parquet = pq.ParquetFile(source, memory_map=True)
+        yield from parquet.iter_batches(batch_size=batch_size)
+        return
+
+    if isinstance(source, str):
+        source = pa.memory_map(source)
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+        else:
+            for i in range(reader.num_record_batches):
+                yield from _slices(reader.get_batch(i), batch_size)
+            return
+    for batch in pa.ipc.open_stream(source):
+        yield from _slices(batch, batch_size)
+
+
+def batch_texts(batch, text_field):
+    """The text column of a RecordBatch as a list of str, nulls as ''"""
+    if text_field not in batch.schema.names:
+        raise KeyError(f"Input has no column {text_field!r}")
+    column = batch.column(text_field)
+    if not pa.types.is_string(column.type):
+        column = column.cast(pa.string())
+    return pc.fill_null(column, "").to_pylist()
+
+
+def prediction_columns(predictions, classes, windows=None):
+    """Typed Arrow columns for a (N, n_classes) probability matrix"""
+    predictions = np.asarray(predictions, dtype=np.float32)
+    predicted_idx = np.argmax(predictions, axis=1).astype(np.int8)
+    indices = pa.array(predicted_idx)
+    columns = {
+        "sentiment": pa.DictionaryArray.from_arrays(
+            indices, pa.array(classes, pa.string())
+        ),
+        "sentiment_idx": indices,
+        "confidence": pa.array(
+            predictions[np.arange(len(predictions)), predicted_idx]
+        ),
+    }
+    for i, label in enumerate(classes):
+        columns[f"prob_{label}"] = pa.array(np.ascontiguousarray(predictions[:, i]))
+    if windows is not None:
+        columns["windows"] = pa.array(np.asarray(windows, dtype=np.int32))
+    return columns
+
+
+def append_predictions(batch, predictions, classes, windows=None):
+    """The batch with prediction columns appended
+
+    Input columns with the same names, as in a file that was scored
+    before, are replaced.
+    """
+    columns = prediction_columns(predictions, classes, windows)
+    kept = [name for name in batch.schema.names if name not in columns]
+    return pa.RecordBatch.from_arrays(
+        [batch.column(name) for name in kept] + list(columns.values()),
+        names=kept + list(columns),
+    )
+
+
+def _row_batch(rows, schema=None, text_field=None):
+    """RecordBatch of row dicts; bare JSONL values become rows with no fields"""
+    rows = [row if isinstance(row, dict) else {} for row in rows]
+    if text_field is not None:
+        # The text column is a string column, like the text that was scored
+        rows = [
+            row
+            if isinstance(row.get(text_field), (str, type(None)))
+            else {**row, text_field: str(row[text_field])}
+            for row in rows
+        ]
+    try:
+        return pa.RecordBatch.from_pylist(rows, schema=schema)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        if schema is None:
+            raise
+    # Values of another type in a string column, e.g. a number in a
+    # column that had no values in the first row group
+    strings = [field.name for field in schema if pa.types.is_string(field.type)]
+    rows = [
+        {
+            **row,
+            **{
+                name: str(row[name])
+                for name in strings
+                if row.get(name) is not None and not isinstance(row[name], str)
+            },
+        }
+        for row in rows
+    ]
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def _unify_schemas(schemas):
+    """One schema for batches inferred separately, with types promoted"""
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    # A column with no values yet has no type to keep; store it as text
+    return pa.schema(
+        [
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ]
+    )
+
+
+def _conform(batch, schema, num_rows):
+    """The batch cast to schema, with null columns for fields it lacks
+
+    num_rows is passed in because a batch of bare values has no columns,
+    and so no rows as far as Arrow is concerned.
+    """
+    if batch.schema.equals(schema) and batch.num_rows == num_rows:
+        return batch
+    names = batch.schema.names
+    return pa.RecordBatch.from_arrays(
+        [
+            batch.column(field.name).cast(field.type)
+            if field.name in names
+            else pa.nulls(num_rows, field.type)
+            for field in schema
+        ],
+        schema=schema,
+    )
+
+
+def write_parquet(
+    scored, classes, path, row_group_size=PARQUET_ROW_GROUP_SIZE, text_field=None
+):
+    """Write (batch, predictions) pairs to a Parquet file; return the row count
+
+    Triples from long-document mode add a windows column. Batches are
+    RecordBatches or lists of row dicts. The input columns and their types
+    are settled over the whole first row group: types are promoted across
+    batches, columns still without values are written as strings, and
+    ``text_field``, if given, is always a string. Later rows are converted
+    to that schema, so fields that first appear after it are dropped.
+    """
+    writer = None
+    input_schema = None
+    pending = []
+    pending_rows = 0
+    count = 0
+
+    def flush():
+        nonlocal writer, input_schema, pending, pending_rows
+        if input_schema is None:
+            input_schema = _unify_schemas([batch.schema for batch, _, _ in pending])
+        batches = [
+            append_predictions(
+                _conform(batch, input_schema, len(predictions)),
+                predictions,
+                classes,
+                *windows,
+            )
+            for batch, predictions, windows in pending
+        ]
+        if writer is None:
+            writer = pq.ParquetWriter(path, batches[0].schema)
+        writer.write_table(pa.Table.from_batches(batches), row_group_size)
+        pending = []
+        pending_rows = 0
+
+    try:
+        for batch, predictions, *windows in scored:
+            if isinstance(batch, list):
+                batch = _row_batch(batch, input_schema, text_field)
+            pending.append((batch, predictions, windows))
+            pending_rows += len(predictions)
+            count += len(predictions)
+            if pending_rows >= row_group_size:
+                flush()
+        if pending:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        # No input rows: still leave a file with the prediction columns
+        empty = np.empty((0, len(classes)), dtype=np.float32)
+        pq.write_table(pa.table(prediction_columns(empty, classes)), path)
+    return count
@@ -0,0 +1,151 @@
+"""
+Background micro-batching worker: gathers pending prediction requests from
+many threads (e.g. concurrent Streamlit sessions) into one forward pass.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+_STOP = object()
+
+
+class BatcherClosedError(RuntimeError):
+    """Raised when a request is submitted to a closed MicroBatcher"""
+
+
+class MicroBatcher:
+    """Batch requests from many callers into single calls to predict_fn
+
+    Each request is an array of input rows. The worker collects requests
+    until ``max_batch_size`` rows are pending or ``max_wait_ms`` has passed
+    since the first one arrived, runs ``predict_fn`` once on the stacked
+    rows and hands every caller its slice of the output through a future.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=10):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._carry = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._rows = 0
+        self._largest_batch = 0
+        self._last_batch = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, inputs):
+        """Queue a request and return a future for its output rows"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise BatcherClosedError("MicroBatcher is closed")
+            self._queue.put((np.asarray(inputs), future))
+        return future
+
+    def predict(self, inputs, timeout=None):
+        """Queue a request and block until its output rows are ready"""
+        return self.submit(inputs).result(timeout=timeout)
+
+    def stats(self):
+        """Queue depth and batch-size counters"""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "requests": self._requests,
+                "rows": self._rows,
+                "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "largest_batch_size": self._largest_batch,
+                "last_batch_size": self._last_batch,
+            }
+
+    def close(self):
+        """Stop the worker after the requests already queued are served"""
+        with self._lock:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _next(self, timeout=None):
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        return self._queue.get(timeout=timeout)
+
+    def _run(self):
+        while True:
+            first = self._next()
+            if first is _STOP:
+                return
+
+            pending = [first]
+            rows = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._next(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if rows + len(item[0]) > self.max_batch_size:
+                    # Too big for this batch; it starts the next one
+                    self._carry = item
+                    break
+                pending.append(item)
+                rows += len(item[0])
+
+            self._run_batch(pending)
+            if stop:
+                return
+
+    def _run_batch(self, pending):
+        # Drop requests whose callers cancelled while they were queued
+        pending = [
+            (inputs, future)
+            for inputs, future in pending
+            if future.set_running_or_notify_cancel()
+        ]
+        if not pending:
+            return
+
+        sizes = [len(inputs) for inputs, _ in pending]
+        try:
+            outputs = np.asarray(
+                self.predict_fn(np.concatenate([inputs for inputs, _ in pending]))
+            )
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for size, (_, future) in zip(sizes, pending):
+            future.set_result(outputs[offset : offset + size])
+            offset += size
+
+        with self._lock:
+            self._batches += 1
+            self._requests += len(pending)
+            self._rows += offset
+            self._largest_batch = max(self._largest_batch, offset)
+            self._last_batch = offset
@@ -0,0 +1,129 @@
+"""
+Benchmark: the fused einsum AttentionLayer against the original op-by-op
+version (ChainedAttentionLayer), on the layer alone and end to end, with
+and without XLA.
+
+Run from the repository root:
+    python benchmarks/bench_attention.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import MAX_LEN, MODEL_PATH  # noqa: E402
+from keras_backend import (  # noqa: E402
+    AttentionLayer,
+    ChainedAttentionLayer,
+    InferenceEngine,
+    vocab_size,
+)
+
+BATCH_SIZES = (1, 32, 256)
+ITERATIONS = 50
+
+
+def best_of(fn, repeats=3):
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            fn()
+        times.append((time.perf_counter() - start) / ITERATIONS)
+    return min(times)
+
+
+def load_with(layer_class):
+    return tf.keras.models.load_model(
+        MODEL_PATH, custom_objects={"AttentionLayer": layer_class}
+    )
+
+
+def padded_batch(batch_size, vocab, seed=0):
+    """Token ids below vocab with random lengths, post-padded to MAX_LEN"""
+    rng = np.random.default_rng(seed)
+    inputs = rng.integers(1, vocab, (batch_size, MAX_LEN)).astype(np.int32)
+    lengths = rng.integers(3, MAX_LEN, batch_size)
+    inputs[np.arange(MAX_LEN)[None, :] >= lengths[:, None]] = 0
+    return inputs
+
+
+def bench_layer(model):
+    """The attention layer alone on inputs shaped like the model's"""
+    attention = next(
+        layer for layer in model.layers if isinstance(layer, AttentionLayer)
+    )
+    steps, features = attention.input.shape[1:]
+    fused = AttentionLayer()
+    chained = ChainedAttentionLayer()
+    for layer in (fused, chained):
+        layer.build((None, steps, features))
+        layer.set_weights(attention.get_weights())
+
+    print("=" * 60)
+    print(f"Layer alone, inputs (batch, {steps}, {features}), ms per call")
+    print("=" * 60)
+    print(f"{'batch':>6}{'chained':>12}{'fused':>12}{'fused+XLA':>12}{'speedup':>10}")
+    for batch_size in BATCH_SIZES:
+        rng = np.random.default_rng(batch_size)
+        x = tf.constant(rng.normal(size=(batch_size, steps, features)), tf.float32)
+        lengths = rng.integers(1, steps + 1, batch_size)
+        mask = tf.constant(np.arange(steps)[None, :] < lengths[:, None])
+
+        runs = {
+            "chained": tf.function(lambda x, m: chained(x, mask=m)),
+            "fused": tf.function(lambda x, m: fused(x, mask=m)),
+            "xla": tf.function(lambda x, m: fused(x, mask=m), jit_compile=True),
+        }
+        reference = runs["chained"](x, mask).numpy()
+        for name, fn in runs.items():
+            diff = np.abs(fn(x, mask).numpy() - reference).max()
+            assert diff < 1e-5, f"{name} differs from chained by {diff}"
+        times = {name: best_of(lambda: fn(x, mask)) for name, fn in runs.items()}
+        print(
+            f"{batch_size:>6}"
+            f"{times['chained'] * 1000:>12.3f}"
+            f"{times['fused'] * 1000:>12.3f}"
+            f"{times['xla'] * 1000:>12.3f}"
+            f"{times['chained'] / times['fused']:>9.2f}x"
+        )
+
+
+def bench_end_to_end(fused_model, chained_model):
+    """Full forward pass through InferenceEngine with each layer"""
+    fused = InferenceEngine(fused_model)
+    chained = InferenceEngine(chained_model)
+
+    print("\n" + "=" * 60)
+    print("End to end (InferenceEngine), ms per batch")
+    print("=" * 60)
+    print(f"{'batch':>6}{'chained':>12}{'fused':>12}{'max |diff|':>14}{'speedup':>10}")
+    for batch_size in BATCH_SIZES:
+        inputs = padded_batch(batch_size, vocab_size(fused_model))
+        diff = np.abs(fused.predict(inputs) - chained.predict(inputs)).max()
+        chained_time = best_of(lambda: chained.predict(inputs, batch_size=batch_size))
+        fused_time = best_of(lambda: fused.predict(inputs, batch_size=batch_size))
+        print(
+            f"{batch_size:>6}"
+            f"{chained_time * 1000:>12.3f}"
+            f"{fused_time * 1000:>12.3f}"
+            f"{diff:>14.2e}"
+            f"{chained_time / fused_time:>9.2f}x"
+        )
+
+
+def main():
+    fused_model = load_with(AttentionLayer)
+    chained_model = load_with(ChainedAttentionLayer)
+    bench_layer(fused_model)
+    bench_end_to_end(fused_model, chained_model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Chained five-pass clean_text against the fused version and
+its batch variant, on synthetic review text with URLs, mentions,
+hashtags and punctuation. Checks the outputs are identical.
+
+Run from the repository root:
+    python benchmarks/bench_clean_text.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalization import clean_text, clean_text_chained, clean_texts  # noqa: E402
+
+N_TEXTS = 50000
+SEED = 0
+WORDS = (
+    "mobil listrik ini sangat bagus dan hemat energi saya puas harga terlalu "
+    "mahal infrastruktur charging masih kurang pemerintah sedang menyiapkan "
+    "insentif untuk kendaraan bermotor"
+).split()
+EXTRAS = [
+    "https://t.co/AbC123xyz",
+    "www.otomotif.example.com/berita",
+    "@dealer_resmi",
+    "#MobilListrik",
+    "!!",
+    "...",
+    "2024,",
+    "(EV)",
+    "👍",
+]
+
+
+def synthetic_reviews(n):
+    """Reviews of 5-60 tokens, about one in six a URL, mention or symbol"""
+    rng = np.random.default_rng(SEED)
+    reviews = []
+    for length in rng.integers(5, 60, n):
+        tokens = [
+            EXTRAS[rng.integers(len(EXTRAS))]
+            if rng.random() < 0.15
+            else WORDS[rng.integers(len(WORDS))].capitalize()
+            if rng.random() < 0.1
+            else WORDS[rng.integers(len(WORDS))]
+            for _ in range(length)
+        ]
+        reviews.append(" ".join(tokens))
+    return reviews
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    result = fn(texts)
+    return result, time.perf_counter() - start
+
+
+def main():
+    texts = synthetic_reviews(N_TEXTS)
+    chained, chained_seconds = timed(lambda t: [clean_text_chained(x) for x in t], texts)
+    fused, fused_seconds = timed(lambda t: [clean_text(x) for x in t], texts)
+    batch, batch_seconds = timed(clean_texts, texts)
+
+    print("=" * 60)
+    print(f"{len(texts)} texts, {sum(map(len, texts)) / 1e6:.1f}M characters")
+    print(f"identical output: {chained == fused == batch}")
+    print("=" * 60)
+    for name, seconds in (
+        ("chained re.sub x5", chained_seconds),
+        ("fused per text", fused_seconds),
+        ("fused batch", batch_seconds),
+    ):
+        print(
+            f"{name:<20}{seconds * 1000:>9.1f} ms"
+            f"{len(texts) / seconds:>12,.0f} texts/s"
+            f"{chained_seconds / seconds:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold start: time from a fresh interpreter to the first prediction, for
+the .h5 + pickle artifacts and for the precompiled bundle. Build the
+bundle first:
+    python bundle.py
+
+Run from the repository root:
+    python benchmarks/bench_cold_start.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 3
+TEXT = "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!"
+PROBE = """
+import sys, time
+start = time.perf_counter()
+from inference import clean_text, encode_cleaned, load_artifacts
+engine, tokenizer, label_encoder = load_artifacts(backend={backend!r}, bundle_path={bundle!r})
+loaded = time.perf_counter()
+engine.predict(encode_cleaned([clean_text({text!r})], tokenizer))
+print(loaded - start, time.perf_counter() - start, "tensorflow" in sys.modules)
+"""
+
+
+def cold_start(backend, bundle):
+    """Best of REPEATS: (seconds to load, seconds to first prediction, TF loaded)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path[1:]))
+    env.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    runs = []
+    for _ in range(REPEATS):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(backend=backend, bundle=bundle, text=TEXT)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.split()
+        runs.append((float(output[-3]), float(output[-2]), output[-1] == "True"))
+    return min(runs)
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from bundle import BUNDLE_PATH
+
+    bundle = os.environ.get("ARTIFACT_BUNDLE", BUNDLE_PATH)
+    cases = [
+        ("h5 + pickles", "keras", None),
+        ("npz + pickles", "numpy", None),
+        ("bundle", "keras", bundle),
+        ("bundle", "numpy", bundle),
+    ]
+
+    print("=" * 66)
+    print(f"{'artifacts':<16}{'backend':<10}{'load s':>10}{'first pred s':>15}{'tensorflow':>15}")
+    print("=" * 66)
+    for name, backend, bundle_path in cases:
+        loaded, first, loaded_tf = cold_start(backend, bundle_path)
+        print(
+            f"{name:<16}{backend:<10}{loaded:>10.2f}{first:>15.2f}"
+            f"{'yes' if loaded_tf else 'no':>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
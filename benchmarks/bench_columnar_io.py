@@ -0,0 +1,129 @@
+"""
+Benchmark: the I/O side of bulk scoring without the model. Reads a review
+export, attaches a precomputed probability matrix and writes the results,
+as CSV in / NDJSON out (Python dicts per row) against Parquet in / Parquet
+out (typed columns).
+
+Run from the repository root:
+    python benchmarks/bench_columnar_io.py
+    python benchmarks/bench_columnar_io.py --records 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arrow_io import batch_texts, read_record_batches, write_parquet  # noqa: E402
+from bundle import LabelClasses  # noqa: E402
+from score import read_records, result_dicts, text_batches  # noqa: E402
+
+CLASSES = ["Negatif", "Netral", "Positif"]
+BATCH_ROWS = 4096
+WORDS = (
+    "mobil listrik sangat bagus hemat energi harga terlalu mahal "
+    "infrastruktur charging masih kurang pemerintah insentif"
+).split()
+
+
+def make_export(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(3, 80, n)
+    texts = [" ".join(rng.choice(WORDS, size=length)) for length in lengths]
+    probabilities = rng.dirichlet(np.ones(len(CLASSES)), n).astype(np.float32)
+    return pd.DataFrame({"id": np.arange(n), "text": texts}), probabilities
+
+
+def fake_predictions(probabilities):
+    """Stand in for the model: hand out the next rows of a fixed matrix"""
+    offset = 0
+
+    def predict(batches):
+        nonlocal offset
+        for texts, batch in batches:
+            yield batch, probabilities[offset : offset + len(texts)]
+            offset += len(texts)
+
+    return predict
+
+
+def csv_to_ndjson(source, target, probabilities):
+    with open(source, encoding="utf-8", newline="") as f, open(
+        target, "w", encoding="utf-8"
+    ) as out:
+        batches = text_batches(read_records(f, "csv"), "text", BATCH_ROWS)
+        scored = fake_predictions(probabilities)(batches)
+        for result in result_dicts(scored, LabelClasses(CLASSES)):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def parquet_to_parquet(source, target, probabilities):
+    batches = (
+        (batch_texts(batch, "text"), batch)
+        for batch in read_record_batches(source, "parquet", BATCH_ROWS)
+    )
+    write_parquet(fake_predictions(probabilities)(batches), CLASSES, target)
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    export, probabilities = make_export(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            name: os.path.join(tmp, name)
+            for name in ("in.csv", "out.ndjson", "in.parquet", "out.parquet")
+        }
+        export.to_csv(paths["in.csv"], index=False, quoting=csv.QUOTE_MINIMAL)
+        export.to_parquet(paths["in.parquet"], index=False)
+
+        runs = {
+            "CSV -> NDJSON": lambda: csv_to_ndjson(
+                paths["in.csv"], paths["out.ndjson"], probabilities
+            ),
+            "Parquet -> Parquet": lambda: parquet_to_parquet(
+                paths["in.parquet"], paths["out.parquet"], probabilities
+            ),
+        }
+        times = {name: best_of(run) for name, run in runs.items()}
+        sizes = {
+            "CSV -> NDJSON": os.path.getsize(paths["out.ndjson"]),
+            "Parquet -> Parquet": os.path.getsize(paths["out.parquet"]),
+        }
+
+    print("=" * 66)
+    print(f"I/O only, {args.records:,} records, precomputed probabilities")
+    print("=" * 66)
+    print(
+        f"{'path':<22}{'seconds':>10}{'records/s':>14}"
+        f"{'output MB':>12}{'speedup':>8}"
+    )
+    baseline = times["CSV -> NDJSON"]
+    for name, seconds in times.items():
+        print(
+            f"{name:<22}{seconds:>10.2f}{args.records / seconds:>14.0f}"
+            f"{sizes[name] / 1e6:>12.1f}{baseline / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Microbenchmark: single-review latency of Keras model.predict versus the
+traced InferenceEngine fast path.
+
+Run from the repository root:
+    python benchmarks/bench_fast_path.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import clean_text, encode_cleaned, load_artifacts  # noqa: E402
+
+ITERATIONS = 200
+TEXT = "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!"
+
+
+def time_calls(fn, iterations=ITERATIONS):
+    """Per-call latencies in milliseconds after one warm-up call"""
+    fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def report(name, latencies):
+    print(
+        f"{name:<24} mean {latencies.mean():7.3f} ms   "
+        f"p50 {np.percentile(latencies, 50):7.3f} ms   "
+        f"p95 {np.percentile(latencies, 95):7.3f} ms"
+    )
+
+
+def main():
+    engine, tokenizer, _ = load_artifacts()
+    padded = encode_cleaned([clean_text(TEXT)], tokenizer)
+
+    print("=" * 60)
+    print(f"Single-review latency over {ITERATIONS} calls, input {padded.shape}")
+    print("=" * 60)
+    before = time_calls(lambda: engine.model.predict(padded, verbose=0))
+    after = time_calls(lambda: engine.predict(padded))
+    report("model.predict", before)
+    report("InferenceEngine.predict", after)
+    print(f"\nSpeed-up (mean): {before.mean() / after.mean():.1f}x")
+
+
+if __name__ == "__main__":
+    main()
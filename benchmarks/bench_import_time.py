@@ -0,0 +1,59 @@
+"""
+Cold import time of each module in a fresh interpreter, and whether the
+import pulled in TensorFlow.
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = (
+    "normalization",
+    "fast_tokenizer",
+    "translations",
+    "inference",
+    "numpy_backend",
+    "tflite_backend",
+    "score",
+    "server",
+    "keras_backend",
+)
+REPEATS = 3
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "tensorflow" in sys.modules)
+"""
+
+
+def import_time(module):
+    """Best of REPEATS cold imports, in seconds, and whether TF was loaded"""
+    runs = []
+    for _ in range(REPEATS):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        runs.append((float(output[-2]), output[-1] == "True"))
+    return min(runs)
+
+
+def main():
+    print("=" * 60)
+    print(f"{'module':<20}{'import ms':>12}{'tensorflow':>14}")
+    print("=" * 60)
+    for module in MODULES:
+        seconds, loaded_tf = import_time(module)
+        print(f"{module:<20}{seconds * 1000:>12.1f}{'yes' if loaded_tf else 'no':>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: scoring in-process against scoring through the inference daemon
+over its Unix socket, at several batch sizes and with concurrent callers,
+plus the peak memory of a front end in each mode.
+
+Run from the repository root:
+    python benchmarks/bench_inference_daemon.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from inference import MAX_LEN, load_artifacts  # noqa: E402
+from inference_daemon import DaemonClient  # noqa: E402
+
+BATCH_SIZES = (1, 32, 256)
+CONCURRENT_CALLERS = (1, 4, 16)
+ROWS_PER_RUN = 512
+
+# Peak RSS of a process that loads the artifacts one way and scores one row
+FRONT_END = """
+import sys
+import numpy as np
+sys.path.insert(0, {root!r})
+if {socket!r}:
+    from inference_daemon import DaemonClient
+    model, _, _ = DaemonClient({socket!r}).load_artifacts()
+else:
+    from inference import load_artifacts
+    model, _, _ = load_artifacts()
+model.predict(np.ones((1, {max_len}), np.int32))
+# VmHWM, unlike ru_maxrss, is not carried over from the parent across exec
+with open("/proc/self/status") as f:
+    print(next(line.split()[1] for line in f if line.startswith("VmHWM")))
+"""
+
+
+def padded_batch(batch_size, vocab, seed=0):
+    """Token ids below vocab with random lengths, post-padded to MAX_LEN"""
+    rng = np.random.default_rng(seed)
+    inputs = rng.integers(1, vocab, (batch_size, MAX_LEN)).astype(np.int32)
+    lengths = rng.integers(3, MAX_LEN, batch_size)
+    inputs[np.arange(MAX_LEN)[None, :] >= lengths[:, None]] = 0
+    return inputs
+
+
+def ms_per_batch(predict, inputs, repeats=3):
+    """Best mean time of one batch, over enough calls to score ROWS_PER_RUN rows"""
+    calls = max(1, ROWS_PER_RUN // len(inputs))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            predict(inputs)
+        times.append((time.perf_counter() - start) / calls)
+    return min(times) * 1000
+
+
+def rows_per_second(predict, inputs, callers, calls=64):
+    """Single-row requests from concurrent callers, rows scored per second"""
+    with ThreadPoolExecutor(callers) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda _: predict(inputs), range(calls * callers)))
+    return calls * callers / (time.perf_counter() - start)
+
+
+def front_end_rss_mb(socket_path=None):
+    code = FRONT_END.format(root=ROOT, socket=socket_path, max_len=MAX_LEN)
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    return int(output.split()[-1]) / 1024
+
+
+def main():
+    socket_path = os.path.join(tempfile.mkdtemp(), "inference.sock")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path[1:]))
+    env.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    daemon = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "inference_daemon.py"),
+            "--socket",
+            socket_path,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    try:
+        client = DaemonClient(socket_path)
+        remote, _, _ = client.load_artifacts()
+        local, tokenizer, _ = load_artifacts()
+        # Ids the tokenizer can emit, which the Embedding layer accepts
+        vocab = tokenizer.num_words or len(tokenizer.word_index) + 1
+
+        print("=" * 60)
+        print(
+            f"{'batch':>6}{'in-process ms':>16}{'daemon ms':>14}{'overhead ms':>14}"
+        )
+        print("=" * 60)
+        for batch_size in BATCH_SIZES:
+            inputs = padded_batch(batch_size, vocab)
+            diff = np.abs(local.predict(inputs) - remote.predict(inputs)).max()
+            assert diff < 1e-5, f"Daemon differs from in-process by {diff}"
+            local_ms = ms_per_batch(
+                lambda x: local.predict(x, batch_size=len(x)), inputs
+            )
+            remote_ms = ms_per_batch(remote.predict, inputs)
+            print(
+                f"{batch_size:>6}{local_ms:>16.3f}{remote_ms:>14.3f}"
+                f"{remote_ms - local_ms:>14.3f}"
+            )
+
+        print("\n" + "=" * 60)
+        print("Single-row requests from concurrent callers, rows/s")
+        print("=" * 60)
+        print(f"{'callers':>8}{'in-process':>14}{'daemon':>14}")
+        single = padded_batch(1, vocab)
+        for callers in CONCURRENT_CALLERS:
+            in_process = rows_per_second(
+                lambda x: local.predict(x, batch_size=1), single, callers
+            )
+            through_daemon = rows_per_second(remote.predict, single, callers)
+            print(f"{callers:>8}{in_process:>14.0f}{through_daemon:>14.0f}")
+
+        print("\n" + "=" * 60)
+        print("Peak RSS of one front end")
+        print("=" * 60)
+        print(f"{'in-process model':<24}{front_end_rss_mb():>10.0f} MB")
+        print(f"{'daemon client':<24}{front_end_rss_mb(socket_path):>10.0f} MB")
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
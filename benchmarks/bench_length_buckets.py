@@ -0,0 +1,78 @@
+"""
+Benchmark: full MAX_LEN padding versus length-bucketed padding on a mix of
+short and long reviews, with the agreement between the two.
+
+Run from the repository root:
+    python benchmarks/bench_length_buckets.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import clean_text, encode_cleaned, load_artifacts  # noqa: E402
+from keras_backend import InferenceEngine  # noqa: E402
+
+BUCKETS = (16, 32, 64, 128)
+N_TEXTS = 2000
+BATCH_SIZE = 256
+SAMPLE_TEXTS = [
+    "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
+    "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
+    "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+]
+
+
+def make_corpus(n, seed=0):
+    """Mostly tweet-length texts with a tail of long reviews"""
+    rng = np.random.default_rng(seed)
+    words = " ".join(SAMPLE_TEXTS).split()
+    lengths = np.where(
+        rng.random(n) < 0.85, rng.integers(3, 25, n), rng.integers(25, 200, n)
+    )
+    return [" ".join(rng.choice(words, size=length)) for length in lengths]
+
+
+def best_of(fn, repeats=3):
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    engine, tokenizer, _ = load_artifacts(length_buckets=())
+    # Force bucketing on to measure it; agreement is reported below
+    bucketed = InferenceEngine(engine.model, length_buckets=BUCKETS, bucket_atol=1.0)
+
+    texts = make_corpus(N_TEXTS)
+    padded = encode_cleaned([clean_text(text) for text in texts], tokenizer)
+    lengths = (padded != 0).sum(axis=1)
+
+    full_time = best_of(lambda: engine.predict(padded, batch_size=BATCH_SIZE))
+    bucket_time = best_of(lambda: bucketed.predict(padded, batch_size=BATCH_SIZE))
+
+    full_out = engine.predict(padded, batch_size=BATCH_SIZE)
+    bucket_out = bucketed.predict(padded, batch_size=BATCH_SIZE)
+    agreement = np.mean(full_out.argmax(axis=1) == bucket_out.argmax(axis=1))
+
+    print("=" * 60)
+    print(f"{N_TEXTS} texts, median {int(np.median(lengths))} tokens")
+    print(f"Buckets: {BUCKETS}")
+    print("=" * 60)
+    print(f"Full padding      {N_TEXTS / full_time:9.1f} texts/s")
+    print(f"Length buckets    {N_TEXTS / bucket_time:9.1f} texts/s")
+    print(f"Speed-up          {full_time / bucket_time:9.2f}x")
+    print(f"Label agreement   {agreement * 100:9.2f}%")
+    print(f"Max |prob diff|   {np.abs(full_out - bucket_out).max():9.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: long-document scoring. Truncating at MAX_LEN, a Python loop
+that calls model.predict once per window, and predict_windows, which
+scores every window of every review in one batched call.
+
+Run from the repository root:
+    python benchmarks/bench_long_text.py
+    python benchmarks/bench_long_text.py --records 2000 --words 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import (  # noqa: E402
+    WINDOW_STRIDE,
+    clean_texts,
+    encode_windows_cleaned,
+    load_artifacts,
+    predict_proba_batch,
+    predict_windows,
+)
+
+WORDS = (
+    "mobil listrik sangat bagus hemat energi harga terlalu mahal "
+    "infrastruktur charging masih kurang pemerintah insentif"
+).split()
+
+
+def make_reviews(n, max_words, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(10, max_words, n)
+    return [" ".join(rng.choice(WORDS, size=length)) for length in lengths]
+
+
+def per_window_loop(texts, model, tokenizer):
+    """The naive version: one model.predict call per window"""
+    predictions = []
+    for cleaned in clean_texts(texts):
+        windows, _ = encode_windows_cleaned([cleaned], tokenizer, WINDOW_STRIDE)
+        outputs = [model.predict(window[None, :], batch_size=1) for window in windows]
+        predictions.append(np.concatenate(outputs).mean(axis=0))
+    return np.array(predictions)
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--words", type=int, default=600)
+    args = parser.parse_args()
+
+    model, tokenizer, _ = load_artifacts()
+    texts = make_reviews(args.records, args.words)
+    # Warm up every shape before timing
+    predict_windows(texts[:64], model, tokenizer)
+    per_window_loop(texts[:2], model, tokenizer)
+
+    truncated_s, _ = best_of(lambda: predict_proba_batch(texts, model, tokenizer))
+    loop_s, expected = best_of(lambda: per_window_loop(texts, model, tokenizer), 1)
+    batched_s, (actual, windows, _) = best_of(
+        lambda: predict_windows(texts, model, tokenizer)
+    )
+    diff = np.abs(expected - actual).max()
+    assert diff < 1e-4, f"Batched windows differ from the loop by {diff}"
+
+    print("=" * 60)
+    print(
+        f"{args.records:,} reviews of up to {args.words} words, "
+        f"{int(windows.sum()):,} windows (stride {WINDOW_STRIDE})"
+    )
+    print("=" * 60)
+    print(f"{'mode':<28}{'seconds':>10}{'reviews/s':>12}")
+    for name, seconds in (
+        ("truncate at MAX_LEN", truncated_s),
+        ("model.predict per window", loop_s),
+        ("windows in one pass", batched_s),
+    ):
+        print(f"{name:<28}{seconds:>10.2f}{args.records / seconds:>12.0f}")
+    print(f"\nOne pass vs per-window loop: {loop_s / batched_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Accuracy and latency of the pure-NumPy engine against the Keras model.
+Export the weights first:
+    python numpy_backend.py
+
+Run from the repository root:
+    python benchmarks/bench_numpy_engine.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import (  # noqa: E402
+    NUMPY_WEIGHTS_PATH,
+    clean_text,
+    encode_cleaned,
+    load_artifacts,
+)
+from numpy_backend import NumpyEngine  # noqa: E402
+
+ITERATIONS = 100
+BATCH_SIZES = (1, 32, 256)
+TEST_TEXTS = [
+    "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
+    "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
+    "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+]
+
+
+def mean_latency_ms(engine, padded, batch_size):
+    """Mean latency of one predict call on batch_size rows"""
+    batch = np.resize(padded, (batch_size, padded.shape[1]))
+    engine.predict(batch)
+    iterations = max(ITERATIONS // batch_size, 5)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine.predict(batch)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    keras_engine, tokenizer, _ = load_artifacts(backend="keras")
+    numpy_engine = NumpyEngine(NUMPY_WEIGHTS_PATH)
+    padded = encode_cleaned([clean_text(text) for text in TEST_TEXTS], tokenizer)
+
+    reference = keras_engine.predict(padded)
+    outputs = numpy_engine.predict(padded)
+    matches = int((outputs.argmax(axis=1) == reference.argmax(axis=1)).sum())
+
+    print("=" * 60)
+    print(f"max |diff| vs Keras: {np.abs(outputs - reference).max():.2e}")
+    print(f"labels matching:     {matches}/{len(TEST_TEXTS)}")
+    print("=" * 60)
+    print(f"{'batch':>6}{'keras ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for batch_size in BATCH_SIZES:
+        keras_ms = mean_latency_ms(keras_engine, padded, batch_size)
+        numpy_ms = mean_latency_ms(numpy_engine, padded, batch_size)
+        print(
+            f"{batch_size:>6}{keras_ms:>12.3f}{numpy_ms:>12.3f}"
+            f"{keras_ms / numpy_ms:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
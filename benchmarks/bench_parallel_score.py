@@ -0,0 +1,99 @@
+"""
+Benchmark: score.py on a synthetic review export with 1, 2, 4, ... worker
+processes up to the usable cores, reporting records/s including model
+loading and the scaling efficiency against one process.
+
+Run from the repository root:
+    python benchmarks/bench_parallel_score.py
+    python benchmarks/bench_parallel_score.py --records 500000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cpu_threads import usable_cpus  # noqa: E402
+
+SAMPLE_TEXTS = [
+    "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
+    "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
+    "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+]
+
+
+def write_corpus(path, n, seed=0):
+    """JSONL reviews of mixed length built from the sample vocabulary"""
+    rng = np.random.default_rng(seed)
+    words = " ".join(SAMPLE_TEXTS).split()
+    with open(path, "w", encoding="utf-8") as f:
+        for i, length in enumerate(rng.integers(3, 80, n)):
+            text = " ".join(rng.choice(words, size=length))
+            f.write(json.dumps({"id": i, "text": text}) + "\n")
+
+
+def run_scorer(path, workers):
+    """Wall-clock seconds for score.py end to end, and its stderr report"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path[1:]))
+    env.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable,
+            os.path.join(ROOT, "score.py"),
+            path,
+            "--workers",
+            str(workers),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    cpus = usable_cpus()
+    counts = sorted({1 << i for i in range(cpus.bit_length())} | {cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reviews.jsonl")
+        write_corpus(path, args.records)
+
+        print("=" * 60)
+        print(f"{args.records:,} records, {cpus} usable cores")
+        print("=" * 60)
+        print(
+            f"{'workers':>8}{'seconds':>12}{'records/s':>14}"
+            f"{'speedup':>10}{'efficiency':>12}"
+        )
+        baseline = None
+        for workers in counts:
+            seconds, report = run_scorer(path, workers)
+            baseline = baseline or seconds
+            speedup = baseline / seconds
+            print(
+                f"{workers:>8}{seconds:>12.2f}{args.records / seconds:>14.0f}"
+                f"{speedup:>9.2f}x{speedup / workers:>11.0%}"
+            )
+            for line in report.splitlines():
+                if line.strip().startswith("worker"):
+                    print(f"{'':>8}{line.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Accuracy and latency of the TFLite variants against the Keras model on
+the test_model.py texts. Export the variants first:
+    python tflite_backend.py
+
+Run from the repository root:
+    python benchmarks/bench_tflite.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import clean_text, encode_cleaned, load_artifacts  # noqa: E402
+from tflite_backend import TFLITE_VARIANTS, TFLiteEngine, tflite_path  # noqa: E402
+
+ITERATIONS = 200
+TEST_TEXTS = [
+    "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
+    "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
+    "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+]
+
+
+def mean_latency_ms(engine, padded):
+    """Mean single-review latency, one text at a time"""
+    engine.predict(padded[:1])
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        engine.predict(padded[i % len(padded) : i % len(padded) + 1])
+    return (time.perf_counter() - start) * 1000 / ITERATIONS
+
+
+def main():
+    keras_engine, tokenizer, label_encoder = load_artifacts(backend="keras")
+    padded = encode_cleaned([clean_text(text) for text in TEST_TEXTS], tokenizer)
+    reference = keras_engine.predict(padded)
+    reference_labels = reference.argmax(axis=1)
+
+    print("=" * 72)
+    print(f"{'backend':<16}{'size MB':>9}{'latency ms':>12}{'max |diff|':>12}{'labels':>10}")
+    print("=" * 72)
+    print(f"{'keras':<16}{'':>9}{mean_latency_ms(keras_engine, padded):>12.3f}")
+
+    for variant in TFLITE_VARIANTS:
+        path = tflite_path(variant)
+        if not os.path.exists(path):
+            print(f"{'tflite ' + variant:<16} missing {path}")
+            continue
+        engine = TFLiteEngine(path)
+        outputs = engine.predict(padded)
+        matches = int((outputs.argmax(axis=1) == reference_labels).sum())
+        print(
+            f"{'tflite ' + variant:<16}"
+            f"{os.path.getsize(path) / 1e6:>9.2f}"
+            f"{mean_latency_ms(engine, padded):>12.3f}"
+            f"{np.abs(outputs - reference).max():>12.5f}"
+            f"{f'{matches}/{len(TEST_TEXTS)}':>10}"
+        )
+
+    print("\nKeras predictions:")
+    for text, probs in zip(TEST_TEXTS, reference):
+        label = label_encoder.classes_[probs.argmax()]
+        print(f"   {text[:50]}... → {label} ({probs.max() * 100:.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: re-scoring a corpus from text (clean, tokenize, forward pass)
+against re-scoring it from a token store entry (memory-mapped ids, forward
+pass only), with the time spent cleaning and tokenizing on its own.
+
+Run from the repository root:
+    python benchmarks/bench_token_store.py
+    python benchmarks/bench_token_store.py --records 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import (  # noqa: E402
+    clean_texts,
+    encode_cleaned,
+    load_artifacts,
+    predict_proba_batch,
+)
+from score import batched, encode_batches, predict_token_batches  # noqa: E402
+from token_store import TokenStore, tokenizer_fingerprint  # noqa: E402
+
+BATCH_SIZE = 256
+CHUNK_ROWS = 4096
+WORDS = (
+    "Mobil listrik SANGAT bagus!! hemat energi, harga terlalu mahal... "
+    "infrastruktur charging masih kurang https://contoh.id pemerintah insentif"
+).split()
+
+
+def make_corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(3, 160, n)
+    return [" ".join(rng.choice(WORDS, size=length)) for length in lengths]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def from_text(texts, model, tokenizer):
+    return np.concatenate(
+        [
+            predict_proba_batch(chunk, model, tokenizer, batch_size=BATCH_SIZE)[0]
+            for chunk in batched(texts, CHUNK_ROWS)
+        ]
+    )
+
+
+def preprocess_only(texts, tokenizer):
+    for chunk in batched(texts, CHUNK_ROWS):
+        encode_cleaned(clean_texts(chunk), tokenizer)
+
+
+def build_entry(store, texts, tokenizer):
+    fingerprint = tokenizer_fingerprint(tokenizer)
+    with store.writer("corpus", fingerprint) as writer:
+        batches = ((chunk, None) for chunk in batched(texts, CHUNK_ROWS))
+        for _ in encode_batches(batches, tokenizer, writer):
+            pass
+        writer.commit()
+    return store.entry_path("corpus", fingerprint), fingerprint
+
+
+def from_store(store, fingerprint, model):
+    ids, lengths, meta = store.open("corpus", fingerprint)
+    slices = (
+        (ids[start : start + CHUNK_ROWS], lengths[start : start + CHUNK_ROWS], None)
+        for start in range(0, meta["rows"], CHUNK_ROWS)
+    )
+    return np.concatenate(
+        [p for _, p in predict_token_batches(slices, model, BATCH_SIZE)]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    model, tokenizer, _ = load_artifacts()
+    texts = make_corpus(args.records)
+    # Warm up the tokenizer table and every traced shape
+    from_text(texts[:CHUNK_ROWS], model, tokenizer)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TokenStore(tmp)
+        preprocess_s, _ = timed(lambda: preprocess_only(texts, tokenizer))
+        build_s, (entry, fingerprint) = timed(
+            lambda: build_entry(store, texts, tokenizer)
+        )
+        text_s, expected = timed(lambda: from_text(texts, model, tokenizer))
+        store_s, actual = timed(lambda: from_store(store, fingerprint, model))
+        size = sum(
+            os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry)
+        )
+
+    diff = np.abs(expected - actual).max()
+    assert diff < 1e-5, f"Token store scores differ by {diff}"
+
+    print("=" * 60)
+    print(f"Re-scoring {args.records:,} records")
+    print("=" * 60)
+    print(f"{'path':<28}{'seconds':>10}{'records/s':>14}")
+    for name, seconds in (
+        ("clean + tokenize only", preprocess_s),
+        ("build token store entry", build_s),
+        ("from text", text_s),
+        ("from token store", store_s),
+    ):
+        print(f"{name:<28}{seconds:>10.2f}{args.records / seconds:>14.0f}")
+    print(f"\nSpeedup from the store: {text_s / store_s:.2f}x")
+    print(f"Entry size: {size / 1e6:.1f} MB ({size / args.records:.0f} bytes/row)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput of the vectorized tokenizer against the pickled Keras
+tokenizer's texts_to_sequences + pad_sequences, with an exact parity check.
+
+Run from the repository root:
+    python benchmarks/bench_tokenizer.py
+"""
+
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_tokenizer import FastTokenizer  # noqa: E402
+from inference import MAX_LEN, TOKENIZER_PATH, clean_text  # noqa: E402
+
+N_TEXTS = 50000
+SEED = 0
+TEST_TEXTS = [
+    "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
+    "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
+    "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+]
+
+
+def synthetic_reviews(tokenizer, n):
+    """Reviews of 5-60 words drawn from the vocabulary plus unknown words"""
+    rng = np.random.default_rng(SEED)
+    vocabulary = np.array(list(tokenizer.word_index) + ["xyzzy", "qwerty"])
+    lengths = rng.integers(5, 60, n)
+    return [" ".join(rng.choice(vocabulary, length)) for length in lengths] + [
+        clean_text(text) for text in TEST_TEXTS
+    ]
+
+
+def keras_encode(tokenizer, texts):
+    return pad_sequences(
+        tokenizer.texts_to_sequences(texts),
+        maxlen=MAX_LEN,
+        padding="post",
+        truncating="post",
+    )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    with open(TOKENIZER_PATH, "rb") as f:
+        tokenizer = pickle.load(f)
+    texts = synthetic_reviews(tokenizer, N_TEXTS)
+
+    encoder, build_seconds = timed(FastTokenizer.from_keras, tokenizer)
+    expected, keras_seconds = timed(keras_encode, tokenizer, texts)
+    encoded, fast_seconds = timed(encoder.encode, texts, MAX_LEN)
+
+    print("=" * 60)
+    print(f"{len(texts)} texts, vocabulary {len(tokenizer.word_index)}")
+    print(f"identical output: {np.array_equal(encoded, expected)}")
+    print("=" * 60)
+    print(f"build table:           {build_seconds * 1000:8.1f} ms")
+    print(f"keras tokenizer + pad: {keras_seconds * 1000:8.1f} ms")
+    print(f"vectorized encode:     {fast_seconds * 1000:8.1f} ms")
+    print(f"speedup:               {keras_seconds / fast_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: model.predict, the traced tf.function engine and the XLA-compiled
+engine at several batch sizes, with XLA compile time per shape.
+
+Run from the repository root:
+    python benchmarks/bench_xla.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import MAX_LEN, MODEL_PATH  # noqa: E402
+from keras_backend import (  # noqa: E402
+    InferenceEngine,
+    load_keras_model,
+    vocab_size,
+)
+
+BATCH_SIZES = (1, 8, 64, 256)
+ROWS_PER_RUN = 256
+
+
+def padded_batch(batch_size, vocab, seed=0):
+    """Token ids below vocab with random lengths, post-padded to MAX_LEN"""
+    rng = np.random.default_rng(seed)
+    inputs = rng.integers(1, vocab, (batch_size, MAX_LEN)).astype(np.int32)
+    lengths = rng.integers(3, MAX_LEN, batch_size)
+    inputs[np.arange(MAX_LEN)[None, :] >= lengths[:, None]] = 0
+    return inputs
+
+
+def ms_per_batch(predict, inputs, repeats=3):
+    """Best mean time of one batch, over enough calls to score ROWS_PER_RUN rows"""
+    calls = max(1, ROWS_PER_RUN // len(inputs))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            predict(inputs)
+        times.append((time.perf_counter() - start) / calls)
+    return min(times) * 1000
+
+
+def main():
+    model = load_keras_model(MODEL_PATH)
+    traced = InferenceEngine(model)
+    xla = InferenceEngine(model, jit_compile=True)
+    if not xla.jit_compile:
+        print("XLA compilation is not available for this model; see the log")
+        return
+
+    modes = {
+        "model.predict": lambda x: model.predict(x, batch_size=len(x), verbose=0),
+        "tf.function": lambda x: traced.predict(x, batch_size=len(x)),
+        "XLA": lambda x: xla.predict(x, batch_size=len(x)),
+    }
+
+    print("=" * 72)
+    print(
+        f"{'batch':>6}{'mode':>16}{'ms/batch':>12}{'rows/s':>12}"
+        f"{'vs tf.fn':>10}{'compile s':>12}"
+    )
+    print("=" * 72)
+    for batch_size in BATCH_SIZES:
+        inputs = padded_batch(batch_size, vocab_size(model))
+        reference = traced.predict(inputs)
+
+        # First XLA call for this shape compiles it
+        start = time.perf_counter()
+        diff = np.abs(xla.predict(inputs, batch_size=batch_size) - reference).max()
+        compile_seconds = time.perf_counter() - start
+        assert diff < 1e-4, f"XLA differs from the traced graph by {diff}"
+
+        times = {}
+        for name, predict in modes.items():
+            predict(inputs)
+            times[name] = ms_per_batch(predict, inputs)
+        for name, ms in times.items():
+            compile_col = f"{compile_seconds:>12.2f}" if name == "XLA" else ""
+            print(
+                f"{batch_size:>6}{name:>16}{ms:>12.3f}"
+                f"{batch_size / ms * 1000:>12.0f}"
+                f"{times['tf.function'] / ms:>9.2f}x{compile_col}"
+            )
+        print("-" * 72)
+
+    print(f"Compiled shapes: {xla.compiled_shapes()}")
+
+
+if __name__ == "__main__":
+    main()
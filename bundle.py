@@ -0,0 +1,242 @@
+"""
+Precompiled artifact bundle: one versioned directory with everything the
+loader needs, so starting a process parses no HDF5, rebuilds no Keras
+graph and unpickles nothing.
+
+Build it once after training (needs TensorFlow):
+    python bundle.py --output kaggle/working/model_outputs/bundle
+
+Then point the app, server and CLI at it:
+    export ARTIFACT_BUNDLE=kaggle/working/model_outputs/bundle
+
+Contents:
+    saved_model/   inference-only SavedModel (serving signature)
+    weights.npz    layer graph and weights for the NumPy backend
+    vocab.txt      one word per line, line i holding token id i + 1
+    labels.txt     label classes, one per line, in label encoder order
+    manifest.json  format, version, tokenizer settings and checksums
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+
+from fast_tokenizer import FastTokenizer
+
+BUNDLE_FORMAT = 1
+BUNDLE_PATH = "kaggle/working/model_outputs/bundle"
+MANIFEST_NAME = "manifest.json"
+SAVED_MODEL_DIR = "saved_model"
+WEIGHTS_NAME = "weights.npz"
+VOCAB_NAME = "vocab.txt"
+LABELS_NAME = "labels.txt"
+
+
+class LabelClasses:
+    """Stands in for the fitted LabelEncoder: just the ``classes_`` array"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices)]
+
+
+def file_checksum(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bundle_files(bundle_dir):
+    """Relative paths of every file in the bundle except the manifest"""
+    paths = []
+    for root, _, names in os.walk(bundle_dir):
+        for name in names:
+            path = os.path.relpath(os.path.join(root, name), bundle_dir)
+            if path != MANIFEST_NAME:
+                paths.append(path.replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def _write_lines(path, lines):
+    for line in lines:
+        if "\n" in line:
+            raise ValueError(f"Cannot store {line!r} in {os.path.basename(path)}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    return content.split("\n") if content else []
+
+
+def _vocabulary(tokenizer):
+    """Words ordered by token id; ids must run 1..V without gaps"""
+    words = sorted(tokenizer.word_index, key=tokenizer.word_index.get)
+    if [tokenizer.word_index[word] for word in words] != list(range(1, len(words) + 1)):
+        raise ValueError("Tokenizer word_index ids are not contiguous from 1")
+    # Words past num_words encode like unknown words, so they can be left out
+    if tokenizer.num_words:
+        words = words[: tokenizer.num_words - 1]
+    return words
+
+
+def build_bundle(output_dir, model_path, tokenizer_path, label_encoder_path):
+    """Write a bundle for the given .h5 model and pickles to output_dir"""
+    from inference import MAX_LEN
+    from keras_backend import load_keras_model
+    from numpy_backend import export_weights
+
+    with open(tokenizer_path, "rb") as f:
+        tokenizer = pickle.load(f)
+    with open(label_encoder_path, "rb") as f:
+        label_encoder = pickle.load(f)
+    model = load_keras_model(model_path)
+
+    # Build next to the destination and move it into place when complete
+    staging = f"{output_dir.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    saved_model_path = os.path.join(staging, SAVED_MODEL_DIR)
+    if hasattr(model, "export"):
+        model.export(saved_model_path, verbose=False)
+    else:
+        import tensorflow as tf
+
+        tf.saved_model.save(model, saved_model_path)
+    export_weights(model_path, os.path.join(staging, WEIGHTS_NAME))
+    _write_lines(os.path.join(staging, VOCAB_NAME), _vocabulary(tokenizer))
+    _write_lines(
+        os.path.join(staging, LABELS_NAME),
+        [str(label) for label in label_encoder.classes_],
+    )
+
+    checksums = {
+        path: file_checksum(os.path.join(staging, path))
+        for path in _bundle_files(staging)
+    }
+    version = hashlib.blake2b(
+        json.dumps(checksums, sort_keys=True).encode("utf-8"), digest_size=8
+    ).hexdigest()
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source_model": os.path.basename(model_path),
+        "max_len": MAX_LEN,
+        "tokenizer": {
+            "num_words": tokenizer.num_words,
+            "oov_token": tokenizer.oov_token,
+            "filters": tokenizer.filters,
+            "lower": tokenizer.lower,
+            "split": tokenizer.split,
+        },
+        "files": checksums,
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.replace(staging, output_dir)
+    return manifest
+
+
+def read_manifest(bundle_dir):
+    with open(os.path.join(bundle_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(
+            f"Unsupported bundle format {manifest.get('format')!r} in {bundle_dir}"
+        )
+    return manifest
+
+
+def verify_bundle(bundle_dir, manifest, paths=None):
+    """Check files against the manifest checksums, raising ValueError"""
+    for path in paths or manifest["files"]:
+        expected = manifest["files"].get(path)
+        full_path = os.path.join(bundle_dir, path)
+        if expected is None or not os.path.exists(full_path):
+            raise ValueError(f"Bundle file missing: {path}")
+        if file_checksum(full_path) != expected:
+            raise ValueError(f"Bundle checksum mismatch: {path}")
+
+
+def load_bundle(bundle_dir, backend="keras", tflite_model_path=None, verify=True):
+    """Load the engine, tokenizer and label classes from a bundle"""
+    manifest = read_manifest(bundle_dir)
+
+    # Only hash the files the chosen backend reads
+    if backend == "keras":
+        needed = [
+            path for path in manifest["files"] if path.startswith(SAVED_MODEL_DIR + "/")
+        ]
+    elif backend == "numpy":
+        needed = [WEIGHTS_NAME]
+    else:
+        needed = []
+    if verify:
+        verify_bundle(bundle_dir, manifest, needed + [VOCAB_NAME, LABELS_NAME])
+
+    # Load model
+    if backend == "keras":
+        from keras_backend import SavedModelEngine
+
+        engine = SavedModelEngine(os.path.join(bundle_dir, SAVED_MODEL_DIR))
+    elif backend == "numpy":
+        from numpy_backend import NumpyEngine
+
+        engine = NumpyEngine(os.path.join(bundle_dir, WEIGHTS_NAME))
+    elif backend == "tflite":
+        from tflite_backend import TFLiteEngine
+
+        engine = TFLiteEngine(tflite_model_path)
+    else:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    # Load tokenizer
+    words = _read_lines(os.path.join(bundle_dir, VOCAB_NAME))
+    tokenizer = FastTokenizer(
+        {word: index for index, word in enumerate(words, 1)}, **manifest["tokenizer"]
+    )
+
+    # Load label classes
+    label_encoder = LabelClasses(_read_lines(os.path.join(bundle_dir, LABELS_NAME)))
+
+    return engine, tokenizer, label_encoder
+
+
+def main(argv=None):
+    from inference import LABEL_ENCODER_PATH, MODEL_PATH, TOKENIZER_PATH
+
+    parser = argparse.ArgumentParser(description="Build the artifact bundle")
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--tokenizer-path", default=TOKENIZER_PATH)
+    parser.add_argument("--label-encoder-path", default=LABEL_ENCODER_PATH)
+    args = parser.parse_args(argv)
+
+    manifest = build_bundle(
+        args.output, args.model_path, args.tokenizer_path, args.label_encoder_path
+    )
+    print(f"✓ Bundle {manifest['version']} written to {args.output}")
+    for path in manifest["files"]:
+        size = os.path.getsize(os.path.join(args.output, path))
+        print(f"   {path:<56}{size / 1e6:>9.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
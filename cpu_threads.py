@@ -0,0 +1,308 @@
+"""
+CPU threading for the TensorFlow backends: intra-op and inter-op thread
+counts and oneDNN, from a profile file and environment variables, applied
+before TensorFlow starts. Several replicas on one host each get their own
+share of the cores instead of every process spawning one thread per core.
+
+Settings, later ones winning:
+    thread_profile.json (or the file named by THREAD_PROFILE)
+    TF_INTRA_OP_THREADS, TF_INTER_OP_THREADS, TF_ENABLE_ONEDNN_OPTS=0/1
+
+Find the best profile for this machine by running the real model under
+each candidate setting, with one process per replica running at once:
+    python cpu_threads.py --replicas 2 --output thread_profile.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+THREAD_PROFILE_PATH = os.environ.get("THREAD_PROFILE", "thread_profile.json")
+SETTING_KEYS = ("intra_op_threads", "inter_op_threads", "onednn")
+
+_applied = None
+
+
+def _env_int(name):
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else None
+
+
+def thread_settings(profile_path=THREAD_PROFILE_PATH):
+    """Thread settings from the profile file, overridden by the environment
+
+    Unset values are None and leave TensorFlow's defaults alone.
+    """
+    settings = dict.fromkeys(SETTING_KEYS)
+    if profile_path and os.path.exists(profile_path):
+        with open(profile_path, encoding="utf-8") as f:
+            profile = json.load(f)
+        settings.update((key, profile.get(key)) for key in SETTING_KEYS)
+
+    intra = _env_int("TF_INTRA_OP_THREADS")
+    inter = _env_int("TF_INTER_OP_THREADS")
+    onednn = os.environ.get("TF_ENABLE_ONEDNN_OPTS", "").strip()
+    if intra is not None:
+        settings["intra_op_threads"] = intra
+    if inter is not None:
+        settings["inter_op_threads"] = inter
+    if onednn:
+        settings["onednn"] = onednn == "1"
+    return settings
+
+
+def apply_environment(settings=None):
+    """Export the oneDNN switch; must run before TensorFlow is imported"""
+    if settings is None:
+        settings = thread_settings()
+    if settings["onednn"] is not None:
+        if "tensorflow" in sys.modules:
+            logger.warning("TensorFlow already imported; oneDNN setting ignored")
+        os.environ["TF_ENABLE_ONEDNN_OPTS"] = "1" if settings["onednn"] else "0"
+    return settings
+
+
+def configure_tensorflow(tf, settings=None):
+    """Set the thread pools; must run before TensorFlow executes any op"""
+    global _applied
+    if settings is None:
+        settings = thread_settings()
+    if _applied == settings:
+        return settings
+    try:
+        if settings["intra_op_threads"] is not None:
+            tf.config.threading.set_intra_op_parallelism_threads(
+                settings["intra_op_threads"]
+            )
+        if settings["inter_op_threads"] is not None:
+            tf.config.threading.set_inter_op_parallelism_threads(
+                settings["inter_op_threads"]
+            )
+    except RuntimeError:
+        logger.warning("TensorFlow already initialized; thread settings ignored")
+        return settings
+    _applied = settings
+    if any(value is not None for value in settings.values()):
+        logger.info(
+            "TensorFlow threads: intra-op %s, inter-op %s, oneDNN %s",
+            settings["intra_op_threads"],
+            settings["inter_op_threads"],
+            settings["onednn"],
+        )
+    return settings
+
+
+def _measure(batch_size, seconds, sample_path):
+    """Autotune worker: time the configured model and print one JSON line"""
+    # Settings arrive through the environment, so set oneDNN before TF loads
+    apply_environment()
+
+    import numpy as np
+
+    from inference import SMOKE_TEXTS, clean_texts, encode_cleaned, load_artifacts
+
+    if sample_path:
+        with open(sample_path, encoding="utf-8") as f:
+            texts = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        texts = list(SMOKE_TEXTS)
+    engine, tokenizer, _ = load_artifacts()
+    batch = encode_cleaned(
+        clean_texts([texts[i % len(texts)] for i in range(batch_size)]), tokenizer
+    )
+    engine.predict(batch, batch_size=batch_size)
+
+    # Wait for the other replicas so every measurement overlaps
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        engine.predict(batch, batch_size=batch_size)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    print(
+        json.dumps(
+            {
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+                "rows_per_s": batch_size * len(latencies) / latencies.sum() * 1000,
+            }
+        ),
+        flush=True,
+    )
+
+
+def usable_cpus():
+    """Cores this process may run on, which can be fewer than the host has"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def candidate_settings(replicas, cpu_count=None):
+    """Thread counts up to this replica's share of the cores, oneDNN on and off"""
+    share = max(1, (cpu_count or usable_cpus()) // replicas)
+    intra = sorted({1 << i for i in range(share.bit_length())} | {share})
+    return [
+        {"intra_op_threads": i, "inter_op_threads": j, "onednn": onednn}
+        for onednn in (True, False)
+        for i in intra
+        for j in (1, 2)
+    ]
+
+
+def run_candidate(settings, replicas, batch_size, seconds, sample_path):
+    """Run one process per replica under settings; None if any failed"""
+    env = dict(
+        os.environ,
+        THREAD_PROFILE="",
+        TF_INTRA_OP_THREADS=str(settings["intra_op_threads"]),
+        TF_INTER_OP_THREADS=str(settings["inter_op_threads"]),
+        TF_ENABLE_ONEDNN_OPTS="1" if settings["onednn"] else "0",
+    )
+    env.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--measure",
+        "--batch-size",
+        str(batch_size),
+        "--seconds",
+        str(seconds),
+    ]
+    if sample_path:
+        command += ["--sample", sample_path]
+
+    workers = [
+        subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=env,
+        )
+        for _ in range(replicas)
+    ]
+    try:
+        if not all(worker.stdout.readline().strip() == "ready" for worker in workers):
+            return None
+        for worker in workers:
+            worker.stdin.write("go\n")
+            worker.stdin.flush()
+        results = [json.loads(worker.stdout.readline()) for worker in workers]
+    except ValueError:
+        return None
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.kill()
+            worker.wait()
+
+    # The slowest replica sets the latency; throughput adds up
+    return {
+        "p50_ms": max(result["p50_ms"] for result in results),
+        "p95_ms": max(result["p95_ms"] for result in results),
+        "rows_per_s": sum(result["rows_per_s"] for result in results),
+    }
+
+
+def autotune(
+    replicas=1, batch_size=1, seconds=5.0, objective="latency", sample_path=None
+):
+    """Measure every candidate setting and return the best profile"""
+    candidates = candidate_settings(replicas)
+    print("=" * 72)
+    print(
+        f"{'intra':>6}{'inter':>6}{'oneDNN':>8}"
+        f"{'p50 ms':>12}{'p95 ms':>12}{'rows/s':>12}"
+    )
+    print("=" * 72)
+
+    measured = []
+    for settings in candidates:
+        result = run_candidate(settings, replicas, batch_size, seconds, sample_path)
+        label = (
+            f"{settings['intra_op_threads']:>6}{settings['inter_op_threads']:>6}"
+            f"{'on' if settings['onednn'] else 'off':>8}"
+        )
+        if result is None:
+            print(f"{label}  failed")
+            continue
+        print(
+            f"{label}{result['p50_ms']:>12.2f}{result['p95_ms']:>12.2f}"
+            f"{result['rows_per_s']:>12.0f}"
+        )
+        measured.append({**settings, **result})
+    if not measured:
+        raise RuntimeError("Every autotune candidate failed to run")
+
+    if objective == "throughput":
+        best = max(measured, key=lambda result: result["rows_per_s"])
+    else:
+        best = min(measured, key=lambda result: result["p95_ms"])
+    return {
+        **best,
+        "objective": objective,
+        "replicas": replicas,
+        "batch_size": batch_size,
+        "cpu_count": usable_cpus(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find the best TensorFlow thread settings for this machine"
+    )
+    parser.add_argument(
+        "--replicas", type=int, default=1, help="processes sharing this host"
+    )
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument(
+        "--seconds", type=float, default=5.0, help="measurement time per candidate"
+    )
+    parser.add_argument(
+        "--objective",
+        choices=("latency", "throughput"),
+        default="latency",
+        help="minimize p95 latency or maximize rows/s",
+    )
+    parser.add_argument("--sample", help="text file with one review per line")
+    parser.add_argument(
+        "--output", default=THREAD_PROFILE_PATH or "thread_profile.json"
+    )
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        _measure(args.batch_size, args.seconds, args.sample)
+        return
+
+    profile = autotune(
+        replicas=args.replicas,
+        batch_size=args.batch_size,
+        seconds=args.seconds,
+        objective=args.objective,
+        sample_path=args.sample,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    print(
+        f"\n✓ Best for {args.objective}: intra-op {profile['intra_op_threads']}, "
+        f"inter-op {profile['inter_op_threads']}, "
+        f"oneDNN {'on' if profile['onednn'] else 'off'} → {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
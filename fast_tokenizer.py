@@ -0,0 +1,194 @@
+"""
+Vectorized replacement for Keras ``Tokenizer.texts_to_sequences`` followed
+by ``pad_sequences(padding="post", truncating="post")``.
+"""
+
+import weakref
+from itertools import chain, repeat
+
+import numpy as np
+
+# Encoders compiled from tokenizer objects, rebuilt if the tokenizer goes away
+_ENCODERS = weakref.WeakKeyDictionary()
+
+# Row separators; the first one the tokenizer's filters leave alone is used
+_SEPARATORS = ("\x00", "\x1e", "\x1f", "\ue000")
+
+
+class FastTokenizer:
+    """Encode batches of texts into a padded int32 matrix in one pass
+
+    The Keras tokenizer's ``word_index``, ``num_words`` cut-off and OOV
+    token are folded into a single word -> id table when the encoder is
+    built. A batch is joined into one string with a separator token
+    between rows, lowercased, filtered and split with single C-level
+    calls, and looked up word by word in that table. Words the Keras
+    tokenizer would skip map to 0 and are dropped before post-truncation
+    to ``max_len``, exactly as ``texts_to_sequences`` does.
+    """
+
+    def __init__(
+        self,
+        word_index,
+        num_words=None,
+        oov_token=None,
+        filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n',
+        lower=True,
+        split=" ",
+    ):
+        self.word_index = word_index
+        self.num_words = num_words
+        self.oov_token = oov_token
+        oov_index = word_index.get(oov_token) if oov_token is not None else None
+        self.default = oov_index or 0
+        self.lower = lower
+        self.split = split
+        self.table = str.maketrans({char: split for char in filters})
+        self.separator = next(
+            sep for sep in _SEPARATORS if sep not in filters and sep != split
+        )
+
+        self.lookup = {
+            word: (oov_index or 0) if num_words and index >= num_words else index
+            for word, index in word_index.items()
+        }
+        # Empty strings come from repeated separators; Keras drops them
+        self.lookup[""] = 0
+        self.lookup[self.separator] = -1
+
+    @classmethod
+    def from_keras(cls, tokenizer):
+        if getattr(tokenizer, "char_level", False):
+            raise ValueError("Character-level tokenizers are not supported")
+        return cls(
+            tokenizer.word_index,
+            num_words=tokenizer.num_words,
+            oov_token=tokenizer.oov_token,
+            filters=tokenizer.filters,
+            lower=tokenizer.lower,
+            split=tokenizer.split,
+        )
+
+    def get_config(self):
+        """JSON-safe constructor arguments that rebuild an equal encoder
+
+        Words past ``num_words`` are left out: they encode as the OOV id,
+        which is also what unknown words get.
+        """
+        num_words = self.num_words
+        word_index = {
+            word: index
+            for word, index in self.word_index.items()
+            if not num_words or index < num_words or word == self.oov_token
+        }
+        filters = "".join(
+            chr(code)
+            for code, replacement in self.table.items()
+            if replacement == self.split
+        )
+        return {
+            "word_index": word_index,
+            "num_words": num_words,
+            "oov_token": self.oov_token,
+            "filters": filters,
+            "lower": self.lower,
+            "split": self.split,
+        }
+
+    def _ids(self, words, count):
+        return np.fromiter(
+            map(self.lookup.get, words, repeat(self.default)),
+            dtype=np.int32,
+            count=count,
+        )
+
+    def _flat_ids(self, texts):
+        """Token ids of the whole batch and the row each one came from"""
+        boundary = f"{self.split}{self.separator}{self.split}"
+        joined = boundary.join(texts)
+        if joined.count(self.separator) == len(texts) - 1:
+            if self.lower:
+                joined = joined.lower()
+            words = joined.translate(self.table).split(self.split)
+            ids = self._ids(words, len(words))
+            return ids, np.cumsum(ids == -1)
+
+        # Some text contains the separator itself: split row by row
+        if self.lower:
+            texts = map(str.lower, texts)
+        words = [text.translate(self.table).split(self.split) for text in texts]
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        ids = self._ids(chain.from_iterable(words), int(lengths.sum()))
+        ids[ids == -1] = self.default
+        return ids, np.repeat(np.arange(len(words)), lengths)
+
+    def _positions(self, texts):
+        """Kept token ids, their row, their position in it, and row counts"""
+        ids, rows = self._flat_ids(texts)
+        kept = ids > 0
+        ids, rows = ids[kept], rows[kept]
+
+        # Position of every kept id within its row
+        counts = np.bincount(rows, minlength=len(texts))
+        positions = np.arange(len(ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return ids, rows, positions, counts
+
+    def encode(self, texts, max_len, out=None):
+        """Return an (N, max_len) int32 matrix of post-padded token ids
+
+        ``out`` may be a preallocated int32 array to write into.
+        """
+        if out is None:
+            out = np.zeros((len(texts), max_len), dtype=np.int32)
+        else:
+            out[:] = 0
+        if not len(texts):
+            return out
+
+        ids, rows, positions, _ = self._positions(texts)
+
+        # Post-truncation: keep the first max_len ids of each row
+        fits = positions < max_len
+        out[rows[fits], positions[fits]] = ids[fits]
+        return out
+
+    def encode_windows(self, texts, max_len, stride):
+        """Cut every text into overlapping windows of up to max_len ids
+
+        Window j of a text starts at token j * stride; a text gets as many
+        windows as it takes to reach its last token, and at least one.
+        Returns the (W, max_len) int32 matrix of post-padded windows of all
+        texts, in order, and the number of windows of each text. A text
+        that fits in max_len gets exactly the row ``encode`` gives it.
+        """
+        if not 0 < stride <= max_len:
+            raise ValueError("stride must be between 1 and max_len")
+        counts = np.zeros(len(texts), dtype=np.int64)
+        if len(texts):
+            ids, rows, positions, counts = self._positions(texts)
+        windows = 1 + np.maximum(0, -(-(counts - max_len) // stride))
+        first = np.cumsum(windows) - windows
+        out = np.zeros((int(windows.sum()), max_len), dtype=np.int32)
+        if not len(texts):
+            return out, windows
+
+        # An id sits in up to ceil(max_len / stride) consecutive windows;
+        # place it in each, latest first
+        window = positions // stride
+        for _ in range(-(-max_len // stride)):
+            offset = positions - window * stride
+            fits = (window >= 0) & (window < windows[rows]) & (offset < max_len)
+            out[first[rows[fits]] + window[fits], offset[fits]] = ids[fits]
+            window = window - 1
+        return out, windows
+
+
+def fast_tokenizer(tokenizer):
+    """FastTokenizer compiled from a Keras tokenizer, built once per object"""
+    if isinstance(tokenizer, FastTokenizer):
+        return tokenizer
+    encoder = _ENCODERS.get(tokenizer)
+    if encoder is None:
+        encoder = FastTokenizer.from_keras(tokenizer)
+        _ENCODERS[tokenizer] = encoder
+    return encoder
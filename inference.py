@@ -0,0 +1,342 @@
+"""
+Model pipeline shared by the Streamlit app and the headless tools:
+artifact loading, text cleaning, padding and label decoding. TensorFlow
+is only imported by the backend modules, when one that needs it is chosen.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from fast_tokenizer import fast_tokenizer
+from normalization import clean_text, clean_texts
+from translations import translate_sentiment
+
+# Constants
+MAX_LEN = 128
+MODEL_PATH = "kaggle/working/model_outputs/CNN + BiLSTM_best.h5"
+TOKENIZER_PATH = "kaggle/working/model_outputs/tokenizer.pkl"
+LABEL_ENCODER_PATH = "kaggle/working/model_outputs/label_encoder.pkl"
+# "keras" (default), "tflite" or "numpy"; see tflite_backend.py and
+# numpy_backend.py for the export steps
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "keras")
+TFLITE_MODEL_PATH = os.environ.get(
+    "TFLITE_MODEL_PATH", "kaggle/working/model_outputs/model_float16.tflite"
+)
+NUMPY_WEIGHTS_PATH = os.environ.get(
+    "NUMPY_WEIGHTS_PATH", "kaggle/working/model_outputs/model_weights.npz"
+)
+# Precompiled bundle directory (see bundle.py); replaces the paths above
+ARTIFACT_BUNDLE_PATH = os.environ.get("ARTIFACT_BUNDLE")
+# Opt-in length bucketing, e.g. LENGTH_BUCKETS=16,32,64,128
+LENGTH_BUCKETS = tuple(
+    int(size) for size in os.environ.get("LENGTH_BUCKETS", "").split(",") if size
+)
+
+# Long-document mode: tokens between the starts of consecutive windows, and
+# how window probabilities are combined per document
+WINDOW_STRIDE = int(os.environ.get("WINDOW_STRIDE", MAX_LEN // 2))
+WINDOW_AGGREGATES = ("mean", "length")
+
+# Opt-in XLA compilation of the Keras forward pass, JIT_COMPILE=1
+JIT_COMPILE = os.environ.get("JIT_COMPILE", "0") == "1"
+
+# Largest probability change bucketing may introduce before it is turned off
+LENGTH_BUCKET_ATOL = float(os.environ.get("LENGTH_BUCKET_ATOL", "1e-4"))
+# How often to check the artifact files for a new version; 0 disables
+ARTIFACT_WATCH_SECONDS = float(os.environ.get("ARTIFACT_WATCH_SECONDS", "10"))
+# Optional JSON list of {"text": ..., "label": ...} a new model must agree with
+GOLDEN_INPUTS_PATH = os.environ.get("GOLDEN_INPUTS_PATH")
+GOLDEN_MIN_AGREEMENT = float(os.environ.get("GOLDEN_MIN_AGREEMENT", "1.0"))
+# Scored by every new model when no golden file is configured
+SMOKE_TEXTS = (
+    "Produk ini sangat bagus, saya puas!",
+    "Biasa saja, tidak ada yang istimewa.",
+    "Pelayanan buruk sekali dan sangat lambat.",
+    "",
+)
+
+
+def load_artifacts(
+    model_path=MODEL_PATH,
+    tokenizer_path=TOKENIZER_PATH,
+    label_encoder_path=LABEL_ENCODER_PATH,
+    length_buckets=LENGTH_BUCKETS,
+    jit_compile=JIT_COMPILE,
+    backend=INFERENCE_BACKEND,
+    tflite_model_path=TFLITE_MODEL_PATH,
+    numpy_weights_path=NUMPY_WEIGHTS_PATH,
+    bundle_path=ARTIFACT_BUNDLE_PATH,
+):
+    """Load the model as an inference engine, the tokenizer, and label encoder"""
+    if bundle_path:
+        from bundle import load_bundle
+
+        return load_bundle(bundle_path, backend, tflite_model_path=tflite_model_path)
+
+    # Load model
+    if backend == "tflite":
+        from tflite_backend import TFLiteEngine
+
+        engine = TFLiteEngine(tflite_model_path)
+    elif backend == "numpy":
+        from numpy_backend import NumpyEngine
+
+        engine = NumpyEngine(numpy_weights_path)
+    elif backend == "keras":
+        from keras_backend import InferenceEngine, load_keras_model
+
+        engine = InferenceEngine(
+            load_keras_model(model_path),
+            length_buckets=length_buckets,
+            jit_compile=jit_compile,
+        )
+    else:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    # Load tokenizer
+    with open(tokenizer_path, "rb") as f:
+        tokenizer = pickle.load(f)
+
+    # Load label encoder
+    with open(label_encoder_path, "rb") as f:
+        label_encoder = pickle.load(f)
+
+    return engine, tokenizer, label_encoder
+
+
+def artifact_paths():
+    """Files that identify the artifacts the configured backend loads"""
+    if ARTIFACT_BUNDLE_PATH:
+        # The manifest carries the checksums of every bundled file
+        paths = [os.path.join(ARTIFACT_BUNDLE_PATH, "manifest.json")]
+        if INFERENCE_BACKEND == "tflite":
+            paths.append(TFLITE_MODEL_PATH)
+        return paths
+
+    model_path = {
+        "tflite": TFLITE_MODEL_PATH,
+        "numpy": NUMPY_WEIGHTS_PATH,
+    }.get(INFERENCE_BACKEND, MODEL_PATH)
+    return [model_path, TOKENIZER_PATH, LABEL_ENCODER_PATH]
+
+
+def artifact_signature(paths=None):
+    """Size and mtime of each artifact file, or None if any is missing
+
+    Cheap enough to poll; a change means the files should be hashed and
+    loaded again.
+    """
+    signature = []
+    for path in paths or artifact_paths():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def fingerprint_artifacts(paths=None):
+    """Content hash identifying one set of model artifacts"""
+    if paths is None:
+        paths = artifact_paths()
+
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def preprocess_text(text, tokenizer):
+    """Preprocess text for model prediction"""
+    # Clean text
+    cleaned = clean_text(text)
+
+    # Tokenize and pad
+    padded = encode_cleaned([cleaned], tokenizer)
+
+    return padded, cleaned
+
+
+def preprocess_batch(texts, tokenizer):
+    """Preprocess a list of texts for model prediction in one pass"""
+    # Clean texts
+    cleaned = clean_texts(texts)
+
+    return encode_cleaned(cleaned, tokenizer), cleaned
+
+
+def encode_cleaned(cleaned_texts, tokenizer):
+    """Tokenize and pad texts that have already been through clean_text"""
+    # Same ids as texts_to_sequences + pad_sequences (post/post), vectorized
+    return fast_tokenizer(tokenizer).encode(cleaned_texts, MAX_LEN)
+
+
+def predict_proba_batch(texts, model, tokenizer, batch_size=256):
+    """Return the (N, n_classes) probability matrix and cleaned texts"""
+    # Clean everything at once
+    cleaned_texts = clean_texts(texts)
+
+    return predict_cleaned(cleaned_texts, model, tokenizer, batch_size), cleaned_texts
+
+
+def predict_cleaned(cleaned_texts, model, tokenizer, batch_size=256):
+    """Return the probability matrix for texts already through clean_text"""
+    processed_texts = encode_cleaned(cleaned_texts, tokenizer)
+
+    return model.predict(processed_texts, batch_size=batch_size)
+
+
+def encode_windows_cleaned(cleaned_texts, tokenizer, stride=WINDOW_STRIDE):
+    """Overlapping MAX_LEN windows of cleaned texts and the count per text"""
+    return fast_tokenizer(tokenizer).encode_windows(cleaned_texts, MAX_LEN, stride)
+
+
+def predict_windows(
+    texts, model, tokenizer, aggregate="mean", stride=WINDOW_STRIDE, batch_size=256
+):
+    """Score texts of any length by sliding MAX_LEN windows over them
+
+    All windows of all texts go through the model in one batched call.
+    Window probabilities are averaged per text, either equally ("mean")
+    or weighted by the tokens in each window ("length"). A text that fits
+    in MAX_LEN is one window, the same input predict_proba_batch builds.
+
+    Returns the (N, n_classes) probability matrix, the number of windows
+    of each text, and the cleaned texts.
+    """
+    if aggregate not in WINDOW_AGGREGATES:
+        raise ValueError(f"Unknown window aggregate: {aggregate}")
+    cleaned_texts = clean_texts(texts)
+    windows, counts = encode_windows_cleaned(cleaned_texts, tokenizer, stride)
+    outputs = np.asarray(model.predict(windows, batch_size=batch_size), np.float32)
+    if not len(texts):
+        return outputs, counts, cleaned_texts
+
+    if aggregate == "length":
+        # Empty windows still count, so empty texts keep their prediction
+        weights = np.maximum(np.count_nonzero(windows, axis=1), 1)
+    else:
+        weights = np.ones(len(windows))
+    starts = np.cumsum(counts) - counts
+    totals = np.add.reduceat(outputs * weights[:, None], starts)
+    predictions = totals / np.add.reduceat(weights, starts)[:, None]
+    return predictions.astype(np.float32), counts, cleaned_texts
+
+
+def warm_up(model, tokenizer, batch_sizes=(1,)):
+    """Run every input shape the model will be called with once
+
+    Traces each length bucket (or the single full-length shape) at each
+    batch size, and builds the tokenizer's lookup table, so the first real
+    request does not pay for graph tracing, XLA compilation or table
+    construction.
+    """
+    encode_cleaned(["warm up"], tokenizer)
+
+    max_len = getattr(model, "max_len", MAX_LEN)
+    lengths = getattr(model, "length_buckets", None) or [max_len]
+    for batch_size in batch_sizes:
+        for length in lengths:
+            # Rows with exactly `length` tokens land in that bucket
+            inputs = np.zeros((batch_size, max_len), dtype=np.int32)
+            inputs[:, :length] = 1
+            model.predict(inputs, batch_size=batch_size)
+
+
+def load_golden_inputs(path=GOLDEN_INPUTS_PATH):
+    """Golden {"text", "label"} records from a JSON file, or [] without one"""
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def validate_artifacts(
+    model, tokenizer, label_encoder, golden=None, min_agreement=GOLDEN_MIN_AGREEMENT
+):
+    """Check a freshly loaded model on golden inputs, raising ValueError
+
+    The outputs must be one finite probability row per text with one
+    column per label class. Records that carry a ``label`` must be
+    predicted as that label at least ``min_agreement`` of the time.
+    """
+    if golden is None:
+        golden = load_golden_inputs()
+    texts = [str(record["text"]) for record in golden] or list(SMOKE_TEXTS)
+
+    predictions, _ = predict_proba_batch(texts, model, tokenizer)
+    predictions = np.asarray(predictions)
+    classes = [str(label) for label in label_encoder.classes_]
+    if predictions.shape != (len(texts), len(classes)):
+        raise ValueError(
+            f"Model output shape {predictions.shape} does not match "
+            f"{len(texts)} inputs and {len(classes)} label classes"
+        )
+    if not np.all(np.isfinite(predictions)):
+        raise ValueError("Model produced non-finite probabilities")
+    if not np.allclose(predictions.sum(axis=1), 1.0, atol=1e-3):
+        raise ValueError("Model probabilities do not sum to 1")
+
+    expected = {
+        i: str(record["label"]) for i, record in enumerate(golden) if "label" in record
+    }
+    if expected:
+        unknown = set(expected.values()) - set(classes)
+        if unknown:
+            raise ValueError(f"Golden labels not in label encoder: {sorted(unknown)}")
+        predicted = np.argmax(predictions, axis=1)
+        agreement = np.mean(
+            [classes[predicted[i]] == label for i, label in expected.items()]
+        )
+        if agreement < min_agreement:
+            raise ValueError(
+                f"Golden agreement {agreement:.1%} is below {min_agreement:.1%}"
+            )
+    return predictions
+
+
+def format_predictions(predictions, label_encoder):
+    """Decode a probability matrix into one result dict per row"""
+    classes = [str(label) for label in label_encoder.classes_]
+    predicted_idx = np.argmax(predictions, axis=1)
+
+    return [
+        {
+            "sentiment": classes[idx],
+            "confidence": probs[idx],
+            "probabilities": dict(zip(classes, probs)),
+        }
+        for probs, idx in zip(np.asarray(predictions).tolist(), predicted_idx.tolist())
+    ]
+
+
+def decode_predictions(predictions, label_encoder, language="en"):
+    """Decode a (N, n_classes) probability matrix into labels and confidences"""
+    predictions = np.asarray(predictions)
+    predicted_idx = np.argmax(predictions, axis=1)
+    confidences = predictions[np.arange(len(predictions)), predicted_idx]
+
+    # Translate each class once instead of once per row
+    class_names = [
+        translate_sentiment(label, language) for label in label_encoder.classes_
+    ]
+    sentiments = [class_names[i] for i in predicted_idx]
+
+    return sentiments, confidences, class_names
+
+
+def __getattr__(name):
+    # TensorFlow-backed names moved to keras_backend; import it on first use
+    if name in ("AttentionLayer", "InferenceEngine", "variable_length_model"):
+        import keras_backend
+
+        return getattr(keras_backend, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
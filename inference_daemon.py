@@ -0,0 +1,487 @@
+"""
+Local inference daemon: one process on the host owns the model and serves
+every Streamlit replica over a Unix domain socket, so N replicas hold one
+copy of the model and their requests share batches.
+
+Front ends tokenize locally and send padded int32 token ids; the daemon
+answers with float32 probabilities. Both travel as raw little-endian
+buffers behind a small fixed header, with no pickling. The tokenizer and
+label classes a front end needs are fetched from the daemon as JSON, so
+they always match the model version that scores the ids.
+
+Start the daemon, then point the app at it:
+    python inference_daemon.py --socket /run/sentiment/inference.sock
+    INFERENCE_SOCKET=/run/sentiment/inference.sock streamlit run app.py
+
+Protocol, per request on a persistent connection:
+    request   op (u8), fingerprint (16 bytes), rows (u32), cols (u32),
+              then rows * cols int32 for OP_PREDICT
+    response  status (u8), length (u32), then length bytes: float32 rows
+              for OP_PREDICT, UTF-8 JSON for OP_STATUS and OP_SPEC, or an
+              error message
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from batching import MicroBatcher
+from bundle import LabelClasses
+from fast_tokenizer import FastTokenizer, fast_tokenizer
+from inference import (
+    ARTIFACT_WATCH_SECONDS,
+    MAX_LEN,
+    artifact_signature,
+    fingerprint_artifacts,
+    load_artifacts,
+    validate_artifacts,
+    warm_up,
+)
+from model_loader import ModelLoader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = os.environ.get(
+    "INFERENCE_SOCKET", "/tmp/sentiment-inference.sock"
+)
+DAEMON_MAX_BATCH_SIZE = int(os.environ.get("DAEMON_MAX_BATCH_SIZE", "64"))
+DAEMON_MAX_WAIT_MS = float(os.environ.get("DAEMON_MAX_WAIT_MS", "5"))
+# Largest request accepted, and the size clients split bigger batches into
+MAX_REQUEST_ROWS = 4096
+# Rows per forward pass when one request alone exceeds max_batch_size
+FORWARD_BATCH_SIZE = 256
+
+OP_STATUS = 1
+OP_SPEC = 2
+OP_PREDICT = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_NOT_READY = 2
+STATUS_STALE = 3
+
+REQUEST = struct.Struct("<B16sII")
+RESPONSE = struct.Struct("<BI")
+NO_FINGERPRINT = bytes(16)
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error"""
+
+
+class StaleModelError(DaemonError):
+    """The model version a client was bound to is no longer served"""
+
+
+def _recv_into(sock, view):
+    """Fill a writable buffer from the socket, or raise ConnectionError"""
+    view = memoryview(view).cast("B")
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise ConnectionError("Connection closed mid-message")
+        view = view[received:]
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray(size)
+    _recv_into(sock, buffer)
+    return buffer
+
+
+def _send(sock, status, body=b""):
+    sock.sendall(RESPONSE.pack(status, memoryview(body).nbytes))
+    if memoryview(body).nbytes:
+        sock.sendall(body)
+
+
+def _fingerprint_bytes(fingerprint):
+    return bytes.fromhex(fingerprint) if fingerprint else NO_FINGERPRINT
+
+
+class InferenceDaemon:
+    """Loads, validates, warms and hot-reloads the model, and batches requests
+
+    Requests name the model version they were tokenized for. The current
+    and the previous version are kept, each with its own MicroBatcher, so
+    front ends still on the old vocabulary finish on the old model after a
+    hot reload; anything older is answered with STATUS_STALE.
+    """
+
+    def __init__(
+        self, max_batch_size=DAEMON_MAX_BATCH_SIZE, max_wait_ms=DAEMON_MAX_WAIT_MS
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.loader = ModelLoader(
+            load_artifacts,
+            warm_up_fn=lambda model, tokenizer, _: warm_up(
+                model, tokenizer, batch_sizes=(1, max_batch_size)
+            ),
+            validate_fn=validate_artifacts,
+            fingerprint_fn=fingerprint_artifacts,
+        )
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def start(self, watch_seconds=ARTIFACT_WATCH_SECONDS):
+        self.loader.start()
+        if watch_seconds > 0:
+            self.loader.watch(artifact_signature, interval=watch_seconds)
+        return self
+
+    def _version(self, fingerprint=None):
+        """(artifacts, fingerprint, batcher) for a served version, or None"""
+        artifacts, current = self.loader.snapshot()
+        if fingerprint is None:
+            fingerprint = current
+        retired = []
+        with self._lock:
+            version = self._versions.get(fingerprint)
+            if version is None and artifacts is not None and fingerprint == current:
+                model = artifacts[0]
+                batcher = MicroBatcher(
+                    lambda batch: model.predict(
+                        batch, batch_size=max(self.max_batch_size, FORWARD_BATCH_SIZE)
+                    ),
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_wait_ms,
+                )
+                version = (artifacts, fingerprint, batcher)
+                self._versions[fingerprint] = version
+                while len(self._versions) > 2:
+                    retired.append(self._versions.pop(next(iter(self._versions))))
+        # Closing serves what is already queued, so do it outside the lock
+        for _, old, batcher in retired:
+            logger.info("Retiring model %s", old)
+            batcher.close()
+        return version
+
+    def status(self):
+        return self.loader.status()
+
+    def max_len(self):
+        """Row length the served model takes"""
+        artifacts = self.loader.artifacts
+        return getattr(artifacts[0], "max_len", MAX_LEN) if artifacts else MAX_LEN
+
+    def spec(self):
+        """What a front end needs to tokenize for, and decode, the current model"""
+        version = self._version()
+        if version is None:
+            return None
+        (model, tokenizer, label_encoder), fingerprint, _ = version
+        return {
+            "fingerprint": fingerprint,
+            "max_len": getattr(model, "max_len", MAX_LEN),
+            "classes": [str(label) for label in label_encoder.classes_],
+            "tokenizer": fast_tokenizer(tokenizer).get_config(),
+        }
+
+    def predict(self, inputs, fingerprint):
+        """Probabilities for token ids encoded for model version fingerprint"""
+        version = self._version(fingerprint)
+        if version is None:
+            raise StaleModelError(f"Model {fingerprint} is no longer served")
+        try:
+            future = version[2].submit(inputs)
+        except RuntimeError as e:
+            # Retired between the lookup and the submit
+            raise StaleModelError(str(e)) from e
+        return future.result()
+
+    def stop(self):
+        self.loader.stop()
+        with self._lock:
+            versions, self._versions = list(self._versions.values()), {}
+        for _, _, batcher in versions:
+            batcher.close()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                header = _recv_exact(self.request, REQUEST.size)
+            except ConnectionError:
+                return
+            op, fingerprint, rows, cols = REQUEST.unpack(header)
+            if not self._dispatch(op, fingerprint, rows, cols):
+                return
+
+    def _dispatch(self, op, fingerprint, rows, cols):
+        """Answer one request; False to drop a connection that is out of sync"""
+        daemon = self.server.daemon
+        sock = self.request
+
+        if op == OP_STATUS:
+            _send(sock, STATUS_OK, json.dumps(daemon.status()).encode("utf-8"))
+            return True
+
+        if op == OP_SPEC:
+            spec = daemon.spec()
+            if spec is None:
+                _send(sock, STATUS_NOT_READY, b"Model is not loaded yet")
+            else:
+                _send(sock, STATUS_OK, json.dumps(spec).encode("utf-8"))
+            return True
+
+        if op != OP_PREDICT:
+            _send(sock, STATUS_ERROR, f"Unknown op {op}".encode("utf-8"))
+            return False
+        max_len = daemon.max_len()
+        if rows * cols > MAX_REQUEST_ROWS * max_len:
+            # Too big to read; the stream cannot be resynchronized
+            _send(sock, STATUS_ERROR, b"Request too large")
+            return False
+
+        inputs = np.empty((rows, cols), dtype="<i4")
+        _recv_into(sock, inputs)
+        if rows > MAX_REQUEST_ROWS or cols != max_len:
+            message = (
+                f"Expected at most {MAX_REQUEST_ROWS} rows of {max_len} ids, "
+                f"got {rows}x{cols}"
+            )
+            _send(sock, STATUS_ERROR, message.encode("utf-8"))
+            return True
+        if fingerprint == NO_FINGERPRINT:
+            fingerprint = None
+        else:
+            fingerprint = fingerprint.hex()
+        try:
+            outputs = daemon.predict(inputs, fingerprint)
+        except StaleModelError as e:
+            _send(sock, STATUS_STALE, str(e).encode("utf-8"))
+            return True
+        except Exception as e:
+            logger.exception("Prediction failed")
+            _send(sock, STATUS_ERROR, str(e).encode("utf-8"))
+            return True
+        _send(sock, STATUS_OK, np.ascontiguousarray(outputs, dtype="<f4"))
+        return True
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    # Every session thread of every replica opens its own connection
+    request_queue_size = 128
+
+
+def serve(path=DEFAULT_SOCKET_PATH, daemon=None, ready=None):
+    """Serve an InferenceDaemon on a Unix socket until interrupted"""
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"An inference daemon is already serving {path}")
+        finally:
+            probe.close()
+
+    daemon = daemon or InferenceDaemon().start()
+    # Owner and group only: anyone who can connect can use the model
+    umask = os.umask(0o117)
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(umask)
+    server.daemon = daemon
+    logger.info("Inference daemon listening on %s", path)
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        daemon.stop()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class DaemonEngine:
+    """Stands in for the model in a front end: predict() goes to the daemon
+
+    Bound to the model version whose tokenizer encoded the inputs, which
+    it reports as ``fingerprint``.
+    """
+
+    def __init__(self, client, fingerprint, max_len, n_classes):
+        self.client = client
+        self.fingerprint = fingerprint
+        self.max_len = max_len
+        self.n_classes = n_classes
+        self._fingerprint_bytes = _fingerprint_bytes(fingerprint)
+
+    def predict(self, inputs, batch_size=None):
+        inputs = np.ascontiguousarray(inputs, dtype="<i4")
+        if not len(inputs):
+            return np.empty((0, self.n_classes), dtype=np.float32)
+        if inputs.shape[1] != self.max_len:
+            raise ValueError(
+                f"Expected {self.max_len} token ids per row, got {inputs.shape[1]}"
+            )
+        # The daemon does its own batching; only its size limit matters here
+        parts = [
+            self.client.predict(
+                inputs[start : start + MAX_REQUEST_ROWS], self._fingerprint_bytes
+            )
+            for start in range(0, len(inputs), MAX_REQUEST_ROWS)
+        ]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+class DaemonClient:
+    """Connection to an inference daemon, one socket per calling thread"""
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _request(self, op, fingerprint=NO_FINGERPRINT, inputs=None):
+        """Send one request and return (status, socket) with the body unread"""
+        rows, cols = inputs.shape if inputs is not None else (0, 0)
+        header = REQUEST.pack(op, fingerprint, rows, cols)
+        # A kept-alive socket may have been closed by a restarted daemon;
+        # retry once on a fresh one
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            fresh = sock is None
+            if fresh:
+                sock = self._local.sock = self._connect()
+            try:
+                sock.sendall(header)
+                if inputs is not None and inputs.size:
+                    sock.sendall(inputs)
+                status, length = RESPONSE.unpack(_recv_exact(sock, RESPONSE.size))
+                return status, length, sock
+            except (ConnectionError, BrokenPipeError, socket.timeout):
+                self.close()
+                if fresh or attempt:
+                    raise
+
+    def _read(self, sock, buffer):
+        """Read a response body, dropping the connection if it breaks off"""
+        try:
+            _recv_into(sock, buffer)
+        except OSError:
+            self.close()
+            raise
+        return buffer
+
+    def _call(self, op):
+        status, length, sock = self._request(op)
+        body = self._read(sock, bytearray(length)).decode("utf-8")
+        if status == STATUS_NOT_READY:
+            return None
+        if status != STATUS_OK:
+            raise DaemonError(body)
+        return json.loads(body)
+
+    def status(self):
+        """The daemon's ModelLoader status"""
+        return self._call(OP_STATUS)
+
+    def current_fingerprint(self):
+        """Fingerprint of the model being served, or None if there is none
+
+        Cheap enough to poll, and None while the daemon is unreachable, so
+        it can be handed to ModelLoader.watch.
+        """
+        try:
+            return self.status()["fingerprint"]
+        except (OSError, DaemonError):
+            return None
+
+    def wait_ready(self, timeout=300.0, interval=0.5):
+        """Block until the daemon serves a model; return its fingerprint"""
+        deadline = time.monotonic() + timeout
+        error = None
+        while True:
+            try:
+                status = self.status()
+                if status["fingerprint"] is not None:
+                    return status["fingerprint"]
+                if status["state"] == "failed":
+                    raise DaemonError(f"Daemon failed to load: {status['error']}")
+            except OSError as e:
+                error = e
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No model served on {self.path} after {timeout:.0f}s"
+                    + (f" ({error})" if error else "")
+                )
+            time.sleep(interval)
+
+    def load_artifacts(self):
+        """(engine, tokenizer, label classes) for the model the daemon serves"""
+        self.wait_ready()
+        spec = self._call(OP_SPEC)
+        if spec is None:
+            raise DaemonError("Daemon has no model loaded")
+        engine = DaemonEngine(
+            self, spec["fingerprint"], spec["max_len"], len(spec["classes"])
+        )
+        tokenizer = FastTokenizer(**spec["tokenizer"])
+        return engine, tokenizer, LabelClasses(spec["classes"])
+
+    def predict(self, inputs, fingerprint=NO_FINGERPRINT):
+        """Float32 probabilities for one int32 request of token ids"""
+        status, length, sock = self._request(OP_PREDICT, fingerprint, inputs)
+        if status != STATUS_OK:
+            message = self._read(sock, bytearray(length)).decode("utf-8")
+            raise (StaleModelError if status == STATUS_STALE else DaemonError)(
+                message
+            )
+        cols = length // 4 // len(inputs) if len(inputs) else 0
+        return self._read(sock, np.empty((len(inputs), cols), dtype="<f4"))
+
+    def close(self):
+        """Close this thread's connection"""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.sock = None
+            sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve the sentiment model to local front ends over a Unix socket"
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    # serve_forever only returns through an exception; make SIGTERM one
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve(args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
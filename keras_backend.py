@@ -0,0 +1,340 @@
+"""
+Keras/TensorFlow backend: the custom AttentionLayer and a traced
+inference engine around the saved .h5 model. Only imported when the
+"keras" backend is selected, so other backends never load TensorFlow.
+"""
+
+import logging
+
+import numpy as np
+
+import cpu_threads
+
+# Thread pools and oneDNN have to be configured before TensorFlow starts
+THREAD_SETTINGS = cpu_threads.apply_environment()
+
+import tensorflow as tf  # noqa: E402
+
+from inference import LENGTH_BUCKET_ATOL, MAX_LEN  # noqa: E402
+
+cpu_threads.configure_tensorflow(tf, THREAD_SETTINGS)
+
+logger = logging.getLogger(__name__)
+
+
+def load_keras_model(model_path):
+    return tf.keras.models.load_model(
+        model_path, custom_objects={"AttentionLayer": AttentionLayer}
+    )
+
+
+def vocab_size(model):
+    """Number of token ids the model's Embedding layer accepts"""
+    embedding = next(
+        layer for layer in model.layers if isinstance(layer, tf.keras.layers.Embedding)
+    )
+    return embedding.input_dim
+
+
+class InferenceEngine:
+    """Low-overhead forward pass for a loaded Keras model
+
+    ``model.predict`` builds a data adapter and runs its step loop on every
+    call, which costs milliseconds before any math for a single review.
+    The engine traces the model once into a ``tf.function`` with a fixed
+    ``(None, max_len)`` int32 signature and calls it directly.
+
+    With ``length_buckets`` (e.g. ``(16, 32, 64, 128)``) rows are grouped
+    by token count and padded only to their bucket boundary, each bucket
+    reusing its own traced graph, so short reviews skip most of the
+    recurrent work on padding. Unless the model masks padding all the way
+    to the output, this changes the probabilities slightly, so bucketing is
+    only kept if probe outputs stay within ``bucket_atol`` of full padding.
+
+    With ``jit_compile=True`` the forward pass is compiled by XLA, which
+    fuses the Conv1D and BiLSTM kernels. XLA compiles one executable per
+    static input shape; those are cached by (batch size, length), and
+    partial batches are padded up to a power of two (at most
+    ``batch_size``) so only a handful of shapes are ever compiled. If
+    compilation fails or the compiled outputs disagree with the traced
+    graph, the engine logs it and falls back to the traced graph.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_len=MAX_LEN,
+        length_buckets=None,
+        bucket_atol=LENGTH_BUCKET_ATOL,
+        jit_compile=False,
+    ):
+        self.model = model
+        self.max_len = max_len
+        self.n_classes = model.output_shape[-1]
+        self._forward = self._trace(max_len)
+        self._models = {max_len: model}
+        self.jit_compile = False
+        self._compiled = {}
+
+        self.length_buckets = None
+        if length_buckets:
+            self._enable_buckets(length_buckets, bucket_atol)
+
+        if jit_compile:
+            self._enable_xla()
+
+    def _trace(self, length, model=None):
+        model = model or self.model
+        return tf.function(
+            lambda inputs: model(inputs, training=False),
+            input_signature=[tf.TensorSpec([None, length], tf.int32)],
+        )
+
+    def _enable_buckets(self, length_buckets, atol):
+        try:
+            bucket_model = variable_length_model(self.model)
+        except Exception:
+            logger.exception("Cannot rebuild model for variable-length input")
+            return
+
+        buckets = sorted({size for size in length_buckets if 0 < size < self.max_len})
+        buckets.append(self.max_len)
+        self._bucket_forward = {
+            size: self._trace(size, bucket_model) for size in buckets
+        }
+        self._models.update((size, bucket_model) for size in buckets[:-1])
+        self.length_buckets = buckets
+        if not self._buckets_match(atol):
+            logger.warning(
+                "Model outputs depend on padding length beyond atol=%g; "
+                "length bucketing disabled",
+                atol,
+            )
+            self.length_buckets = None
+
+    def _buckets_match(self, atol):
+        """Check bucketed outputs against full-length padding on probe rows"""
+        probe = np.zeros((len(self.length_buckets), self.max_len), dtype=np.int32)
+        for row, size in enumerate(self.length_buckets):
+            probe[row, :size] = np.arange(size) % 7 + 1
+        try:
+            bucketed = self.predict(probe)
+        except Exception:
+            logger.exception("Bucketed forward pass failed")
+            return False
+        full = self._run(self._forward, probe, len(probe))
+        return np.allclose(bucketed, full, atol=atol)
+
+    def _enable_xla(self, atol=1e-4):
+        self._xla_functions = {
+            length: tf.function(
+                lambda inputs, model=model: model(inputs, training=False),
+                jit_compile=True,
+            )
+            for length, model in self._models.items()
+        }
+        self.jit_compile = True
+
+        probe = np.zeros((1, self.max_len), dtype=np.int32)
+        probe[0, : self.max_len // 2] = np.arange(self.max_len // 2) % 7 + 1
+        try:
+            compiled = self._run_compiled(self.max_len, probe, 1)
+        except Exception:
+            logger.exception("XLA compilation failed; using the traced graph")
+            self.jit_compile = False
+            return
+        if not np.allclose(compiled, self._forward(probe).numpy(), atol=atol):
+            logger.warning("XLA outputs differ beyond atol=%g; XLA disabled", atol)
+            self.jit_compile = False
+
+    def _run_compiled(self, length, inputs, batch_size):
+        """Forward pass through the XLA executable cached for this shape"""
+        rows = len(inputs)
+        # Pad partial batches so the number of compiled shapes stays small
+        padded_rows = min(1 << (rows - 1).bit_length(), batch_size)
+        key = (padded_rows, length)
+        forward = self._compiled.get(key)
+        if forward is None:
+            forward = self._xla_functions[length].get_concrete_function(
+                tf.TensorSpec([padded_rows, length], tf.int32)
+            )
+            self._compiled[key] = forward
+        if rows < padded_rows:
+            inputs = np.pad(inputs, ((0, padded_rows - rows), (0, 0)))
+        return forward(tf.constant(inputs)).numpy()[:rows]
+
+    def compiled_shapes(self):
+        """(batch size, length) of every XLA executable compiled so far"""
+        return sorted(self._compiled)
+
+    def _run(self, forward, inputs, batch_size):
+        if self.jit_compile:
+            try:
+                return self._run_xla(inputs, batch_size)
+            except Exception:
+                logger.exception("XLA forward pass failed; using the traced graph")
+                self.jit_compile = False
+        if len(inputs) <= batch_size:
+            return forward(inputs).numpy()
+        return np.concatenate(
+            [
+                forward(inputs[start : start + batch_size]).numpy()
+                for start in range(0, len(inputs), batch_size)
+            ]
+        )
+
+    def _run_xla(self, inputs, batch_size):
+        length = inputs.shape[1]
+        return np.concatenate(
+            [
+                self._run_compiled(
+                    length, inputs[start : start + batch_size], batch_size
+                )
+                for start in range(0, len(inputs), batch_size)
+            ]
+        )
+
+    def predict(self, inputs, batch_size=256, lengths=None):
+        """Return the (N, n_classes) probability matrix for padded inputs
+
+        ``lengths``, the token count of each row if already known (a token
+        store keeps them), saves scanning the inputs for bucketing.
+        """
+        inputs = np.asarray(inputs, dtype=np.int32)
+        if len(inputs) == 0:
+            return np.zeros((0, self.n_classes), dtype=np.float32)
+        if self.length_buckets is None:
+            return self._run(self._forward, inputs, batch_size)
+
+        if lengths is None:
+            # Token count of each post-padded row: position of the last non-zero id
+            nonzero = inputs != 0
+            lengths = np.where(
+                nonzero.any(axis=1),
+                self.max_len - np.argmax(nonzero[:, ::-1], axis=1),
+                0,
+            )
+        bucket_idx = np.searchsorted(self.length_buckets, lengths)
+
+        outputs = np.empty((len(inputs), self.n_classes), dtype=np.float32)
+        for i, size in enumerate(self.length_buckets):
+            rows = np.flatnonzero(bucket_idx == i)
+            if rows.size:
+                outputs[rows] = self._run(
+                    self._bucket_forward[size], inputs[rows, :size], batch_size
+                )
+        return outputs
+
+
+def variable_length_model(model):
+    """Rebuild a functional model with a (None, None) input, sharing weights"""
+    config = model.get_config()
+    for layer in config["layers"]:
+        layer_config = layer["config"]
+        for key in ("batch_shape", "batch_input_shape"):
+            if layer["class_name"] == "InputLayer" and key in layer_config:
+                layer_config[key] = [None, None]
+        if "input_length" in layer_config:
+            layer_config["input_length"] = None
+
+    clone = model.__class__.from_config(
+        config, custom_objects={"AttentionLayer": AttentionLayer}
+    )
+    clone.set_weights(model.get_weights())
+    return clone
+
+
+class SavedModelEngine:
+    """InferenceEngine-compatible wrapper around an exported SavedModel
+
+    Loading the serving signature skips rebuilding the Keras graph and
+    its custom layers; only inference ops are restored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._loaded = tf.saved_model.load(path)
+        self._forward = self._loaded.signatures["serving_default"]
+
+        (self._input_name, input_spec), = (
+            self._forward.structured_input_signature[1].items()
+        )
+        (self._output_name, output_spec), = self._forward.structured_outputs.items()
+        self._input_dtype = input_spec.dtype
+        self.max_len = input_spec.shape[1]
+        self.n_classes = output_spec.shape[-1]
+
+    def predict(self, inputs, batch_size=256):
+        """Return the (N, n_classes) probability matrix for padded inputs"""
+        inputs = np.asarray(inputs)
+        if len(inputs) == 0:
+            return np.zeros((0, self.n_classes), dtype=np.float32)
+
+        outputs = [
+            self._forward(
+                **{
+                    self._input_name: tf.constant(
+                        inputs[start : start + batch_size], dtype=self._input_dtype
+                    )
+                }
+            )[self._output_name].numpy()
+            for start in range(0, len(inputs), batch_size)
+        ]
+        return np.concatenate(outputs)
+
+
+# Define Attention Layer (same as in training)
+class AttentionLayer(tf.keras.layers.Layer):
+    def __init__(self, **kwargs):
+        super(AttentionLayer, self).__init__(**kwargs)
+
+    def build(self, input_shape):
+        self.W = self.add_weight(
+            name="att_weight",
+            shape=(input_shape[-1],),
+            initializer="random_normal",
+            trainable=True,
+        )
+        super(AttentionLayer, self).build(input_shape)
+
+    def call(self, inputs, mask=None):
+        # Score every timestep with one contraction over the feature axis
+        scores = tf.einsum("btd,d->bt", tf.tanh(inputs), tf.cast(self.W, inputs.dtype))
+
+        if mask is not None:
+            # Same -1e9 as the original, clamped so float16 stays finite and
+            # fully masked rows still get a uniform softmax instead of NaN
+            fill = max(-1e9, scores.dtype.min)
+            scores = tf.where(
+                tf.cast(mask, tf.bool), scores, tf.constant(fill, scores.dtype)
+            )
+
+        alpha = tf.nn.softmax(scores, axis=-1)
+        # Weighted sum over time as a batched matmul, without materializing
+        # inputs * alpha
+        return tf.einsum("bt,btd->bd", alpha, inputs)
+
+    def compute_output_shape(self, input_shape):
+        return (input_shape[0], input_shape[-1])
+
+    def get_config(self):
+        config = super().get_config()
+        return config
+
+
+class ChainedAttentionLayer(AttentionLayer):
+    """Original op-by-op AttentionLayer.call, kept as the reference"""
+
+    def call(self, inputs, mask=None):
+        e = tf.keras.backend.tanh(inputs)
+        e = tf.keras.backend.dot(e, tf.keras.backend.expand_dims(self.W, -1))
+        e = tf.keras.backend.squeeze(e, -1)
+
+        if mask is not None:
+            mask = tf.keras.backend.cast(mask, tf.keras.backend.floatx())
+            e = e * mask + ((1 - mask) * -1e9)
+
+        alpha = tf.keras.backend.softmax(e)
+        alpha_exp = tf.keras.backend.expand_dims(alpha, axis=-1)
+        context = tf.keras.backend.sum(inputs * alpha_exp, axis=1)
+        return context
@@ -0,0 +1,229 @@
+"""
+Background artifact loading: starts loading and warming up the model on a
+daemon thread so callers can render or serve right away and check
+``ready`` instead of blocking on the load. Later versions of the artifacts
+are loaded, validated and warmed the same way and swapped in atomically,
+either on request (``reload``) or when the files change (``watch``).
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLoader:
+    """Load artifacts with load_fn, then validate and warm them, off-thread
+
+    ``state`` goes ``"idle"`` -> ``"loading"`` -> ``"validating"`` ->
+    ``"warming"`` -> ``"ready"``, or to ``"failed"`` with the exception
+    message in ``error``. While a reload runs it is ``"reloading"`` and the
+    current artifacts keep serving.
+
+    The artifacts and their fingerprint are published together as one
+    tuple, so ``snapshot()`` never pairs a model with another version's
+    fingerprint, and callers that took a snapshot before a swap finish on
+    the version they started with.
+    """
+
+    def __init__(
+        self, load_fn, warm_up_fn=None, validate_fn=None, fingerprint_fn=None
+    ):
+        self.load_fn = load_fn
+        self.warm_up_fn = warm_up_fn
+        self.validate_fn = validate_fn
+        self.fingerprint_fn = fingerprint_fn
+        self.state = "idle"
+        self.error = None
+        self.reload_error = None
+        self.reloads = 0
+        self.load_seconds = None
+        self.warm_up_seconds = None
+
+        self._current = (None, None)
+        self._lock = threading.Lock()
+        self._busy = False
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._watcher = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._busy = True
+            self._thread = threading.Thread(
+                target=self._run, name="model-loader", daemon=True
+            )
+        self._thread.start()
+        return self
+
+    def _load(self):
+        """Load, validate and warm up one version of the artifacts"""
+        # Hash first: if the files change while loading, the watcher sees
+        # a newer signature and loads again
+        fingerprint = self.fingerprint_fn() if self.fingerprint_fn else None
+
+        start = time.perf_counter()
+        artifacts = self.load_fn()
+        load_seconds = time.perf_counter() - start
+        if fingerprint is None:
+            # Remote engines report the version they are bound to
+            fingerprint = getattr(artifacts[0], "fingerprint", None)
+
+        # A reload stays "reloading" throughout; the old version is serving
+        first_load = self.artifacts is None
+        if self.validate_fn is not None:
+            if first_load:
+                self.state = "validating"
+            self.validate_fn(*artifacts)
+
+        if first_load:
+            self.state = "warming"
+        start = time.perf_counter()
+        if self.warm_up_fn is not None:
+            self.warm_up_fn(*artifacts)
+        self.load_seconds = load_seconds
+        self.warm_up_seconds = time.perf_counter() - start
+        return artifacts, fingerprint
+
+    def _run(self):
+        try:
+            self.state = "loading"
+            self._current = self._load()
+            self.state = "ready"
+            logger.info(
+                "Model %s loaded in %.2fs and warmed up in %.2fs",
+                self.fingerprint,
+                self.load_seconds,
+                self.warm_up_seconds,
+            )
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            logger.exception("Failed to load model artifacts")
+        finally:
+            with self._lock:
+                self._busy = False
+            self._done.set()
+
+    def _reload(self):
+        previous = self.fingerprint
+        try:
+            self._current = self._load()
+            self.error = None
+            self.reload_error = None
+            self.reloads += 1
+            logger.info("Model %s swapped in for %s", self.fingerprint, previous)
+            return True
+        except Exception as e:
+            self.reload_error = str(e)
+            logger.exception("Model reload failed; still serving %s", previous)
+            return False
+        finally:
+            self.state = "ready" if self.artifacts is not None else "failed"
+            with self._lock:
+                self._busy = False
+
+    def _claim(self):
+        """Mark a reload as running, unless a load already is"""
+        with self._lock:
+            if self._busy or self._thread is None:
+                return False
+            self._busy = True
+        self.state = "reloading" if self.artifacts is not None else "loading"
+        return True
+
+    def reload(self, wait=False):
+        """Load the artifacts again and swap them in if they pass validation
+
+        Returns False if a load is already in progress. Otherwise returns
+        True once the reload has started, or with ``wait=True`` whether
+        the new version was swapped in.
+        """
+        if not self._claim():
+            return False
+        if wait:
+            return self._reload()
+        threading.Thread(
+            target=self._reload, name="model-reload", daemon=True
+        ).start()
+        return True
+
+    def watch(self, signature_fn, interval=10.0):
+        """Reload whenever signature_fn's value changes and then holds still
+
+        ``signature_fn`` should be cheap (file sizes and mtimes, say) and
+        return None while the artifacts are incomplete. A change has to
+        survive one more poll before reloading, so files that are still
+        being copied are not picked up half-written.
+        """
+        if self._watcher is None:
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(signature_fn, interval),
+                name="model-watcher",
+                daemon=True,
+            )
+            self._watcher.start()
+        return self
+
+    def _watch(self, signature_fn, interval):
+        loaded = signature_fn()
+        pending = None
+        while not self._stop.wait(interval):
+            signature = signature_fn()
+            if signature is None or signature == loaded:
+                pending = None
+                continue
+            if signature != pending:
+                pending = signature
+                continue
+            if not self._claim():
+                continue
+            # A rejected version is not retried until the files change again
+            self._reload()
+            loaded = signature
+            pending = None
+
+    def stop(self):
+        """Stop watching for artifact changes"""
+        self._stop.set()
+
+    @property
+    def artifacts(self):
+        return self._current[0]
+
+    @property
+    def fingerprint(self):
+        return self._current[1]
+
+    def snapshot(self):
+        """The current (artifacts, fingerprint) pair, read atomically"""
+        return self._current
+
+    @property
+    def ready(self):
+        return self.artifacts is not None
+
+    @property
+    def failed(self):
+        return self.state == "failed"
+
+    def wait(self, timeout=None):
+        """Block until the first load finishes; True if the model is ready"""
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self):
+        return {
+            "state": self.state,
+            "fingerprint": self.fingerprint,
+            "error": self.error,
+            "reloads": self.reloads,
+            "reload_error": self.reload_error,
+            "load_seconds": self.load_seconds,
+            "warm_up_seconds": self.warm_up_seconds,
+        }
@@ -0,0 +1,464 @@
+"""
+Pure-NumPy inference backend for the CNN + BiLSTM + Attention model.
+
+Export the weights and layer graph out of the Keras .h5 file once (needs
+h5py, not TensorFlow):
+    python numpy_backend.py
+
+Then score without TensorFlow in the forward pass:
+    INFERENCE_BACKEND=numpy streamlit run app.py
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+NUMPY_WEIGHTS_PATH = "kaggle/working/model_outputs/model_weights.npz"
+
+# Layers that are the identity at inference time
+_IDENTITY_LAYERS = {
+    "Dropout",
+    "SpatialDropout1D",
+    "GaussianNoise",
+    "GaussianDropout",
+    "AlphaDropout",
+    "ActivityRegularization",
+}
+# Layers that keep the incoming timestep mask
+_MASK_PRESERVING = _IDENTITY_LAYERS | {
+    "Dense",
+    "Activation",
+    "BatchNormalization",
+    "LayerNormalization",
+}
+
+
+def _sigmoid(x):
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+def _softmax(x, axis=-1):
+    x = x - x.max(axis=axis, keepdims=True)
+    e = np.exp(x)
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    None: lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+    "softmax": _softmax,
+    "elu": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+    "swish": lambda x: x * _sigmoid(x),
+    "silu": lambda x: x * _sigmoid(x),
+    "softplus": lambda x: np.logaddexp(x, 0),
+}
+
+
+def _activation(name):
+    if isinstance(name, dict):
+        name = name.get("config", {}).get("name") or name.get("class_name")
+    try:
+        return ACTIVATIONS[name]
+    except KeyError:
+        raise NotImplementedError(f"Unsupported activation: {name}") from None
+
+
+# --------------------------------------------------------------------------
+# Export from .h5
+# --------------------------------------------------------------------------
+
+
+def _inbound_names(layer_spec):
+    """Names of the layers feeding a layer (Keras 2 and Keras 3 configs)"""
+    nodes = layer_spec.get("inbound_nodes") or []
+    if not nodes:
+        return []
+    node = nodes[0]
+
+    if isinstance(node, dict):
+        # Keras 3: {"args": [keras_tensor, ...], "kwargs": {...}}
+        names = []
+
+        def walk(value):
+            if isinstance(value, dict):
+                history = value.get("config", {}).get("keras_history")
+                if value.get("class_name") == "__keras_tensor__" and history:
+                    names.append(history[0])
+                    return
+                for item in value.values():
+                    walk(item)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    walk(item)
+
+        walk(node.get("args", []))
+        return names
+
+    # Keras 2: [[name, node_index, tensor_index, kwargs], ...]
+    return [item[0] for item in node]
+
+
+def _explicit_mask(layer_spec):
+    """Layer producing an explicit ``mask=`` argument (Keras 3 op layers)"""
+    nodes = layer_spec.get("inbound_nodes") or []
+    if nodes and isinstance(nodes[0], dict):
+        mask = nodes[0].get("kwargs", {}).get("mask")
+        if isinstance(mask, dict):
+            return mask.get("config", {}).get("keras_history", [None])[0]
+    return None
+
+
+def _first_name(value):
+    while isinstance(value, list):
+        value = value[0]
+    return value
+
+
+def export_weights(h5_path, npz_path=NUMPY_WEIGHTS_PATH):
+    """Read the layer graph and weights out of a Keras .h5 file into .npz"""
+    import h5py
+
+    with h5py.File(h5_path, "r") as f:
+        model_config = f.attrs["model_config"]
+        if isinstance(model_config, bytes):
+            model_config = model_config.decode("utf-8")
+        model_config = json.loads(model_config)["config"]
+
+        layers = []
+        arrays = {}
+        previous = None
+        for spec in model_config["layers"]:
+            name = spec.get("name") or spec["config"]["name"]
+            inbound = _inbound_names(spec)
+            if not inbound and previous is not None and spec["class_name"] != "InputLayer":
+                # Sequential models list layers in order without inbound nodes
+                inbound = [previous]
+            layers.append(
+                {
+                    "name": name,
+                    "class_name": spec["class_name"],
+                    "config": spec["config"],
+                    "inbound": inbound,
+                    "mask": _explicit_mask(spec),
+                }
+            )
+
+            group = f["model_weights"].get(name)
+            if group is not None:
+                for j, weight_name in enumerate(group.attrs.get("weight_names", [])):
+                    if isinstance(weight_name, bytes):
+                        weight_name = weight_name.decode("utf-8")
+                    arrays[f"{name}/{j}"] = np.asarray(
+                        group[weight_name], dtype=np.float32
+                    )
+            previous = name
+
+        output_layers = model_config.get("output_layers")
+        graph = {
+            "layers": layers,
+            "output": _first_name(output_layers) if output_layers else previous,
+        }
+
+    np.savez(npz_path, __graph__=np.array(json.dumps(graph)), **arrays)
+    return npz_path
+
+
+# --------------------------------------------------------------------------
+# Forward pass
+# --------------------------------------------------------------------------
+
+
+def _conv1d(x, kernel, bias, config):
+    kernel_size, _, _ = kernel.shape
+    stride = _first_name(config.get("strides", 1))
+    dilation = _first_name(config.get("dilation_rate", 1))
+    padding = config.get("padding", "valid")
+    length = x.shape[1]
+    span = (kernel_size - 1) * dilation + 1
+
+    if padding == "same":
+        out_len = -(-length // stride)
+        total = max((out_len - 1) * stride + span - length, 0)
+        x = np.pad(x, ((0, 0), (total // 2, total - total // 2), (0, 0)))
+    elif padding == "causal":
+        x = np.pad(x, ((0, 0), (span - 1, 0), (0, 0)))
+    out_len = (x.shape[1] - span) // stride + 1
+
+    # One matmul per kernel tap over strided views of the input
+    out = np.zeros((x.shape[0], out_len, kernel.shape[2]), dtype=np.float32)
+    stop = (out_len - 1) * stride + 1
+    for k in range(kernel_size):
+        start = k * dilation
+        out += x[:, start : start + stop : stride] @ kernel[k]
+    if bias is not None:
+        out += bias
+    return _activation(config.get("activation"))(out)
+
+
+def _pool1d(x, config, reduce):
+    pool = _first_name(config.get("pool_size", 2))
+    stride = _first_name(config.get("strides") or pool)
+    padding = config.get("padding", "valid")
+    length = x.shape[1]
+
+    if padding == "same":
+        out_len = -(-length // stride)
+        total = max((out_len - 1) * stride + pool - length, 0)
+        left, right = total // 2, total - total // 2
+        fill = -np.inf if reduce == "max" else np.nan
+        x = np.pad(x, ((0, 0), (left, right), (0, 0)), constant_values=fill)
+    out_len = (x.shape[1] - pool) // stride + 1
+    stop = (out_len - 1) * stride + 1
+
+    windows = np.stack(
+        [x[:, j : j + stop : stride] for j in range(pool)], axis=2
+    )
+    if reduce == "max":
+        return windows.max(axis=2)
+    # Average pooling ignores the padded positions
+    return np.nanmean(windows, axis=2)
+
+
+def _lstm(x, mask, directions, config):
+    """Run LSTM directions over (N, T, F) input in one batched time loop
+
+    ``directions`` holds ``(kernel, recurrent_kernel, bias, go_backwards)``
+    per direction; a Bidirectional layer steps both of its LSTMs together.
+    Outputs come back in each direction's processing order.
+    """
+    units = directions[0][1].shape[0]
+    activation = _activation(config.get("activation", "tanh"))
+    recurrent_activation = _activation(config.get("recurrent_activation", "sigmoid"))
+    zero_output = config.get("zero_output_for_mask", False)
+
+    # Backward directions read the sequence (and its mask) reversed
+    xs = np.stack([x[:, ::-1] if back else x for _, _, _, back in directions])
+    kernels = np.stack([kernel for kernel, _, _, _ in directions])
+    recurrent = np.stack([kernel for _, kernel, _, _ in directions])
+    if mask is not None:
+        mask = np.stack([mask[:, ::-1] if back else mask for _, _, _, back in directions])
+
+    d, n, steps, _ = xs.shape
+    # Input projections for every timestep at once
+    projected = xs @ kernels[:, None]
+    if directions[0][2] is not None:
+        projected += np.stack([bias for _, _, bias, _ in directions])[:, None, None]
+
+    h = np.zeros((d, n, units), dtype=np.float32)
+    c = np.zeros((d, n, units), dtype=np.float32)
+    last = np.zeros((d, n, units), dtype=np.float32)
+    outputs = np.zeros((d, n, steps, units), dtype=np.float32)
+
+    for t in range(steps):
+        z = projected[:, :, t] + h @ recurrent
+        gates = recurrent_activation(z)
+        i = gates[..., :units]
+        f = gates[..., units : 2 * units]
+        o = gates[..., 3 * units :]
+        g = activation(z[..., 2 * units : 3 * units])
+        c_new = f * c + i * g
+        h_new = o * activation(c_new)
+
+        if mask is None:
+            h, c, last = h_new, c_new, h_new
+            outputs[:, :, t] = h_new
+        else:
+            # Masked steps carry the previous state forward
+            keep = mask[:, :, t, None]
+            h = np.where(keep, h_new, h)
+            c = np.where(keep, c_new, c)
+            last = np.where(keep, h_new, last)
+            outputs[:, :, t] = np.where(keep, h_new, 0.0 if zero_output else last)
+
+    if config.get("return_sequences", False):
+        return list(outputs)
+    return list(last)
+
+
+def _lstm_weights(weights, go_backwards=False):
+    bias = weights[2] if len(weights) > 2 else None
+    return (weights[0], weights[1], bias, go_backwards)
+
+
+def _bidirectional(x, mask, weights, config):
+    layer_config = config["layer"]["config"]
+    half = len(weights) // 2
+    forward, backward = _lstm(
+        x,
+        mask,
+        [_lstm_weights(weights[:half]), _lstm_weights(weights[half:], True)],
+        layer_config,
+    )
+    if layer_config.get("return_sequences", False):
+        backward = backward[:, ::-1]
+
+    merge_mode = config.get("merge_mode", "concat")
+    if merge_mode == "concat":
+        return np.concatenate([forward, backward], axis=-1)
+    if merge_mode == "sum":
+        return forward + backward
+    if merge_mode == "ave":
+        return (forward + backward) / 2
+    if merge_mode == "mul":
+        return forward * backward
+    raise NotImplementedError(f"Unsupported merge_mode: {merge_mode}")
+
+
+def _attention(x, mask, weight):
+    """AttentionLayer: tanh scoring, masked softmax over time, weighted sum"""
+    scores = np.tanh(x) @ weight
+    if mask is not None:
+        mask = mask.astype(np.float32)
+        scores = scores * mask + (1 - mask) * -1e9
+    alpha = _softmax(scores, axis=1)
+    return np.einsum("nt,ntf->nf", alpha, x)
+
+
+class NumpyEngine:
+    """InferenceEngine-compatible forward pass using only NumPy"""
+
+    def __init__(self, npz_path=NUMPY_WEIGHTS_PATH):
+        self.npz_path = npz_path
+        with np.load(npz_path) as data:
+            graph = json.loads(str(data["__graph__"]))
+            arrays = {key: data[key] for key in data.files if key != "__graph__"}
+
+        self.layers = graph["layers"]
+        self.output = graph["output"]
+        self.weights = {
+            layer["name"]: [
+                arrays[f"{layer['name']}/{j}"]
+                for j in range(
+                    sum(key.startswith(f"{layer['name']}/") for key in arrays)
+                )
+            ]
+            for layer in self.layers
+        }
+
+        input_layer = self.layers[0]["config"]
+        shape = input_layer.get("batch_shape") or input_layer.get("batch_input_shape")
+        self.max_len = shape[1]
+        output_weights = self.weights[self.output]
+        self.n_classes = output_weights[-1].shape[-1]
+
+    def _forward(self, inputs):
+        values = {}
+        masks = {}
+        for layer in self.layers:
+            name = layer["name"]
+            kind = layer["class_name"]
+            config = layer["config"]
+            weights = self.weights[name]
+            args = [values[source] for source in layer["inbound"]]
+            x = args[0] if args else inputs
+            mask = masks.get(layer["inbound"][0]) if layer["inbound"] else None
+            if layer.get("mask"):
+                mask = values[layer["mask"]] != 0
+            out_mask = mask if kind in _MASK_PRESERVING else None
+
+            if kind == "InputLayer":
+                out = inputs
+            elif kind == "Embedding":
+                ids = x.astype(np.int64)
+                out = weights[0][ids]
+                if config.get("mask_zero"):
+                    out_mask = ids != 0
+            elif kind == "NotEqual":
+                # Keras 3 records ``inputs != 0`` mask ops as their own layer
+                out = x != 0
+            elif kind in _IDENTITY_LAYERS:
+                out = x
+            elif kind == "Conv1D":
+                bias = weights[1] if config.get("use_bias", True) else None
+                out = _conv1d(x, weights[0], bias, config)
+            elif kind == "MaxPooling1D":
+                out = _pool1d(x, config, "max")
+            elif kind == "AveragePooling1D":
+                out = _pool1d(x, config, "mean")
+            elif kind == "GlobalMaxPooling1D":
+                out = x.max(axis=1)
+            elif kind == "GlobalAveragePooling1D":
+                if mask is None:
+                    out = x.mean(axis=1)
+                else:
+                    m = mask[..., None].astype(np.float32)
+                    out = (x * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1)
+            elif kind == "Bidirectional":
+                out = _bidirectional(x, mask, weights, config)
+                if config["layer"]["config"].get("return_sequences", False):
+                    out_mask = mask
+            elif kind == "LSTM":
+                directions = [
+                    _lstm_weights(weights, config.get("go_backwards", False))
+                ]
+                (out,) = _lstm(x, mask, directions, config)
+                if config.get("return_sequences", False):
+                    out_mask = mask
+            elif kind == "AttentionLayer":
+                out = _attention(x, mask, weights[0])
+            elif kind == "Dense":
+                out = x @ weights[0]
+                if config.get("use_bias", True):
+                    out = out + weights[1]
+                out = _activation(config.get("activation"))(out)
+            elif kind == "Activation":
+                out = _activation(config.get("activation"))(x)
+            elif kind == "BatchNormalization":
+                gamma, beta, mean, var = self._batch_norm_params(weights, config)
+                out = (x - mean) / np.sqrt(var + config.get("epsilon", 1e-3))
+                out = out * gamma + beta
+            elif kind == "Flatten":
+                out = x.reshape(len(x), -1)
+            elif kind == "Concatenate":
+                out = np.concatenate(args, axis=config.get("axis", -1))
+            elif kind == "Add":
+                out = np.sum(args, axis=0)
+            else:
+                raise NotImplementedError(f"Unsupported layer for NumPy backend: {kind}")
+
+            values[name] = out.astype(np.float32, copy=False)
+            masks[name] = out_mask
+        return values[self.output]
+
+    @staticmethod
+    def _batch_norm_params(weights, config):
+        weights = list(weights)
+        gamma = weights.pop(0) if config.get("scale", True) else 1.0
+        beta = weights.pop(0) if config.get("center", True) else 0.0
+        mean, var = weights
+        return gamma, beta, mean, var
+
+    def predict(self, inputs, batch_size=256):
+        """Return the (N, n_classes) probability matrix for padded inputs"""
+        inputs = np.asarray(inputs)
+        if len(inputs) == 0:
+            return np.zeros((0, self.n_classes), dtype=np.float32)
+        return np.concatenate(
+            [
+                self._forward(inputs[start : start + batch_size])
+                for start in range(0, len(inputs), batch_size)
+            ]
+        )
+
+
+def main(argv=None):
+    from inference import MODEL_PATH, NUMPY_WEIGHTS_PATH
+
+    parser = argparse.ArgumentParser(
+        description="Export the Keras .h5 model to a NumPy weights file"
+    )
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--output", default=NUMPY_WEIGHTS_PATH)
+    args = parser.parse_args(argv)
+
+    path = export_weights(args.model_path, args.output)
+    print(f"✓ Exported {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+In-process LRU/TTL cache of model outputs keyed on cleaned text.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def text_key(cleaned_text, fingerprint):
+    """Hash a cleaned text together with the model artifact fingerprint"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fingerprint.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(cleaned_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Size-bounded LRU cache with an optional time-to-live per entry
+
+    Keys combine the ``clean_text`` output with the artifact fingerprint,
+    so texts that only differ in URLs, mentions or punctuation share an
+    entry and a different model never sees another model's outputs.
+    """
+
+    def __init__(self, fingerprint, max_entries=10000, ttl_seconds=None, store=None):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Optional PredictionStore consulted on misses and written through
+        self.store = store
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._store_hits = 0
+
+    def key(self, cleaned_text):
+        return text_key(cleaned_text, self.fingerprint)
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self._hits += 1
+                return value
+            self._misses += 1
+
+        if self.store is None:
+            return None
+        value = self.store.get(key)
+        if value is not None:
+            self._insert(key, value)
+            with self._lock:
+                self._store_hits += 1
+        return value
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self._expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._insert(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def _insert(self, key, value):
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        )
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "store_hits": self._store_hits,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,162 @@
+"""
+Persistent prediction store shared across processes and restarts.
+
+Outputs are kept in a SQLite database in WAL mode, so several Streamlit,
+server and CLI processes can read and write it at the same time. Keys are
+the same hashes PredictionCache uses (cleaned text + artifact fingerprint).
+"""
+
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK = 500
+# Hits are only written back once their recency is older than this, so
+# re-scoring the same texts over and over stays read-only
+RECENCY_REFRESH_SECONDS = 60
+
+
+class PredictionStore:
+    """Key -> probability vector store with least-recently-used eviction
+
+    The store holds at most ``max_entries`` entries (a count, not bytes;
+    each entry is one float32 vector plus its key).
+    """
+
+    def __init__(self, path, max_entries=1_000_000, evict_every=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " key TEXT PRIMARY KEY,"
+            " probs BLOB NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS predictions_accessed"
+            " ON predictions (accessed)"
+        )
+
+    def _connect(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        """Return {key: probabilities} for the keys present in the store"""
+        conn = self._connect()
+        found = {}
+        stale = []
+        now = time.time()
+        keys = list(keys)
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start : start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                "SELECT key, probs, accessed FROM predictions"
+                f" WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for key, blob, accessed in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+                if accessed < now - RECENCY_REFRESH_SECONDS:
+                    stale.append(key)
+
+        if stale:
+            # Refresh recency so eviction keeps frequently used entries, in
+            # one write transaction per call rather than one per hit
+            self._touch(conn, stale, now)
+
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        return found
+
+    def _touch(self, conn, keys, now):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    "UPDATE predictions SET accessed = ?"
+                    f" WHERE key IN ({placeholders})",
+                    [now, *chunk],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def put_many(self, items):
+        """Store (key, probabilities) pairs"""
+        now = time.time()
+        rows = [
+            (key, np.asarray(probs, dtype=np.float32).tobytes(), now)
+            for key, probs in items
+        ]
+        if not rows:
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO predictions (key, probs, accessed)"
+                " VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self._writes += len(rows)
+            due = self._writes >= self.evict_every
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put(self, key, probs):
+        self.put_many([(key, probs)])
+
+    def evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM predictions WHERE key IN ("
+                " SELECT key FROM predictions ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self):
+        (count,) = self._connect().execute(
+            "SELECT COUNT(*) FROM predictions"
+        ).fetchone()
+        with self._lock:
+            return {"size": count, "hits": self._hits, "misses": self._misses}
@@ -0,0 +1,716 @@
+"""
+Headless batch scorer: reads JSONL, CSV, Parquet or Arrow records from a
+file or stdin, scores them in batches and streams NDJSON results to stdout,
+or writes them as a Parquet file with typed prediction columns.
+
+Parquet and Arrow input is read in record batches from a memory-mapped
+file (Arrow IPC streams can also come from stdin). With ``--output
+results.parquet`` the input columns are written back with the prediction
+columns appended; see arrow_io.py.
+
+With ``--workers N`` the input is cut into row chunks and scored by N
+worker processes, each loading the artifacts once with its own share of
+the cores; results are still written in input order.
+
+With ``--token-cache DIR`` the padded token ids of the input file are kept
+in DIR (see token_store.py). Scoring the same file again with a retrained
+model that shares the tokenizer skips cleaning and tokenizing entirely.
+
+Reviews longer than MAX_LEN tokens are truncated unless ``--long-text`` is
+given; then each is scored as overlapping windows, all windows of a batch
+in one forward pass, and the window count is reported per row.
+
+Usage:
+    python score.py reviews.jsonl > scored.ndjson
+    cat reviews.csv | python score.py --format csv --text-field review
+    python score.py reviews.jsonl --cache-db predictions.db > scored.ndjson
+    python score.py big_export.jsonl --workers 8 > scored.ndjson
+    python score.py reviews.parquet --text-field review --output scored.parquet
+    python score.py reviews.parquet --token-cache token_cache --output a.parquet
+    python score.py long_reviews.jsonl --long-text length > scored.ndjson
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+import numpy as np
+
+from bundle import LabelClasses
+from cpu_threads import usable_cpus
+from inference import (
+    MAX_LEN,
+    WINDOW_AGGREGATES,
+    WINDOW_STRIDE,
+    clean_texts,
+    encode_cleaned,
+    fingerprint_artifacts,
+    format_predictions,
+    load_artifacts,
+    predict_cleaned,
+    predict_proba_batch,
+    predict_windows,
+)
+from prediction_cache import text_key
+from prediction_store import PredictionStore
+
+DEFAULT_BATCH_SIZE = 256
+# Rows per task sent to a worker process in --workers mode
+DEFAULT_CHUNK_SIZE = 4096
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Per-process state of a --workers pool, set by _init_worker
+_worker = None
+# Marks rows that have no id to echo back
+_NO_ID = object()
+
+
+def read_records(stream, input_format):
+    """Yield one dict per input record without loading the whole stream"""
+    if input_format == "csv":
+        # Reviews can be far longer than the csv module's default field limit
+        csv.field_size_limit(sys.maxsize)
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def batched(iterable, batch_size):
+    """Yield lists of up to batch_size items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def predict_with_store(texts, model, tokenizer, label_encoder, store, fingerprint):
+    """Probability matrix for texts, reading and filling a PredictionStore"""
+    cleaned_texts = clean_texts(texts)
+    keys = [text_key(cleaned, fingerprint) for cleaned in cleaned_texts]
+    found = store.get_many(keys)
+
+    predictions = np.empty((len(texts), len(label_encoder.classes_)), np.float32)
+    missing = []
+    for i, key in enumerate(keys):
+        if key in found:
+            predictions[i] = found[key]
+        else:
+            missing.append(i)
+
+    if missing:
+        outputs = predict_cleaned([cleaned_texts[i] for i in missing], model, tokenizer)
+        predictions[missing] = outputs
+        store.put_many((keys[i], row) for i, row in zip(missing, outputs))
+
+    return predictions
+
+
+def record_text(record, text_field):
+    """The text of one row record, missing or null as ''
+
+    A JSONL line that is a bare value rather than an object is the text
+    itself, as in server.py's streaming endpoint.
+    """
+    value = record.get(text_field) if isinstance(record, dict) else record
+    return "" if value is None else str(value)
+
+
+def record_texts(batch, text_field):
+    """The texts of a batch of row records"""
+    return [record_text(record, text_field) for record in batch]
+
+
+def text_batches(records, text_field, batch_size):
+    """Yield (texts, records) for successive batches of row records"""
+    for batch in batched(records, batch_size):
+        yield record_texts(batch, text_field), batch
+
+
+def predict_batches(
+    batches,
+    model,
+    tokenizer,
+    label_encoder,
+    batch_size,
+    store=None,
+    fingerprint=None,
+):
+    """Score (texts, batch) pairs, yielding (batch, probability matrix)"""
+    for texts, batch in batches:
+        if store is None:
+            predictions, _ = predict_proba_batch(
+                texts, model, tokenizer, batch_size=batch_size
+            )
+        else:
+            predictions = predict_with_store(
+                texts, model, tokenizer, label_encoder, store, fingerprint
+            )
+        yield batch, predictions
+
+
+def predict_window_batches(batches, model, tokenizer, batch_size, aggregate, stride):
+    """Score (texts, batch) pairs in long-document mode
+
+    Yields (batch, probability matrix, windows per row); see
+    inference.predict_windows.
+    """
+    for texts, batch in batches:
+        predictions, windows, _ = predict_windows(
+            texts,
+            model,
+            tokenizer,
+            aggregate=aggregate,
+            stride=stride,
+            batch_size=batch_size,
+        )
+        yield batch, predictions, windows
+
+
+def _rows(batch):
+    return len(batch) if isinstance(batch, list) else batch.num_rows
+
+
+def encode_batches(batches, tokenizer, writer):
+    """Tokenize (texts, batch) pairs into (ids, lengths, batch), saving the ids
+
+    ``writer`` is a TokenStoreWriter that receives every batch in order.
+    """
+    for texts, batch in batches:
+        ids = encode_cleaned(clean_texts(texts), tokenizer)
+        writer.append(ids)
+        yield ids, None, batch
+
+
+def token_slices(batches, rows):
+    """Yield (start, stop, batch): each input batch's rows in a token store"""
+    start = 0
+    for batch in batches:
+        stop = start + _rows(batch)
+        if stop > rows:
+            raise RuntimeError("Input has more rows than its token cache entry")
+        yield start, stop, batch
+        start = stop
+    if start != rows:
+        raise RuntimeError("Input has fewer rows than its token cache entry")
+
+
+def predict_token_batches(batches, model, batch_size):
+    """Score (ids, lengths, batch) triples of padded ids: forward passes only"""
+    # Only the bucketing engine uses lengths; it skips scanning the ids
+    bucketed = getattr(model, "length_buckets", None) is not None
+    for ids, lengths, batch in batches:
+        if bucketed and lengths is not None:
+            predictions = model.predict(ids, batch_size=batch_size, lengths=lengths)
+        else:
+            predictions = model.predict(ids, batch_size=batch_size)
+        yield batch, predictions
+
+
+def _batch_ids(batch):
+    """Per-row ids of a batch of records or a RecordBatch, _NO_ID if absent"""
+    if isinstance(batch, list):
+        return [
+            record.get("id", _NO_ID) if isinstance(record, dict) else _NO_ID
+            for record in batch
+        ]
+    if "id" in batch.schema.names:
+        return batch.column("id").to_pylist()
+    return [_NO_ID] * batch.num_rows
+
+
+def result_dicts(scored, label_encoder):
+    """One NDJSON result dict per row of the (batch, predictions) pairs
+
+    Triples from long-document mode add each row's window count.
+    """
+    line = 0
+    for batch, predictions, *windows in scored:
+        results = format_predictions(predictions, label_encoder)
+        if windows:
+            for result, count in zip(results, windows[0].tolist()):
+                result["windows"] = count
+        for record_id, prediction in zip(_batch_ids(batch), results):
+            result = {"line": line, **prediction}
+            if record_id is not _NO_ID:
+                result["id"] = record_id
+            line += 1
+            yield result
+
+
+def _init_worker(cache_db, threads, next_index):
+    """Load the artifacts once per worker process, pinned to its cores"""
+    global _worker
+    with next_index.get_lock():
+        index = next_index.value
+        next_index.value += 1
+
+    # Give each worker its own slice of the cores when they divide evenly
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        if (index + 1) * threads <= len(cpus):
+            os.sched_setaffinity(0, cpus[index * threads : (index + 1) * threads])
+    # Read by cpu_threads when the backend imports TensorFlow
+    os.environ["TF_INTRA_OP_THREADS"] = str(threads)
+    os.environ["TF_INTER_OP_THREADS"] = "1"
+
+    model, tokenizer, label_encoder = load_artifacts()
+    store = PredictionStore(cache_db) if cache_db else None
+    _worker = {
+        "index": index,
+        "artifacts": (model, tokenizer, label_encoder),
+        "store": store,
+        "fingerprint": fingerprint_artifacts() if store is not None else None,
+    }
+
+
+def _label_classes():
+    return [str(label) for label in _worker["artifacts"][2].classes_]
+
+
+def _tokenizer_fingerprint():
+    from token_store import tokenizer_fingerprint
+
+    return tokenizer_fingerprint(_worker["artifacts"][1])
+
+
+def _score_chunk(texts, batch_size, return_ids=False):
+    """Score one chunk in a worker
+
+    Returns (worker index, predictions, busy seconds, token ids or None).
+    The float32 matrix goes back to the parent, which is far cheaper to
+    pickle than one result dict per row.
+    """
+    start = time.perf_counter()
+    model, tokenizer, label_encoder = _worker["artifacts"]
+    ids = None
+    if return_ids:
+        ids = encode_cleaned(clean_texts(texts), tokenizer)
+        predictions = model.predict(ids, batch_size=batch_size)
+    elif _worker["store"] is None:
+        predictions, _ = predict_proba_batch(
+            texts, model, tokenizer, batch_size=batch_size
+        )
+    else:
+        predictions = predict_with_store(
+            texts,
+            model,
+            tokenizer,
+            label_encoder,
+            _worker["store"],
+            _worker["fingerprint"],
+        )
+    predictions = np.asarray(predictions, dtype=np.float32)
+    return _worker["index"], predictions, time.perf_counter() - start, ids
+
+
+def _score_windows(texts, batch_size, aggregate, stride):
+    """Score one chunk in long-document mode in a worker
+
+    Returns (worker index, predictions, busy seconds, windows per row).
+    """
+    start = time.perf_counter()
+    model, tokenizer, _ = _worker["artifacts"]
+    predictions, windows, _ = predict_windows(
+        texts,
+        model,
+        tokenizer,
+        aggregate=aggregate,
+        stride=stride,
+        batch_size=batch_size,
+    )
+    return _worker["index"], predictions, time.perf_counter() - start, windows
+
+
+def _score_token_rows(entry_path, start, stop, batch_size):
+    """Score rows start:stop of a token store entry, memory-mapped here
+
+    Only the offsets cross the process boundary; each worker maps the
+    entry once and reads its own slices.
+    """
+    begin = time.perf_counter()
+    entries = _worker.setdefault("token_entries", {})
+    if entry_path not in entries:
+        from token_store import open_entry
+
+        entries[entry_path] = open_entry(entry_path)
+    ids, lengths, _ = entries[entry_path]
+    model = _worker["artifacts"][0]
+    [(_, predictions)] = predict_token_batches(
+        [(ids[start:stop], lengths[start:stop], None)], model, batch_size
+    )
+    predictions = np.asarray(predictions, dtype=np.float32)
+    return _worker["index"], predictions, time.perf_counter() - begin, None
+
+
+class WorkerPool:
+    """Worker processes that each load the artifacts once and score chunks
+
+    Use as a context manager. ``stats`` maps each worker index to
+    ``[chunks, rows, busy seconds]``.
+    """
+
+    def __init__(self, workers, cache_db=None, threads_per_worker=None, stats=None):
+        self.workers = workers
+        self.threads = threads_per_worker or max(1, usable_cpus() // workers)
+        self.cache_db = cache_db
+        self.stats = {} if stats is None else stats
+        self._executor = None
+
+    def __enter__(self):
+        # TensorFlow is not fork-safe, so workers start from a fresh interpreter
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.cache_db, self.threads, context.Value("i", 0)),
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        self._executor.shutdown(cancel_futures=exc_info[0] is not None)
+
+    def label_encoder(self):
+        """The label classes the workers loaded"""
+        return LabelClasses(self._executor.submit(_label_classes).result())
+
+    def tokenizer_fingerprint(self):
+        """Token store fingerprint of the tokenizer the workers loaded"""
+        return self._executor.submit(_tokenizer_fingerprint).result()
+
+    def _ordered(self, submissions):
+        """Yield (batch, predictions, extra) for (future, batch) pairs in order
+
+        ``extra`` is the last item a worker function returns. With at most
+        two chunks per worker in flight, memory stays bounded on inputs of
+        any size.
+        """
+        pending = deque()
+
+        def collect(future, batch):
+            index, predictions, seconds, extra = future.result()
+            stats = self.stats.setdefault(index, [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += len(predictions)
+            stats[2] += seconds
+            return batch, predictions, extra
+
+        for future, batch in submissions:
+            pending.append((future, batch))
+            if len(pending) >= 2 * self.workers:
+                yield collect(*pending.popleft())
+        while pending:
+            yield collect(*pending.popleft())
+
+    def predict_batches(self, batches, batch_size, token_writer=None):
+        """predict_batches over the workers, yielding in input order
+
+        With a token_writer, the workers also return the token ids of each
+        chunk, which are appended to it in input order.
+        """
+        return_ids = token_writer is not None
+        submissions = (
+            (self._executor.submit(_score_chunk, texts, batch_size, return_ids), batch)
+            for texts, batch in batches
+        )
+        for batch, predictions, ids in self._ordered(submissions):
+            if token_writer is not None:
+                token_writer.append(ids)
+            yield batch, predictions
+
+    def predict_window_batches(self, batches, batch_size, aggregate, stride):
+        """predict_window_batches over the workers, yielding in input order"""
+        submissions = (
+            (
+                self._executor.submit(
+                    _score_windows, texts, batch_size, aggregate, stride
+                ),
+                batch,
+            )
+            for texts, batch in batches
+        )
+        return self._ordered(submissions)
+
+    def predict_token_rows(self, slices, entry_path, batch_size):
+        """Score (start, stop, batch) row ranges of a token store entry
+
+        Workers memory-map the entry themselves; only offsets are sent.
+        """
+        submissions = (
+            (
+                self._executor.submit(
+                    _score_token_rows, entry_path, start, stop, batch_size
+                ),
+                batch,
+            )
+            for start, stop, batch in slices
+        )
+        for batch, predictions, _ in self._ordered(submissions):
+            yield batch, predictions
+
+
+def detect_format(path):
+    """Guess the input format from the file extension"""
+    path = path.lower()
+    if path.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if path.endswith(ARROW_EXTENSIONS):
+        return "arrow"
+    return "csv" if path.endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score JSONL/CSV/Parquet/Arrow reviews into NDJSON or Parquet"
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="input file, or - for stdin"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv", "parquet", "arrow"],
+        help="input format (default: from the file extension, jsonl for stdin)",
+    )
+    parser.add_argument(
+        "--text-field", default="text", help="field holding the review text"
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="output file, or - for stdout (default); *.parquet writes Parquet",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--cache-db",
+        help="SQLite prediction store shared across runs and processes",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, each with its own model (default: 1, in-process)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows per task sent to a worker, and per Parquet/Arrow read",
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        help="TensorFlow threads per worker (default: cores / workers)",
+    )
+    parser.add_argument(
+        "--token-cache",
+        help="directory of token ids per input file and tokenizer, for re-scoring",
+    )
+    parser.add_argument(
+        "--long-text",
+        choices=WINDOW_AGGREGATES,
+        help="score whole texts in overlapping windows, combined by mean or "
+        "length-weighted mean (default: truncate at MAX_LEN tokens)",
+    )
+    parser.add_argument(
+        "--window-stride",
+        type=int,
+        default=WINDOW_STRIDE,
+        help="tokens between window starts with --long-text",
+    )
+    args = parser.parse_args(argv)
+
+    input_format = args.format or (
+        "jsonl" if args.input == "-" else detect_format(args.input)
+    )
+    if input_format == "parquet" and args.input == "-":
+        parser.error("Parquet input must be a file, not stdin")
+    if args.token_cache and args.input == "-":
+        parser.error("--token-cache needs an input file, not stdin")
+    if args.token_cache and args.cache_db:
+        parser.error("--token-cache and --cache-db cannot be combined")
+    if args.long_text and (args.token_cache or args.cache_db):
+        # Both hold single-window results
+        parser.error("--long-text cannot be combined with --token-cache or --cache-db")
+    if not 0 < args.window_stride <= MAX_LEN:
+        parser.error(f"--window-stride must be between 1 and {MAX_LEN}")
+    columnar = input_format in COLUMNAR_FORMATS
+    parquet_output = args.output.lower().endswith(PARQUET_EXTENSIONS)
+    if columnar or parquet_output:
+        # pyarrow is only imported when Arrow or Parquet is involved
+        import arrow_io
+
+    worker_stats = {}
+    if args.workers <= 1:
+        model, tokenizer, label_encoder = load_artifacts()
+        store = PredictionStore(args.cache_db) if args.cache_db else None
+        fingerprint = fingerprint_artifacts() if store is not None else None
+
+    count = 0
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        if columnar:
+            source = sys.stdin.buffer if args.input == "-" else args.input
+            raw_batches = arrow_io.read_record_batches(
+                source, input_format, args.chunk_size
+            )
+            texts_of = partial(arrow_io.batch_texts, text_field=args.text_field)
+        else:
+            stream = (
+                sys.stdin
+                if args.input == "-"
+                else stack.enter_context(
+                    open(args.input, encoding="utf-8", newline="")
+                )
+            )
+            raw_batches = batched(
+                read_records(stream, input_format),
+                args.chunk_size if args.workers > 1 else args.batch_size,
+            )
+            texts_of = partial(record_texts, text_field=args.text_field)
+        batches = ((texts_of(batch), batch) for batch in raw_batches)
+
+        if args.workers > 1:
+            pool = stack.enter_context(
+                WorkerPool(
+                    args.workers,
+                    cache_db=args.cache_db,
+                    threads_per_worker=args.threads_per_worker,
+                    stats=worker_stats,
+                )
+            )
+            label_encoder = pool.label_encoder()
+
+        # Token cache: reuse the input's token ids, or save them as we go
+        token_entry = token_writer = None
+        if args.token_cache:
+            from token_store import TokenStore, corpus_key, tokenizer_fingerprint
+
+            token_store = TokenStore(args.token_cache)
+            corpus = corpus_key(args.input, input_format, args.text_field)
+            tokens = (
+                pool.tokenizer_fingerprint()
+                if args.workers > 1
+                else tokenizer_fingerprint(tokenizer)
+            )
+            entry_path = token_store.entry_path(corpus, tokens)
+            token_entry = token_store.open(corpus, tokens)
+            if token_entry is None:
+                token_writer = stack.enter_context(
+                    token_store.writer(
+                        corpus,
+                        tokens,
+                        meta={
+                            "source": os.path.abspath(args.input),
+                            "text_field": args.text_field,
+                        },
+                    )
+                )
+
+        if args.long_text:
+            if args.workers > 1:
+                scored = pool.predict_window_batches(
+                    batches, args.batch_size, args.long_text, args.window_stride
+                )
+            else:
+                scored = predict_window_batches(
+                    batches,
+                    model,
+                    tokenizer,
+                    args.batch_size,
+                    args.long_text,
+                    args.window_stride,
+                )
+        elif token_entry is not None:
+            ids, lengths, meta = token_entry
+            slices = token_slices(raw_batches, meta["rows"])
+            if args.workers > 1:
+                scored = pool.predict_token_rows(slices, entry_path, args.batch_size)
+            else:
+                scored = predict_token_batches(
+                    (
+                        (ids[start:stop], lengths[start:stop], batch)
+                        for start, stop, batch in slices
+                    ),
+                    model,
+                    args.batch_size,
+                )
+        elif args.workers > 1:
+            scored = pool.predict_batches(
+                batches, args.batch_size, token_writer=token_writer
+            )
+        elif token_writer is not None:
+            scored = predict_token_batches(
+                encode_batches(batches, tokenizer, token_writer),
+                model,
+                args.batch_size,
+            )
+        else:
+            scored = predict_batches(
+                batches,
+                model,
+                tokenizer,
+                label_encoder,
+                args.batch_size,
+                store=store,
+                fingerprint=fingerprint,
+            )
+
+        if parquet_output:
+            classes = [str(label) for label in label_encoder.classes_]
+            count = arrow_io.write_parquet(
+                scored, classes, args.output, text_field=args.text_field
+            )
+        else:
+            out = (
+                sys.stdout
+                if args.output == "-"
+                else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+            )
+            for result in result_dicts(scored, label_encoder):
+                # default=str covers Arrow ids such as dates and decimals
+                out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                count += 1
+            out.flush()
+
+        if token_writer is not None:
+            token_writer.commit()
+            print(
+                f"Token cache: saved {token_writer.rows} rows to {entry_path}",
+                file=sys.stderr,
+            )
+        elif token_entry is not None:
+            print(f"Token cache: reused {entry_path}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Scored {count} records in {elapsed:.2f}s ({rate:.1f} records/s)",
+        file=sys.stderr,
+    )
+    for index, (chunks, rows, busy) in sorted(worker_stats.items()):
+        print(
+            f"   worker {index}: {rows} records in {chunks} chunks, "
+            f"{rows / busy if busy > 0 else 0.0:.1f} records/s while busy",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Asyncio HTTP inference service exposing the sentiment model outside Streamlit.
+
+Endpoints:
+    POST /predict         {"text": "..."} or {"texts": ["...", ...]}
+    POST /predict/stream  NDJSON records in, NDJSON results out
+    GET  /healthz         liveness
+    GET  /readyz          200 once artifacts are loaded and warmed up
+    POST /admin/reload    load, validate and swap in the artifacts on disk
+                          (needs ADMIN_TOKEN set and sent as a bearer token)
+
+Usage:
+    python server.py --host 0.0.0.0 --port 8000
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from inference import (
+    ARTIFACT_WATCH_SECONDS,
+    artifact_signature,
+    fingerprint_artifacts,
+    format_predictions,
+    load_artifacts,
+    predict_proba_batch,
+    validate_artifacts,
+    warm_up,
+)
+from model_loader import ModelLoader
+
+STREAM_BATCH_SIZE = 64
+# Bearer token for /admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+logger = logging.getLogger(__name__)
+
+
+class ModelService:
+    """Owns the model artifacts and runs inference off the event loop"""
+
+    def __init__(self):
+        # A single worker thread keeps forward passes serialized on the model
+        # while the event loop stays free to accept connections
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+        self.loader = ModelLoader(
+            load_artifacts,
+            warm_up_fn=lambda model, tokenizer, _: warm_up(
+                model, tokenizer, batch_sizes=(1, STREAM_BATCH_SIZE)
+            ),
+            validate_fn=validate_artifacts,
+            fingerprint_fn=fingerprint_artifacts,
+        )
+
+    @property
+    def ready(self):
+        return self.loader.ready
+
+    @property
+    def error(self):
+        return self.loader.error
+
+    def load(self, watch_seconds=ARTIFACT_WATCH_SECONDS):
+        """Start loading, validating and warming up artifacts in the background"""
+        self.loader.start()
+        if watch_seconds > 0:
+            self.loader.watch(artifact_signature, interval=watch_seconds)
+
+    def predict(self, texts, artifacts=None):
+        """Score a list of texts (blocking)
+
+        ``artifacts`` pins a version taken from ``self.loader.artifacts``
+        earlier; by default the current one is used.
+        """
+        model, tokenizer, label_encoder = artifacts or self.loader.artifacts
+        predictions, _ = predict_proba_batch(texts, model, tokenizer)
+        return format_predictions(predictions, label_encoder)
+
+    async def predict_async(self, texts, artifacts=None):
+        """Score a list of texts on the inference thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.predict, texts, artifacts
+        )
+
+
+service = ModelService()
+
+
+def not_ready():
+    return JSONResponse(
+        {"status": "loading", "error": service.error}, status_code=503
+    )
+
+
+async def healthz(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def readyz(request):
+    if not service.ready:
+        return not_ready()
+    return JSONResponse({"status": "ready", "model": service.loader.status()})
+
+
+async def admin_reload(request):
+    if not ADMIN_TOKEN:
+        return JSONResponse({"error": "admin endpoints disabled"}, status_code=404)
+    auth = request.headers.get("authorization", "")
+    if not hmac.compare_digest(auth.encode(), f"Bearer {ADMIN_TOKEN}".encode()):
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+
+    if not service.loader.reload():
+        return JSONResponse(
+            {"status": "busy", "model": service.loader.status()}, status_code=409
+        )
+    # Poll /readyz for the new fingerprint or the reload_error
+    return JSONResponse(
+        {"status": "reloading", "model": service.loader.status()}, status_code=202
+    )
+
+
+def as_text(value):
+    """Review text of a JSON value; null scores as the empty string"""
+    return "" if value is None else str(value)
+
+
+async def predict(request):
+    if not service.ready:
+        return not_ready()
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "invalid JSON body"}, status_code=400)
+
+    if isinstance(payload, dict) and isinstance(payload.get("texts"), list):
+        results = await service.predict_async(
+            [as_text(text) for text in payload["texts"]]
+        )
+        return JSONResponse({"results": results})
+    if isinstance(payload, dict) and "text" in payload:
+        results = await service.predict_async([as_text(payload["text"])])
+        return JSONResponse(results[0])
+
+    return JSONResponse(
+        {"error": 'expected {"text": ...} or {"texts": [...]}'}, status_code=400
+    )
+
+
+async def iter_lines(request):
+    """Yield complete lines from the request body as it arrives"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+class PredictStream:
+    """NDJSON in, NDJSON out, scored in batches while the body is still arriving
+
+    Implemented as a raw ASGI app: StreamingResponse listens for client
+    disconnects on ``receive`` and would swallow the request body chunks.
+    """
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        if not service.ready:
+            await not_ready()(scope, receive, send)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        async for chunk in self.results(request):
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": True}
+            )
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def results(self, request):
+        line_no = 0
+        batch = []
+        # The whole stream is scored by the version that was live when it began
+        artifacts = service.loader.artifacts
+
+        async def flush():
+            # Invalid lines wait in the batch as None so output keeps input order
+            texts = [text for _, text in batch if text is not None]
+            records = iter(
+                await service.predict_async(texts, artifacts) if texts else []
+            )
+            out = []
+            for number, text in batch:
+                result = {"error": "invalid JSON"} if text is None else next(records)
+                out.append(json.dumps({"line": number, **result}) + "\n")
+            batch.clear()
+            return "".join(out).encode("utf-8")
+
+        async for line in iter_lines(request):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                batch.append((line_no, None))
+            else:
+                text = record.get("text", "") if isinstance(record, dict) else record
+                batch.append((line_no, as_text(text)))
+            line_no += 1
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield await flush()
+
+        if batch:
+            yield await flush()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load in the background so /healthz answers while the model warms up
+    service.load()
+    yield
+    service.loader.stop()
+    service.executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route("/predict", predict, methods=["POST"]),
+        Route("/predict/stream", PredictStream(), methods=["POST"]),
+        Route("/healthz", healthz),
+        Route("/readyz", readyz),
+        Route("/admin/reload", admin_reload, methods=["POST"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Sentiment inference HTTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,59 +2,23 @@
 Quick test script to verify model can be loaded and makes predictions
 """
 
-import tensorflow as tf
 import pickle
+import sys
+
 import numpy as np
 from tensorflow.keras.preprocessing.sequence import pad_sequences
-import re
-
-
-# Define Attention Layer (same as in training)
-class AttentionLayer(tf.keras.layers.Layer):
-    def __init__(self, **kwargs):
-        super(AttentionLayer, self).__init__(**kwargs)
-
-    def build(self, input_shape):
-        self.W = self.add_weight(
-            name="att_weight",
-            shape=(input_shape[-1],),
-            initializer="random_normal",
-            trainable=True,
-        )
-        super(AttentionLayer, self).build(input_shape)
-
-    def call(self, inputs, mask=None):
-        e = tf.keras.backend.tanh(inputs)
-        e = tf.keras.backend.dot(e, tf.keras.backend.expand_dims(self.W, -1))
-        e = tf.keras.backend.squeeze(e, -1)
-
-        if mask is not None:
-            mask = tf.keras.backend.cast(mask, tf.keras.backend.floatx())
-            e = e * mask + ((1 - mask) * -1e9)
-
-        alpha = tf.keras.backend.softmax(e)
-        alpha_exp = tf.keras.backend.expand_dims(alpha, axis=-1)
-        context = tf.keras.backend.sum(inputs * alpha_exp, axis=1)
-        return context
-
-    def compute_output_shape(self, input_shape):
-        return (input_shape[0], input_shape[-1])
-
-    def get_config(self):
-        config = super().get_config()
-        return config
 
-
-def clean_text(text):
-    """Clean and preprocess text"""
-    text = str(text)
-    text = text.lower()
-    text = re.sub(r"http\S+|www\S+|https\S+", " ", text)
-    text = re.sub(r"@\w+", " ", text)
-    text = re.sub(r"#", " ", text)
-    text = re.sub(r"[^0-9a-z\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+from inference import (
+    INFERENCE_BACKEND,
+    MAX_LEN,
+    TOKENIZER_PATH,
+    clean_text,
+    encode_cleaned,
+    load_artifacts,
+    predict_proba_batch,
+    predict_windows,
+)
+from normalization import clean_text_chained
 
 
 print("=" * 60)
@@ -62,62 +26,95 @@ print("Testing Sentiment Analysis Model")
 print("=" * 60)
 
 try:
-    # Load model
-    print("\n1. Loading model...")
-    model = tf.keras.models.load_model(
-        "kaggle/working/model_outputs/CNN + BiLSTM_best.h5",
-        custom_objects={"AttentionLayer": AttentionLayer},
-    )
+    # Load model, tokenizer and label encoder
+    print("\n1. Loading model, tokenizer and label encoder...")
+    engine, tokenizer, label_encoder = load_artifacts()
     print("✓ Model loaded successfully")
-    print(f"   Model input shape: {model.input_shape}")
-    print(f"   Model output shape: {model.output_shape}")
-
-    # Load tokenizer
-    print("\n2. Loading tokenizer...")
-    with open("kaggle/working/model_outputs/tokenizer.pkl", "rb") as f:
-        tokenizer = pickle.load(f)
-    print("✓ Tokenizer loaded successfully")
+    print(f"   Inference backend: {INFERENCE_BACKEND} ({type(engine).__name__})")
+    print(f"   Model input shape: (None, {engine.max_len})")
+    print(f"   Model output shape: (None, {engine.n_classes})")
     print(f"   Vocabulary size: {len(tokenizer.word_index)}")
-
-    # Load label encoder
-    print("\n3. Loading label encoder...")
-    with open("kaggle/working/model_outputs/label_encoder.pkl", "rb") as f:
-        label_encoder = pickle.load(f)
-    print("✓ Label encoder loaded successfully")
     print(f"   Classes: {list(label_encoder.classes_)}")
 
     # Test predictions
-    print("\n4. Testing predictions...")
+    print("\n2. Testing predictions...")
     test_texts = [
         "Mobil listrik ini sangat bagus dan hemat energi. Saya sangat puas!",
         "Harga mobil listrik terlalu mahal dan infrastruktur charging masih kurang.",
         "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
     ]
 
-    MAX_LEN = 128
-
     for i, text in enumerate(test_texts, 1):
         print(f"\n   Test {i}: {text[:50]}...")
 
         # Preprocess
         cleaned = clean_text(text)
-        sequence = tokenizer.texts_to_sequences([cleaned])
-        padded = np.array(
-            pad_sequences(sequence, maxlen=MAX_LEN, padding="post", truncating="post")
-        )
+        padded = encode_cleaned([cleaned], tokenizer)
 
-        # Predict
-        prediction = model.predict(padded, verbose=0)
+        # Predict through the selected backend
+        prediction = engine.predict(padded)
         predicted_class_idx = np.argmax(prediction[0])
         confidence = prediction[0][predicted_class_idx]
         sentiment = label_encoder.classes_[predicted_class_idx]
 
+        # The Keras fast path must agree with model.predict
+        if hasattr(engine, "model"):
+            reference = engine.model.predict(padded, verbose=0)
+            assert np.allclose(prediction, reference, atol=1e-5), "fast path mismatch"
+
         print(f"   → Sentiment: {sentiment}")
         print(f"   → Confidence: {confidence*100:.2f}%")
         print(f"   → All probabilities:")
         for j, class_name in enumerate(label_encoder.classes_):
             print(f"      - {class_name}: {prediction[0][j]*100:.2f}%")
 
+    # Tokenizer parity
+    print("\n3. Checking vectorized tokenizer against the pickled tokenizer...")
+    parity_texts = [clean_text(text) for text in test_texts] + [
+        "",
+        "   ",
+        "kata yang tidak ada di kosakata xyzzy",
+        "Mobil Listrik, MAHAL!!  tapi  bagus?\tya\nbenar",
+        " ".join(["listrik mobil bagus"] * 100),
+    ]
+    # A bundle's vocabulary is checked against the original pickle
+    reference_tokenizer = tokenizer
+    if not hasattr(tokenizer, "texts_to_sequences"):
+        with open(TOKENIZER_PATH, "rb") as f:
+            reference_tokenizer = pickle.load(f)
+    expected = pad_sequences(
+        reference_tokenizer.texts_to_sequences(parity_texts),
+        maxlen=MAX_LEN,
+        padding="post",
+        truncating="post",
+    )
+    encoded = encode_cleaned(parity_texts, tokenizer)
+    assert encoded.dtype == np.int32, "tokenizer dtype mismatch"
+    assert np.array_equal(encoded, expected), "tokenizer mismatch"
+    print(f"✓ {len(parity_texts)} texts encode identically")
+
+    # Text normalization parity
+    print("\n4. Checking fused clean_text against the chained version...")
+    tricky_texts = test_texts + [
+        "Cek @dealer_resmi di https://t.co/AbC #MobilListrik!!",
+        "wwwhttp://x.co awww.y.com @abchttp://z ΣΑΣ café 2024,",
+        None,
+    ]
+    for text in tricky_texts:
+        assert clean_text(text) == clean_text_chained(text), f"clean_text mismatch: {text!r}"
+    print(f"✓ {len(tricky_texts)} texts clean identically")
+
+    # Long-document mode
+    print("\n5. Checking sliding-window scoring...")
+    long_text = " ".join(test_texts * 20)
+    windowed, windows, _ = predict_windows(test_texts + [long_text], engine, tokenizer)
+    truncated, _ = predict_proba_batch(test_texts, engine, tokenizer)
+    assert list(windows[:-1]) == [1] * len(test_texts), "short text split"
+    assert windows[-1] > 1, "long text not split"
+    assert np.allclose(windowed[:-1], truncated, atol=1e-5), "window mismatch"
+    assert np.allclose(windowed.sum(axis=1), 1.0, atol=1e-3), "window aggregate"
+    print(f"✓ Long text scored in {windows[-1]} windows")
+
     print("\n" + "=" * 60)
     print("✓ ALL TESTS PASSED - Model is working correctly!")
     print("=" * 60)
@@ -130,3 +127,5 @@ except Exception as e:
     import traceback
 
     traceback.print_exc()
+    # A failed check must fail the run, e.g. in CI
+    sys.exit(1)
@@ -0,0 +1,153 @@
+"""
+TensorFlow Lite export and interpreter backend.
+
+Convert the Keras model into float32, float16 and dynamic-range int8
+TFLite files:
+    python tflite_backend.py --variants float32 float16 int8
+
+Then select the backend for the app, server and CLI:
+    export INFERENCE_BACKEND=tflite
+    export TFLITE_MODEL_PATH=kaggle/working/model_outputs/model_int8.tflite
+    streamlit run app.py
+"""
+
+import argparse
+import os
+import threading
+
+import numpy as np
+
+from cpu_threads import thread_settings
+
+TFLITE_VARIANTS = ("float32", "float16", "int8")
+TFLITE_OUTPUT_DIR = "kaggle/working/model_outputs"
+
+
+def tflite_path(variant, output_dir=TFLITE_OUTPUT_DIR):
+    return os.path.join(output_dir, f"model_{variant}.tflite")
+
+
+def convert_model(model, variant, batch_size=1):
+    """Convert a Keras model to a TFLite flatbuffer for one variant
+
+    The input shape is frozen to ``(batch_size, max_len)``: with static
+    shapes the BiLSTM lowers to builtin ops, so no Flex delegate (and no
+    full TensorFlow) is needed at inference time.
+    """
+    import tensorflow as tf
+
+    # Re-wrap the model behind an input with a static batch dimension
+    model_input = model.inputs[0]
+    inputs = tf.keras.Input(
+        batch_shape=(batch_size, model_input.shape[1]), dtype=model_input.dtype
+    )
+    fixed = tf.keras.Model(inputs, model(inputs))
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed)
+
+    if variant == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "int8":
+        # Dynamic-range quantization: int8 weights, float activations
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant != "float32":
+        raise ValueError(f"Unknown TFLite variant: {variant}")
+    return converter.convert()
+
+
+def _interpreter_class():
+    """Prefer the standalone LiteRT/tflite runtimes over full TensorFlow"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteEngine:
+    """InferenceEngine-compatible wrapper around a TFLite interpreter
+
+    The exported graph has a fixed batch size; inputs are fed in chunks of
+    that size, zero-padding the last one.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        if num_threads is None:
+            # Same budget as TensorFlow's intra-op pool
+            num_threads = thread_settings()["intra_op_threads"]
+        self.interpreter = _interpreter_class()(
+            model_path=model_path, num_threads=num_threads
+        )
+        self.interpreter.allocate_tensors()
+
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self._input_index = input_details["index"]
+        self._input_dtype = input_details["dtype"]
+        self._output_index = output_details["index"]
+        self.batch_size = int(input_details["shape"][0])
+        self.max_len = int(input_details["shape"][1])
+        self.n_classes = int(output_details["shape"][-1])
+
+        # An interpreter holds its tensors in place and is not thread-safe
+        self._lock = threading.Lock()
+
+    def predict(self, inputs, batch_size=None):
+        """Return the (N, n_classes) probability matrix for padded inputs
+
+        ``batch_size`` is accepted for compatibility; the exported graph's
+        own batch size is always used.
+        """
+        inputs = np.asarray(inputs)
+        n = len(inputs)
+        outputs = np.empty((n, self.n_classes), dtype=np.float32)
+        chunk = np.zeros((self.batch_size, self.max_len), dtype=self._input_dtype)
+
+        with self._lock:
+            for start in range(0, n, self.batch_size):
+                rows = inputs[start : start + self.batch_size]
+                chunk[: len(rows)] = rows
+                chunk[len(rows) :] = 0
+                self.interpreter.set_tensor(self._input_index, chunk)
+                self.interpreter.invoke()
+                result = self.interpreter.get_tensor(self._output_index)
+                outputs[start : start + len(rows)] = result[: len(rows)]
+        return outputs
+
+
+def main(argv=None):
+    from inference import MODEL_PATH
+    from keras_backend import load_keras_model
+
+    parser = argparse.ArgumentParser(description="Export the model to TFLite")
+    parser.add_argument(
+        "--variants", nargs="+", choices=TFLITE_VARIANTS, default=list(TFLITE_VARIANTS)
+    )
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--output-dir", default=TFLITE_OUTPUT_DIR)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="fixed batch size of the exported graph (1 suits interactive use)",
+    )
+    args = parser.parse_args(argv)
+
+    # Always convert the .h5 model, whatever ARTIFACT_BUNDLE points at
+    model = load_keras_model(args.model_path)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for variant in args.variants:
+        path = tflite_path(variant, args.output_dir)
+        with open(path, "wb") as f:
+            f.write(convert_model(model, variant, args.batch_size))
+        print(f"✓ {variant:<8} {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
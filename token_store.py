@@ -0,0 +1,203 @@
+"""
+Token-id corpus store: the cleaned, tokenized and padded form of a whole
+corpus, kept on disk so re-scoring it with a newly trained model costs only
+forward passes and sequential reads.
+
+Each entry is a directory holding ``ids.npy`` (int32, N x MAX_LEN),
+``lengths.npy`` (int32 token count per row) and ``meta.json``. Entries are
+keyed by the source file (path, size and mtime, plus the text field) and by
+the tokenizer fingerprint, which covers the vocabulary, the tokenizer
+settings, MAX_LEN and the text cleaning code. Retraining the model with the
+same tokenizer reuses the entry; a new vocabulary builds a new one.
+
+    python score.py corpus.parquet --token-cache token_cache --output a.parquet
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+import normalization
+from fast_tokenizer import fast_tokenizer
+from inference import MAX_LEN
+
+IDS_NAME = "ids.npy"
+LENGTHS_NAME = "lengths.npy"
+META_NAME = "meta.json"
+
+
+def tokenizer_fingerprint(tokenizer, max_len=MAX_LEN):
+    """Hash of everything that decides the token ids of a text"""
+    digest = hashlib.blake2b(digest_size=16)
+    config = fast_tokenizer(tokenizer).get_config()
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    digest.update(str(max_len).encode("utf-8"))
+    # clean_text runs before tokenizing, so a change to it changes the ids
+    with open(normalization.__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def corpus_key(path, input_format, text_field):
+    """Identify a source file by path, size and mtime, without reading it"""
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        os.path.abspath(path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        input_format,
+        text_field,
+    ):
+        digest.update(f"{part}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _npy_header(dtype, shape):
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": shape,
+        },
+    )
+    return header.getvalue()
+
+
+class _NpyAppender:
+    """Write rows to a .npy file whose row count is only known at the end
+
+    The header is written with 0 rows and rewritten in place on close;
+    numpy pads it so the row count can grow without changing its size.
+    """
+
+    def __init__(self, path, dtype, row_shape=()):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.rows = 0
+        self._header_size = len(_npy_header(self.dtype, (0, *self.row_shape)))
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, (0, *self.row_shape)))
+
+    def append(self, rows):
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if rows.shape[1:] != self.row_shape:
+            raise ValueError(f"Expected rows of shape {self.row_shape}")
+        self._file.write(rows.data)
+        self.rows += len(rows)
+
+    def close(self):
+        header = _npy_header(self.dtype, (self.rows, *self.row_shape))
+        if len(header) != self._header_size:
+            raise ValueError("npy header grew; too many rows for in-place update")
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.close()
+
+    def discard(self):
+        self._file.close()
+
+
+def open_entry(path):
+    """(ids, lengths, meta) of one entry directory, or None if it is absent"""
+    try:
+        with open(os.path.join(path, META_NAME)) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    ids = np.load(os.path.join(path, IDS_NAME), mmap_mode="r")
+    lengths = np.load(os.path.join(path, LENGTHS_NAME), mmap_mode="r")
+    return ids, lengths, meta
+
+
+class TokenStoreWriter:
+    """Build one store entry in a scratch directory, published on commit
+
+    Use as a context manager; leaving it without ``commit()`` (say, after
+    an error or an interrupted run) deletes the partial entry.
+    """
+
+    def __init__(self, path, max_len=MAX_LEN, meta=None):
+        self.path = path
+        self.max_len = max_len
+        self.meta = dict(meta or {})
+        self._scratch = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(self._scratch)
+        self._ids = _NpyAppender(
+            os.path.join(self._scratch, IDS_NAME), np.int32, (max_len,)
+        )
+        self._lengths = _NpyAppender(
+            os.path.join(self._scratch, LENGTHS_NAME), np.int32
+        )
+        self._done = False
+
+    @property
+    def rows(self):
+        return self._ids.rows
+
+    def append(self, ids):
+        """Add a batch of padded token ids, in corpus order"""
+        ids = np.asarray(ids)
+        self._ids.append(ids)
+        # Post-padded ids have no zeros inside a row
+        self._lengths.append(np.count_nonzero(ids, axis=1))
+
+    def commit(self):
+        """Finish the files and make the entry visible in one rename"""
+        self._ids.close()
+        self._lengths.close()
+        self.meta.update(
+            rows=self.rows,
+            max_len=self.max_len,
+            created=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        )
+        with open(os.path.join(self._scratch, META_NAME), "w") as f:
+            json.dump(self.meta, f, indent=2)
+        try:
+            os.replace(self._scratch, self.path)
+        except OSError:
+            # Another job published the same entry first
+            shutil.rmtree(self._scratch, ignore_errors=True)
+        self._done = True
+
+    def abort(self):
+        if not self._done:
+            self._ids.discard()
+            self._lengths.discard()
+            shutil.rmtree(self._scratch, ignore_errors=True)
+            self._done = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.abort()
+
+
+class TokenStore:
+    """Directory of token-id entries, one per (corpus, tokenizer fingerprint)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def entry_path(self, corpus, fingerprint):
+        return os.path.join(self.root, corpus, fingerprint)
+
+    def open(self, corpus, fingerprint):
+        """(ids, lengths, meta) memory-mapped read-only, or None on a miss"""
+        return open_entry(self.entry_path(corpus, fingerprint))
+
+    def writer(self, corpus, fingerprint, max_len=MAX_LEN, meta=None):
+        """A TokenStoreWriter for a new entry"""
+        path = self.entry_path(corpus, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return TokenStoreWriter(
+            path, max_len=max_len, meta={**(meta or {}), "tokenizer": fingerprint}
+        )
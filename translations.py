@@ -0,0 +1,170 @@
+"""
+UI strings and sentiment label translations, importable without
+Streamlit or TensorFlow.
+"""
+
+# Translations dictionary
+TRANSLATIONS = {
+    "en": {
+        # Navigation
+        "about": "About",
+        "settings": "Settings",
+        "language": "Language",
+        # Hero section
+        "title": "Sentiment Analysis",
+        "subtitle": "🇮🇩 Indonesian Business Review Analyzer",
+        "description": "Powered by CNN + BiLSTM with Attention • Real-time AI predictions with 74.97% accuracy",
+        # Sidebar
+        "about_title": "About This Tool",
+        "about_text": "This AI-powered sentiment analysis model classifies Indonesian business reviews into three categories:",
+        "model_info": "Model Information",
+        "architecture": "Architecture",
+        "accuracy": "Accuracy",
+        "dataset_size": "Dataset Size",
+        "samples": "samples",
+        "try_examples": "Try Examples",
+        # Sentiments
+        "positive": "Positive",
+        "neutral": "Neutral",
+        "negative": "Negative",
+        # Input section
+        "input_title": "Enter Your Review Text",
+        "input_subtitle": "Type or paste a business review below and click analyze to see the sentiment prediction.",
+        "input_placeholder": "Example: Masukkan teks ulasan bisnis Indonesia Anda di sini... ⚡",
+        "input_label": "Type or paste your Indonesian business review here:",
+        "analyze_button": "🔍 Analyze Sentiment",
+        # Results
+        "results_title": "Analysis Results",
+        "sentiment_label": "Sentiment",
+        "confidence_label": "Confidence",
+        "distribution_title": "Sentiment Distribution",
+        "statistics_title": "Text Statistics",
+        "word_count": "Word Count",
+        "characters": "Characters",
+        "cleaned_words": "Cleaned Words",
+        "view_preprocessed": "🔍 View Preprocessed Text",
+        # Bulk upload
+        "tab_single": "✍️ Single Review",
+        "tab_bulk": "📂 Bulk Upload",
+        "bulk_title": "Score a File of Reviews",
+        "bulk_subtitle": "Upload a CSV, Excel or Parquet file, pick the column that holds the review text, and score every row.",
+        "upload_label": "Upload CSV, Excel or Parquet file",
+        "text_column": "Text column",
+        "rows_loaded": "rows loaded",
+        "bulk_start": "🚀 Score File",
+        "bulk_cancel": "⏹️ Cancel",
+        "bulk_progress": "Scored {done:,} of {total:,} rows",
+        "bulk_cancelled": "Scoring cancelled after {done:,} of {total:,} rows.",
+        "bulk_done": "✅ Scored {total:,} rows.",
+        "download_csv": "⬇️ Download Results (CSV)",
+        "download_parquet": "⬇️ Download Results (Parquet)",
+        "error_reading_file": "Could not read the uploaded file:",
+        "worker_stats": "⚙️ Inference Worker",
+        "cache_stats": "🗃️ Prediction Cache",
+        "model_status": "🔄 Model Version",
+        # Messages
+        "loading_model": "Loading model...",
+        "warming_model": "Warming up model...",
+        "model_not_ready": "The model is still loading. This tab unlocks once it is ready.",
+        "analyzing": "Analyzing sentiment...",
+        "empty_warning": "⚠️ Please enter some text to analyze.",
+        "error_loading": "Failed to load model. Please check the model files.",
+        "error_prediction": "Error loading model artifacts:",
+        # Footer
+        "powered_by": "Powered by",
+        "model_description": "CNN + BiLSTM with Attention Mechanism",
+        "copyright": "© 2024",
+        # Example texts
+        "example_positive": "kloningan daihatsu masuk pasar indonesia epmb menerima hak ekslusif dalam merakit mendistribusi kendaraan merek lingbox pasar malaysia indonesia lingbox mini ev masuk tanah air https co ow ag https co ihkzxaj",
+        "example_neutral": "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+        "example_negative": "Mobil listrik sangat mengecewakan dan tidak layak dibeli. Saya sangat kecewa dengan kualitasnya yang buruk dan harganya terlalu mahal.",
+    },
+    "id": {
+        # Navigation
+        "about": "Tentang",
+        "settings": "Pengaturan",
+        "language": "Bahasa",
+        # Hero section
+        "title": "Analisis Sentimen",
+        "subtitle": "🇮🇩 Penganalisis Ulasan Bisnis Indonesia",
+        "description": "Didukung oleh CNN + BiLSTM dengan Attention • Prediksi AI real-time dengan akurasi 74.97%",
+        # Sidebar
+        "about_title": "Tentang Alat Ini",
+        "about_text": "Model analisis sentimen bertenaga AI ini mengklasifikasikan ulasan bisnis Indonesia ke dalam tiga kategori:",
+        "model_info": "Informasi Model",
+        "architecture": "Arsitektur",
+        "accuracy": "Akurasi",
+        "dataset_size": "Ukuran Dataset",
+        "samples": "sampel",
+        "try_examples": "Coba Contoh",
+        # Sentiments
+        "positive": "Positif",
+        "neutral": "Netral",
+        "negative": "Negatif",
+        # Input section
+        "input_title": "Masukkan Teks Ulasan Anda",
+        "input_subtitle": "Ketik atau tempel ulasan bisnis di bawah ini dan klik analisis untuk melihat prediksi sentimen.",
+        "input_placeholder": "Contoh: Masukkan teks ulasan bisnis Indonesia Anda di sini... ⚡",
+        "input_label": "Ketik atau tempel ulasan bisnis Indonesia Anda di sini:",
+        "analyze_button": "🔍 Analisis Sentimen",
+        # Results
+        "results_title": "Hasil Analisis",
+        "sentiment_label": "Sentimen",
+        "confidence_label": "Kepercayaan",
+        "distribution_title": "Distribusi Sentimen",
+        "statistics_title": "Statistik Teks",
+        "word_count": "Jumlah Kata",
+        "characters": "Karakter",
+        "cleaned_words": "Kata Bersih",
+        "view_preprocessed": "🔍 Lihat Teks Terproses",
+        # Bulk upload
+        "tab_single": "✍️ Ulasan Tunggal",
+        "tab_bulk": "📂 Unggah Massal",
+        "bulk_title": "Nilai File Ulasan",
+        "bulk_subtitle": "Unggah file CSV, Excel atau Parquet, pilih kolom yang berisi teks ulasan, lalu nilai setiap baris.",
+        "upload_label": "Unggah file CSV, Excel atau Parquet",
+        "text_column": "Kolom teks",
+        "rows_loaded": "baris dimuat",
+        "bulk_start": "🚀 Nilai File",
+        "bulk_cancel": "⏹️ Batal",
+        "bulk_progress": "{done:,} dari {total:,} baris dinilai",
+        "bulk_cancelled": "Penilaian dibatalkan setelah {done:,} dari {total:,} baris.",
+        "bulk_done": "✅ {total:,} baris dinilai.",
+        "download_csv": "⬇️ Unduh Hasil (CSV)",
+        "download_parquet": "⬇️ Unduh Hasil (Parquet)",
+        "error_reading_file": "Tidak dapat membaca file yang diunggah:",
+        "worker_stats": "⚙️ Pekerja Inferensi",
+        "cache_stats": "🗃️ Cache Prediksi",
+        "model_status": "🔄 Versi Model",
+        # Messages
+        "loading_model": "Memuat model...",
+        "warming_model": "Memanaskan model...",
+        "model_not_ready": "Model masih dimuat. Tab ini aktif setelah model siap.",
+        "analyzing": "Menganalisis sentimen...",
+        "empty_warning": "⚠️ Silakan masukkan teks untuk dianalisis.",
+        "error_loading": "Gagal memuat model. Silakan periksa file model.",
+        "error_prediction": "Kesalahan memuat artefak model:",
+        # Footer
+        "powered_by": "Didukung oleh",
+        "model_description": "CNN + BiLSTM dengan Mekanisme Attention",
+        "copyright": "© 2024",
+        # Example texts
+        "example_positive": "kloningan daihatsu masuk pasar indonesia epmb menerima hak ekslusif dalam merakit mendistribusi kendaraan merek lingbox pasar malaysia indonesia lingbox mini ev masuk tanah air https co ow ag https co ihkzxaj",
+        "example_neutral": "Pemerintah sedang menyiapkan insentif untuk kendaraan bermotor listrik.",
+        "example_negative": "Mobil listrik sangat mengecewakan dan tidak layak dibeli. Saya sangat kecewa dengan kualitasnya yang buruk dan harganya terlalu mahal.",
+    },
+}
+
+
+def translate_sentiment(indonesian_label, language="en"):
+    """Translate Indonesian sentiment labels into the given language"""
+    if language == "en":
+        translation = {
+            "Positif": "Positive",
+            "Netral": "Neutral",
+            "Negatif": "Negative",
+        }
+        return translation.get(indonesian_label, indonesian_label)
+    else:
+        # Keep Indonesian labels as-is for Indonesian language
+        return indonesian_label